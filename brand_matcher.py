@@ -0,0 +1,110 @@
+import re, unicodedata
+
+from config.constants import (
+    NAVER_TARGET_BRAND,
+    NAVER_TARGET_KEYWORDS,
+    NAVER_COMPETITOR_KEYWORDS,
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _keyword_key(keyword: str) -> str:
+    """대소문자 / 공백 차이만 있는 키워드를 같은 것으로 보기 위한 키"""
+    return _WHITESPACE_RE.sub("", unicodedata.normalize("NFKC", keyword).casefold())
+
+
+class BrandMatcher:
+    """
+    브랜드별 키워드 목록을 정규식 하나로 컴파일한 matcher.
+
+    - 대소문자 무시, 키워드 안의 공백은 공백 0개 이상으로 매칭
+      ("법무법인 YK" 하나로 "법무법인yk" / "법무법인  yk" 모두 매칭)
+    - 대소문자 / 공백만 다른 키워드는 하나로 합침
+    - 브랜드가 여러 개여도 텍스트를 한 번만 훑어 모든 브랜드 위치를 찾는다
+    - 같은 위치에서는 긴 키워드가 먼저 매칭된다
+    """
+
+    def __init__(self, keywords_by_brand: dict[str, list[str]]):
+        self.brand_by_key = {}
+        pattern_by_key = {}
+
+        for brand, keywords in keywords_by_brand.items():
+            for keyword in keywords:
+                tokens = unicodedata.normalize("NFKC", keyword).split()
+                key = _keyword_key(keyword)
+                if not key:
+                    continue
+
+                # 같은 키워드는 공백으로 더 잘게 나뉜 표기를 사용 (더 많은 표기에 매칭)
+                pattern = r"\s*".join(re.escape(token) for token in tokens)
+                if key in pattern_by_key:
+                    if pattern.count(r"\s*") <= pattern_by_key[key].count(r"\s*"):
+                        continue
+                else:
+                    self.brand_by_key[key] = brand
+
+                pattern_by_key[key] = pattern
+
+        self.keys = sorted(pattern_by_key, key=len, reverse=True)
+        # 키워드마다 그룹 하나 → 매칭된 그룹 번호(m.lastindex)로 브랜드를 찾는다
+        # (매칭 텍스트를 다시 정규화하면 IGNORECASE 매칭과 키가 다를 수 있음)
+        self.brand_by_group = [None] + [self.brand_by_key[key] for key in self.keys]
+        self.pattern = (
+            re.compile(
+                "|".join(f"({pattern_by_key[key]})" for key in self.keys),
+                re.IGNORECASE,
+            )
+            if self.keys
+            else None
+        )
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return unicodedata.normalize("NFKC", text or "")
+
+    def find(self, text: str) -> list[tuple[str, int, int]]:
+        """(브랜드, 시작, 끝) 목록. 위치는 normalize(text) 기준"""
+        if self.pattern is None:
+            return []
+
+        return [
+            (self.brand_by_group[m.lastindex], m.start(), m.end())
+            for m in self.pattern.finditer(self.normalize(text))
+        ]
+
+    def search(self, text: str) -> tuple[str, int, int] | None:
+        """첫 번째 매칭 (브랜드, 시작, 끝). 없으면 None"""
+        if self.pattern is None:
+            return None
+
+        m = self.pattern.search(self.normalize(text))
+        if m is None:
+            return None
+        return self.brand_by_group[m.lastindex], m.start(), m.end()
+
+    def brands(self, text: str) -> list[str]:
+        """텍스트에 등장한 브랜드 (처음 등장한 순서, 중복 제거)"""
+        return list(dict.fromkeys(brand for brand, _, _ in self.find(text)))
+
+    def snippet(self, text: str, limit: int = 200) -> str:
+        """
+        매칭 위치가 포함된 limit 글자.
+        첫 매칭이 앞 limit 글자 안에 있으면 text[:limit] 과 같다.
+        """
+        text = self.normalize(text)
+        match = self.search(text)
+        if match is None or match[2] <= limit:
+            return text[:limit]
+
+        start = max(0, match[1] - limit // 4)
+        return text[start : start + limit]
+
+
+# 우리 브랜드 matcher (NAVER_TARGET_KEYWORDS 로 한 번만 생성)
+target_matcher = BrandMatcher({NAVER_TARGET_BRAND: NAVER_TARGET_KEYWORDS})
+
+# 우리 브랜드 + 경쟁사 matcher (share of voice 태깅용)
+sov_matcher = BrandMatcher(
+    {NAVER_TARGET_BRAND: NAVER_TARGET_KEYWORDS, **NAVER_COMPETITOR_KEYWORDS}
+)
@@ -2,26 +2,135 @@
 # ElasticSearch 설정
 # ==============================
 ES_HOST = "https://stats.yklawfirm.co.kr:50110/search_ad_keyword_monitoring"
-ES_INDEX_PREFIX = "search_ad_keyword_monitoring"
 BATCH_SIZE = 10
 
+# _bulk 버퍼링 적재 (문서 수 / 바이트 / 초 중 먼저 도달하는 조건으로 flush)
+ES_BULK_MAX_DOCS = 500
+ES_BULK_MAX_BYTES = 5 * 1024 * 1024
+ES_BULK_FLUSH_INTERVAL = 30
+ES_BULK_MAX_RETRIES = 3
+# 재시도 후에도 못 보낸 문서 (다음 flush 성공 시 재전송) / ES 가 거부한 문서 (오류와 함께 기록)
+ES_SPOOL_PATH = "cache/es_spool.jsonl"
+ES_REJECTED_PATH = "cache/es_rejected.jsonl"
+
+# ==============================
+# 크롤러 설정
+# ==============================
+# 병렬로 띄울 Chrome 드라이버 수 (VM별 설정 파일의 CRAWLER_WORKERS 가 우선)
+CRAWLER_WORKERS = 1
+# 드라이버 재생성 기준 (작업 수 / chromedriver+Chrome 메모리 합계 MB)
+DRIVER_MAX_PAGES = 300
+DRIVER_MAX_RSS_MB = 1500
+# --daemon 모드에서 사이클 종료 후 다음 사이클까지 대기 (초)
+DAEMON_CYCLE_INTERVAL = 15
+# --daemon 모드에서 키워드 시트를 다시 읽는 간격 (초, 그 사이 사이클은 읽어 둔 키워드 재사용)
+KEYWORD_SHEET_REFRESH_INTERVAL = 10 * 60
+
+# ==============================
+# 키워드 스케줄러 (우선순위 / 노출 변화율 기반 재크롤링 주기)
+# ==============================
+SCHEDULER_ENABLED = True
+SCHEDULER_STATE_PATH = "cache/keyword_state.json"
+# 재크롤링 간격 = BASE / (우선순위 x (1 + WEIGHT x 변화율)), MIN~MAX 범위 (초)
+SCHEDULER_BASE_INTERVAL = 4 * 60 * 60
+SCHEDULER_MIN_INTERVAL = 30 * 60
+SCHEDULER_MAX_INTERVAL = 24 * 60 * 60
+SCHEDULER_VOLATILITY_WEIGHT = 3.0
+# 사이클당 최대 크롤링 페이지 수 (None = 제한 없음)
+SCHEDULER_PAGE_BUDGET = None
+
 # ==============================
 # NAVER 설정
 # ==============================
+# 우리 브랜드 이름과 매칭 키워드 (대소문자 / 키워드 내 공백 차이는 brand_matcher 에서 무시)
+NAVER_TARGET_BRAND = "YK"
 NAVER_TARGET_KEYWORDS = [
-    "yk",
-    "법무법인yk",
-    "법무법인 yk",
     "YK",
-    "법무법인YK",
     "법무법인 YK",
 ]
+# 경쟁사 점유율(share of voice) 태깅용 브랜드 사전 {브랜드: [매칭 키워드]}
+# 예) {"A법인": ["법무법인 A", "A로펌"]}
+NAVER_COMPETITOR_KEYWORDS = {}
+# 영역별 전체 카드 순위를 share_of_voice 문서로 ES 에 적재
+NAVER_SHARE_OF_VOICE = True
+NAVER_POWERLINK_CARD_SELECTOR = "li.bx"
 NAVER_BRAND_CARD_SELECTOR = "div._fe_view_power_content[data-template-id='ugcItem']"
 NAVER_UGC_CARD_SELECTOR = "div[data-template-id='ugcItem']"
 NAVER_PLACE_ROOT_SELECTOR = "#place-app-root"
 NAVER_PLACE_CARD_SELECTOR = "li"
 
+# 페이지 로딩 대기 (고정 sleep 대신 준비 상태 감지)
+NAVER_PAGE_READY_TIMEOUT = 10  # 준비 감지 최대 대기 (초)
+NAVER_NETWORK_IDLE_SEC = 0.5  # 리소스 요청이 이 시간 동안 없으면 로딩 완료로 판단
+# 같은 브라우저에서 연속 요청 사이 최소 간격 (초, 랜덤 범위) — 요청 제한 보호용
+NAVER_POLITENESS_DELAY = (1.5, 3.0)
+
+# 썸네일을 HTTP 로 다시 받지 않고 브라우저가 받은 응답 본문(CDP)을 재사용
+BROWSER_IMAGE_CAPTURE = True
+BROWSER_NETWORK_BUFFER_MB = 100  # Chrome 네트워크 응답 버퍼 크기
+
+# 영역 파싱 방식: "lxml" = page_source 스냅샷 1회 파싱, "selenium" = 요소별 WebDriver 조회
+NAVER_PARSER_BACKEND = "lxml"
+
+# pHash 로고 템플릿 디렉터리
+NAVER_LOGO_TEMPLATE_DIR = "assets/naver_thumbnails"
+# 로고 판정에 쓸 해시 종류 ("phash" / "dhash" / "whash", 여러 개면 거리 평균)
+LOGO_HASH_TYPES = ("phash",)
+# 템플릿 탐색 방식: "numpy" = 전체 템플릿 XOR + popcount 벡터 연산, "bktree" = BK-tree
+# (tools/bench_logo_match.py 기준 10,000개까지는 numpy 가 더 빠름)
+LOGO_INDEX_BACKEND = "numpy"
+# 템플릿 해시 인덱스 (파일 mtime / size 가 같으면 다시 해시하지 않음)
+LOGO_TEMPLATE_CACHE_PATH = "cache/logo_templates.json"
+# 템플릿 디렉터리 변경 확인 주기 (초, None = 재시작해야 반영)
+LOGO_TEMPLATE_RELOAD_INTERVAL = 60
+
+# 인기글(UGC) 판정 단계 (앞 단계에서 확정되면 뒤 단계 생략): 카드 텍스트 → pHash → OCR
+UGC_DETECT_STAGES = ("text", "phash", "ocr")
+# pHash 거리가 이 값 이상이면 로고 없음으로 확정하고 OCR 생략 (None = 항상 OCR 로 확인)
+UGC_PHASH_NEGATIVE_DIST = None
+
+# 인기글 fingerprint (카드 href / 썸네일 목록 해시) 가 직전과 같으면 이전 판정 결과 재사용
+SERP_FINGERPRINT_ENABLED = True
+SERP_FINGERPRINT_PATH = "cache/serp_fingerprint.sqlite3"
+SERP_FINGERPRINT_TTL = 6 * 60 * 60  # fingerprint 가 같아도 이 시간이 지나면 재분석 (초)
+
+# ==============================
+# OCR
+# ==============================
+OCR_CACHE_PATH = "cache/ocr_cache.sqlite3"
+OCR_CACHE_TTL = 7 * 24 * 60 * 60  # OCR 결과 보관 기간 (초)
+OCR_CACHE_SRC_TTL = 24 * 60 * 60  # 같은 src 면 다운로드 없이 재사용하는 기간 (초)
+OCR_CACHE_MAX_ENTRIES = 50000  # 초과 시 오래 안 쓰인 항목부터 제거
+# 페이지 단위 배치 OCR 캔버스 최대 크기 (width, height) — 이보다 큰 썸네일은 따로 OCR
+OCR_BATCH_IMAGE_SIZE = (480, 480)
+# "process" = 별도 OCR 워커 프로세스 풀, "inline" = 크롤러 프로세스에서 직접 실행
+OCR_BACKEND = "process"
+OCR_WORKERS = 2  # OCR 워커 프로세스 수
+OCR_TORCH_THREADS = 2  # 워커 프로세스당 torch 스레드 수 (OCR_WORKERS x 이 값 <= 코어 수 권장)
+
+# 썸네일 다운로드 (keep-alive 세션 + 페이지 단위 동시 다운로드 + 디스크 캐시)
+IMAGE_FETCH_WORKERS = 8
+IMAGE_FETCH_TIMEOUT = (3, 5)  # (connect, read) 초
+IMAGE_CACHE_DIR = "cache/images"
+IMAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 초과 시 오래 안 쓰인 파일부터 삭제
+
 # ==============================
 # GOOGLE SHEETS
 # ==============================
 GOOGLE_SPREADSHEET_ID = "15pWYWNvk42DqlrBwK4k3v0Teq5QIK6e15RgWz6OPOus"
+GOOGLE_SERVICE_ACCOUNT_FILE = "config/google_service_account.json"
+# 결과 행 append 버퍼 (키워드 N개 또는 T초마다 한 번에 전송)
+SHEETS_APPEND_FLUSH_KEYWORDS = 20
+SHEETS_APPEND_FLUSH_INTERVAL = 60
+SHEETS_REJECTED_PATH = "cache/sheets_rejected.jsonl"  # 재시도해도 안 되는 행 (4xx 등)
+
+# ==============================
+# 알림 (noti 서버)
+# ==============================
+NOTI_URL = "http://localhost:10002/send-event-noti"
+NOTI_QUEUE_SIZE = 1000  # 초과분은 spool 파일에 기록
+NOTI_TIMEOUT = (3, 10)  # (connect, read) 초
+NOTI_MAX_RETRIES = 3
+# 전송 실패 후 이 시간 동안은 바로 spool 에 쌓고, 지나면 spool 재전송 시도 (초)
+NOTI_RETRY_INTERVAL = 60
+NOTI_SPOOL_PATH = "cache/noti_spool.jsonl"
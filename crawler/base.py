@@ -2,6 +2,11 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
+from config.constants import (
+    BROWSER_IMAGE_CAPTURE,
+    BROWSER_NETWORK_BUFFER_MB,
+)
+
 
 class BaseCrawler:
 
@@ -15,6 +20,10 @@ class BaseCrawler:
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--window-size=1200,900")
 
+        if BROWSER_IMAGE_CAPTURE:
+            # 받은 이미지의 requestId 를 찾기 위한 네트워크 이벤트 로그
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
         service = Service()
 
         self.driver = webdriver.Chrome(
@@ -22,9 +31,55 @@ class BaseCrawler:
             options=options,
         )
 
+        if BROWSER_IMAGE_CAPTURE:
+            self._enable_network_buffer()
+
+        self.pages = 0  # 이 드라이버로 처리한 작업 수 (재생성 판단용)
+
+    def _enable_network_buffer(self):
+        """응답 본문을 Network.getResponseBody 로 꺼낼 수 있도록 버퍼 크기 지정"""
+        total = BROWSER_NETWORK_BUFFER_MB * 1024 * 1024
+        try:
+            self.driver.execute_cdp_cmd(
+                "Network.enable",
+                {"maxTotalBufferSize": total, "maxResourceBufferSize": total // 4},
+            )
+        except Exception as e:
+            print(f"[CRAWLER] network buffer enable failed: {e}")
+
     def open(self, url: str):
         self.driver.get(url)
 
+    def is_alive(self) -> bool:
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def rss_mb(self) -> float:
+        """chromedriver 와 하위 Chrome 프로세스 전체의 RSS (MB, Linux /proc 기준)"""
+        try:
+            root_pid = self.driver.service.process.pid
+        except Exception:
+            return 0.0
+
+        total_kb = 0
+        stack = [root_pid]
+        while stack:
+            pid = stack.pop()
+            try:
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            total_kb += int(line.split()[1])
+                            break
+                with open(f"/proc/{pid}/task/{pid}/children") as f:
+                    stack.extend(int(c) for c in f.read().split())
+            except (OSError, ValueError):
+                continue
+
+        return total_kb / 1024
+
     def close(self):
         self.driver.quit()
 
@@ -0,0 +1,93 @@
+"""
+브라우저가 이미 받은 이미지 응답 본문 재사용
+
+BaseCrawler 가 performance 로그(goog:loggingPrefs)와 CDP Network 버퍼를 켜 두면,
+페이지 로딩 중 받은 썸네일의 requestId 를 로그에서 찾아
+Network.getResponseBody 로 원본 bytes 를 꺼낼 수 있다.
+스크린샷 / HTTP 재다운로드 없이 pHash / OCR 입력으로 쓴다.
+
+버퍼에서 밀려났거나 아직 로딩되지 않은(lazy-load) 이미지는 None → 호출 측에서 HTTP 로 받는다.
+"""
+
+import base64, json, threading
+
+_stats_lock = threading.Lock()
+_stats = {"captured": 0, "missed": 0}
+
+
+def _loaded_image_request_ids(driver) -> dict[str, str]:
+    """
+    performance 로그에서 로딩이 끝난 이미지 응답의 url → requestId 를 만든다.
+    get_log 는 읽은 로그를 비우므로 페이지마다 한 번 호출한다.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return {}
+
+    responses = {}
+    finished = set()
+
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+
+        method = message.get("method")
+        params = message.get("params", {})
+
+        if method == "Network.responseReceived" and params.get("type") == "Image":
+            responses[params["response"]["url"]] = params["requestId"]
+        elif method == "Network.loadingFinished":
+            finished.add(params.get("requestId"))
+
+    return {url: rid for url, rid in responses.items() if rid in finished}
+
+
+class LoadedImages:
+    """현재 페이지에서 브라우저가 받은 이미지. get(src) 시점에 본문을 꺼낸다."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.request_ids = _loaded_image_request_ids(driver)
+
+    def get(self, src: str | None) -> bytes | None:
+        request_id = self.request_ids.get(src) if src else None
+        data = None
+
+        if request_id is not None:
+            try:
+                body = self.driver.execute_cdp_cmd(
+                    "Network.getResponseBody", {"requestId": request_id}
+                )
+                if body.get("base64Encoded"):
+                    data = base64.b64decode(body["body"])
+                else:
+                    data = body["body"].encode("utf-8")
+            except Exception:
+                # 버퍼에서 제거된 응답 등
+                data = None
+
+        if src:
+            with _stats_lock:
+                _stats["captured" if data else "missed"] += 1
+        return data
+
+
+def get_loaded_image_bytes(driver, srcs: list[str | None]) -> dict[str, bytes]:
+    """srcs 중 브라우저에서 꺼낼 수 있는 이미지의 {src: bytes}"""
+    loaded = LoadedImages(driver)
+    images = {}
+
+    for src in dict.fromkeys(src for src in srcs if src):
+        data = loaded.get(src)
+        if data:
+            images[src] = data
+
+    return images
+
+
+def browser_image_stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
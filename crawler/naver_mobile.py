@@ -1,44 +1,153 @@
-import urllib.parse
+import urllib.parse, random, threading, time, weakref
 
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from logo_detector import YKLogoDetector
 
 from util import (
     is_brand_content,
     get_card_url,
+    get_landing_url,
     get_thumbnail_element_from_card,
     is_kin_content,
     resolve_ugc_content_type,
 )
 from config.constants import (
-    NAVER_TARGET_KEYWORDS,
+    NAVER_POWERLINK_CARD_SELECTOR,
     NAVER_BRAND_CARD_SELECTOR,
     NAVER_PLACE_ROOT_SELECTOR,
     NAVER_PLACE_CARD_SELECTOR,
     NAVER_UGC_CARD_SELECTOR,
+    NAVER_PAGE_READY_TIMEOUT,
+    NAVER_NETWORK_IDLE_SEC,
+    NAVER_POLITENESS_DELAY,
+    NAVER_PARSER_BACKEND,
+    NAVER_LOGO_TEMPLATE_DIR,
+    UGC_DETECT_STAGES,
+    UGC_PHASH_NEGATIVE_DIST,
+    NAVER_TARGET_BRAND,
+    NAVER_SHARE_OF_VOICE,
 )
 
-from ocr_util import extract_text_from_image_element
+from brand_matcher import target_matcher
+from crawler import naver_snapshot
+from ocr_util import extract_texts_from_image_srcs, fetch_image_bytes_from_srcs
+
+
+# ==============================
+# NAVER: 페이지 로딩 대기
+# ==============================
+# 파싱 대상 영역. 전부 나타나면 네트워크 유휴를 기다리지 않고 바로 진행
+NAVER_READY_SELECTORS = [
+    NAVER_POWERLINK_CARD_SELECTOR,
+    NAVER_UGC_CARD_SELECTOR,
+    NAVER_PLACE_ROOT_SELECTOR,
+]
+
+_READY_STATE_SCRIPT = """
+const selectors = arguments[0];
+return [
+    document.readyState,
+    selectors.filter((s) => document.querySelector(s) !== null).length,
+    performance.getEntriesByType("resource").length,
+];
+"""
+
+# 드라이버별 마지막 페이지 로딩 완료 시각 (politeness 간격 계산용)
+# id(driver) 는 풀이 드라이버를 다시 만들면 재사용될 수 있으므로 드라이버 객체를 약한 참조로 키에 쓴다
+# (교체된 드라이버가 정리되면 항목도 함께 사라짐)
+_last_page_ready_at = weakref.WeakKeyDictionary()
+_last_page_ready_lock = threading.Lock()
+
+
+class _NaverSerpReady:
+    """
+    WebDriverWait 조건.
+    document 로딩이 끝났고, 파싱 대상 영역이 모두 보이거나
+    리소스 요청이 NAVER_NETWORK_IDLE_SEC 동안 늘지 않으면 준비 완료로 본다.
+    """
+
+    def __init__(self, selectors, idle_sec: float):
+        self.selectors = selectors
+        self.idle_sec = idle_sec
+        self.resource_count = -1
+        self.resource_changed_at = time.monotonic()
+
+    def __call__(self, driver) -> bool:
+        ready_state, found, resource_count = driver.execute_script(
+            _READY_STATE_SCRIPT, self.selectors
+        )
+
+        now = time.monotonic()
+        if resource_count != self.resource_count:
+            self.resource_count = resource_count
+            self.resource_changed_at = now
+
+        if ready_state != "complete":
+            return False
+
+        if found == len(self.selectors):
+            return True
+
+        return now - self.resource_changed_at >= self.idle_sec
+
+
+def wait_for_naver_serp(driver, timeout: float = NAVER_PAGE_READY_TIMEOUT) -> bool:
+    """
+    검색 결과 페이지가 파싱 가능한 상태가 될 때까지 대기한다.
+    timeout 안에 준비되지 않으면 False (현재 상태 그대로 파싱 진행).
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            _NaverSerpReady(NAVER_READY_SELECTORS, NAVER_NETWORK_IDLE_SEC)
+        )
+        ready = True
+    except Exception:
+        ready = False
+
+    with _last_page_ready_lock:
+        _last_page_ready_at[driver] = time.monotonic()
+
+    return ready
+
+
+def wait_naver_politeness(driver):
+    """
+    같은 드라이버의 직전 페이지 로딩 완료 후 NAVER_POLITENESS_DELAY 만큼
+    지나지 않았다면 남은 시간만큼 대기한다. (파싱/OCR 시간은 간격에 포함)
+    """
+    with _last_page_ready_lock:
+        last = _last_page_ready_at.get(driver)
+
+    if last is None:
+        return
+
+    remaining = last + random.uniform(*NAVER_POLITENESS_DELAY) - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def open_naver_serp(driver, url: str) -> bool:
+    wait_naver_politeness(driver)
+    driver.get(url)
+    return wait_for_naver_serp(driver)
 
 
 def ensure_naver_exact_query(driver, keyword: str, timeout: int = 5) -> bool:
     """
     '제안 검색어' 블록이 노출되면, 원래 keyword 링크를 클릭해
     정확한 검색 결과로 전환한다.
+
+    페이지 준비 대기(wait_for_naver_serp) 이후 호출되므로
+    블록 존재 여부는 기다리지 않고 즉시 확인한다.
     """
     try:
-        container = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "div.sp_nkeyword_suggest, div.sp_nkeyword")
-            )
+        containers = driver.find_elements(
+            By.CSS_SELECTOR, "div.sp_nkeyword_suggest, div.sp_nkeyword"
         )
-    except Exception:
-        return False
+        if not containers:
+            return False
 
-    try:
-        links = container.find_elements(By.CSS_SELECTOR, "a[href*='query=']")
+        links = containers[0].find_elements(By.CSS_SELECTOR, "a[href*='query=']")
         target = next((a for a in links if a.text.strip() == keyword), None)
         if not target:
             return False
@@ -61,9 +170,9 @@ def ensure_naver_exact_query(driver, keyword: str, timeout: int = 5) -> bool:
 # ==============================
 # NAVER: 파워링크
 # ==============================
-def find_naver_powerlink_rank(driver):
+def find_naver_powerlink_rank(driver, share_of_voice: list | None = None):
     results = []
-    cards = driver.find_elements(By.CSS_SELECTOR, "li.bx")
+    cards = driver.find_elements(By.CSS_SELECTOR, NAVER_POWERLINK_CARD_SELECTOR)
     rank = 0
 
     for card in cards:
@@ -73,15 +182,21 @@ def find_naver_powerlink_rank(driver):
             continue
 
         rank += 1
-        text = card.text.lower()
-        matched = [kw for kw in NAVER_TARGET_KEYWORDS if kw.lower() in text]
+        text = card.text.replace("\n", " ")
+
+        if share_of_voice is not None:
+            share_of_voice.append(
+                naver_snapshot.share_of_voice_entry(
+                    "파워링크", rank, text, get_landing_url(card)
+                )
+            )
 
-        if matched:
+        if target_matcher.search(text):
             results.append(
                 {
                     "section": "파워링크",
                     "rank": rank,
-                    "matched_snippet": card.text.replace("\n", " ")[:200],
+                    "matched_snippet": target_matcher.snippet(text),
                 }
             )
 
@@ -91,20 +206,26 @@ def find_naver_powerlink_rank(driver):
 # ==============================
 # NAVER: 브랜드콘텐츠
 # ==============================
-def find_naver_brand_content_rank(driver):
+def find_naver_brand_content_rank(driver, share_of_voice: list | None = None):
     results = []
     cards = driver.find_elements(By.CSS_SELECTOR, NAVER_BRAND_CARD_SELECTOR)
 
     for idx, card in enumerate(cards, start=1):
-        text = card.text.lower()
-        matched = [kw for kw in NAVER_TARGET_KEYWORDS if kw.lower() in text]
+        text = card.text.replace("\n", " ")
 
-        if matched:
+        if share_of_voice is not None:
+            share_of_voice.append(
+                naver_snapshot.share_of_voice_entry(
+                    "브랜드콘텐츠", idx, text, get_landing_url(card)
+                )
+            )
+
+        if target_matcher.search(text):
             results.append(
                 {
                     "section": "브랜드콘텐츠",
                     "rank": idx,
-                    "matched_snippet": card.text.replace("\n", " ")[:200],
+                    "matched_snippet": target_matcher.snippet(text),
                 }
             )
 
@@ -122,7 +243,7 @@ def has_naver_place_block(driver) -> bool:
         return False
 
 
-def find_naver_place_rank(driver):
+def find_naver_place_rank(driver, share_of_voice: list | None = None):
     results = []
     root = driver.find_element(By.CSS_SELECTOR, NAVER_PLACE_ROOT_SELECTOR)
     cards = root.find_elements(By.CSS_SELECTOR, NAVER_PLACE_CARD_SELECTOR)
@@ -131,7 +252,7 @@ def find_naver_place_rank(driver):
     organic_rank = 0
 
     for card in cards:
-        text = card.text.lower()
+        text = card.text.replace("\n", " ")
         is_ad = "광고" in text
 
         if is_ad:
@@ -143,13 +264,19 @@ def find_naver_place_rank(driver):
             section = "플레이스_일반"
             rank = organic_rank
 
-        matched = [kw for kw in NAVER_TARGET_KEYWORDS if kw.lower() in text]
-        if matched:
+        if share_of_voice is not None:
+            share_of_voice.append(
+                naver_snapshot.share_of_voice_entry(
+                    section, rank, text, get_landing_url(card)
+                )
+            )
+
+        if target_matcher.search(text):
             results.append(
                 {
                     "section": section,
                     "rank": rank,
-                    "matched_snippet": card.text.replace("\n", " ")[:200],
+                    "matched_snippet": target_matcher.snippet(text),
                 }
             )
 
@@ -159,98 +286,293 @@ def find_naver_place_rank(driver):
 # ==============================
 # NAVER: 인기글 (UGC) / pHash 로고 검출
 # ==============================
-def find_popular_content(driver, logo_detector: YKLogoDetector):
-    results = []
-    cards = driver.find_elements(By.CSS_SELECTOR, NAVER_UGC_CARD_SELECTOR)
-    popular_rank = 0
+_logo_detector = None
+_logo_detector_lock = threading.Lock()
 
-    for card in cards:
+
+def get_logo_detector():
+    """pHash 템플릿 로더 (PIL / imagehash 포함) 는 첫 사용 시 생성한다."""
+    global _logo_detector
+
+    with _logo_detector_lock:
+        if _logo_detector is None:
+            from logo_detector import YKLogoDetector
+
+            _logo_detector = YKLogoDetector(NAVER_LOGO_TEMPLATE_DIR)
+        return _logo_detector
+
+
+def logo_template_state() -> str:
+    """
+    인기글 fingerprint 에 넣을 로고 템플릿 상태.
+    템플릿이 다시 로드되면 값이 바뀐다. (pHash 단계를 쓰지 않으면 빈 문자열)
+    """
+    if "phash" not in UGC_DETECT_STAGES:
+        return ""
+    return get_logo_detector().state_key()
+
+
+# ==============================
+# NAVER: 인기글 (UGC) 후보 카드 수집
+# ==============================
+def collect_naver_ugc_cards(driver) -> list[dict]:
+    """
+    Selenium 경로의 UGC 후보 카드 수집.
+    crawler.naver_snapshot.collect_naver_ugc_cards 와 같은 형식을 반환한다.
+    """
+    cards = []
+
+    for card in driver.find_elements(By.CSS_SELECTOR, NAVER_UGC_CARD_SELECTOR):
         if is_brand_content(card):
             continue
 
-        url = get_card_url(card)
+        img_el = get_thumbnail_element_from_card(card)
+        cards.append(
+            {
+                "url": get_card_url(card),
+                "text": card.text.lower(),
+                "img_src": img_el.get_attribute("src") if img_el else None,
+            }
+        )
 
-        if is_kin_content(url):
-            continue
+    return cards
 
-        text = card.text.lower()
-        text_hit = [kw for kw in NAVER_TARGET_KEYWORDS if kw.lower() in text]
 
-        img_el = get_thumbnail_element_from_card(card)
-        logo_hit = False
-        logo_info = None
+# ==============================
+# NAVER: 인기글 (UGC) / 텍스트 → pHash → OCR cascade
+# ==============================
+class UGCCascadeStats:
+    """인기글 판정 cascade 의 단계별 누적 확인 수 / 적중 수 / 소요 시간"""
+
+    STAGES = ("text", "phash", "ocr")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cards = 0
+        self.phash_negatives = 0
+        self.checked = dict.fromkeys(self.STAGES, 0)
+        self.hits = dict.fromkeys(self.STAGES, 0)
+        self.seconds = dict.fromkeys(self.STAGES, 0.0)
+
+    def add(self, stage: str, checked: int, hits: int, seconds: float):
+        with self._lock:
+            self.checked[stage] += checked
+            self.hits[stage] += hits
+            self.seconds[stage] += seconds
+
+    def add_cards(self, cards: int, phash_negatives: int):
+        with self._lock:
+            self.cards += cards
+            self.phash_negatives += phash_negatives
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                stage: {
+                    "checked": self.checked[stage],
+                    "hits": self.hits[stage],
+                    "ms": round(self.seconds[stage] * 1000),
+                }
+                for stage in self.STAGES
+            }
+            stats["cards"] = self.cards
+            stats["phash_negatives"] = self.phash_negatives
+            stats["ocr_avoided"] = self.cards - self.checked["ocr"]
+        return stats
+
+
+ugc_cascade_stats = UGCCascadeStats()
+
+
+def rank_popular_content(
+    cards: list[dict],
+    stages=UGC_DETECT_STAGES,
+    logo_detector=None,
+    images: dict[str, bytes] | None = None,
+) -> list[dict]:
+    """
+    UGC 후보 카드(url / text / img_src)의 인기글 순위를 단계별로 판정한다.
+    앞 단계에서 확정된 카드는 뒤 단계를 건너뛴다.
+
+    1) text  : 카드 텍스트에 타깃 키워드가 있으면 확정
+    2) phash : 썸네일을 로고 템플릿과 비교해 same / similar 면 확정,
+               UGC_PHASH_NEGATIVE_DIST 이상 멀면 미노출로 확정 (None 이면 OCR 로 넘김)
+    3) ocr   : 남은 썸네일만 모아 배치 OCR
+
+    images 에 브라우저에서 꺼낸 썸네일 {src: bytes} 가 있으면 그 이미지는 다운로드하지 않는다.
+    stages 에서 단계를 빼면 해당 단계를 생략한다.
+    단계별 확인 수 / 적중 수 / 소요 시간은 ugc_cascade_stats 에 누적된다.
+    """
+    cards = [card for card in cards if not is_kin_content(card["url"])]
+    detected = {}  # 카드 index → 판정 정보
+    remaining = list(range(len(cards)))
+    phash_negatives = 0
+
+    if "text" in stages:
+        start_t = time.perf_counter()
+        for idx in remaining:
+            if target_matcher.search(cards[idx]["text"]):
+                detected[idx] = {"detect_reason": "text"}
+
+        ugc_cascade_stats.add(
+            "text", len(remaining), len(detected), time.perf_counter() - start_t
+        )
+        remaining = [idx for idx in remaining if idx not in detected]
+
+    # 썸네일이 없는 카드는 이미지 단계 대상이 아님
+    remaining = [idx for idx in remaining if cards[idx]["img_src"]]
+    preloaded = images or {}
+    images = {idx: preloaded.get(cards[idx]["img_src"]) for idx in remaining}
+
+    if "phash" in stages and remaining:
+        start_t = time.perf_counter()
+        detector = logo_detector or get_logo_detector()
+        undecided = []
+
+        # 브라우저에서 못 꺼낸 썸네일만 한 번에 동시 다운로드 (OCR 단계에서도 재사용)
+        missing = [idx for idx in remaining if not images[idx]]
+        srcs = [cards[idx]["img_src"] for idx in missing]
+        images.update(zip(missing, fetch_image_bytes_from_srcs(srcs)))
+
+        for idx in remaining:
+            img_bytes = images[idx]
+            if not img_bytes:
+                undecided.append(idx)
+                continue
+
+            try:
+                status, template_name, distance = detector.match(img_bytes)
+            except Exception:
+                # 디코딩할 수 없는 이미지 → OCR 단계에서 판단
+                undecided.append(idx)
+                continue
 
-        if img_el:
-            status, template_name, distance = logo_detector.match(
-                img_el.screenshot_as_png
-            )
             if status in ("same", "similar"):
-                logo_hit = True
-                logo_info = {
+                detected[idx] = {
+                    "detect_reason": "phash",
                     "logo_match_type": status,
                     "template": template_name,
                     "phash_distance": int(distance),
                 }
+            elif (
+                UGC_PHASH_NEGATIVE_DIST is not None
+                and distance >= UGC_PHASH_NEGATIVE_DIST
+            ):
+                phash_negatives += 1
+            else:
+                undecided.append(idx)
+
+        ugc_cascade_stats.add(
+            "phash",
+            len(remaining),
+            len(remaining) - len(undecided) - phash_negatives,
+            time.perf_counter() - start_t,
+        )
+        remaining = undecided
 
-        if text_hit or logo_hit:
-            popular_rank += 1
-            results.append(
-                {
-                    "section": "인기글",
-                    "content_type": resolve_ugc_content_type(url),
-                    "rank": popular_rank,
-                    "source_type": "ugc",
-                    "url": url,
-                    **(logo_info or {}),
-                }
-            )
+    if "ocr" in stages and remaining:
+        start_t = time.perf_counter()
+        ocr_texts = extract_texts_from_image_srcs(
+            [cards[idx]["img_src"] for idx in remaining],
+            [images.get(idx) for idx in remaining],
+        )
 
-    return results
+        ocr_hits = 0
+        for idx, ocr_text in zip(remaining, ocr_texts):
+            if target_matcher.search(ocr_text):
+                detected[idx] = {"detect_reason": "ocr", "ocr_text": ocr_text[:200]}
+                ocr_hits += 1
 
+        ugc_cascade_stats.add(
+            "ocr", len(remaining), ocr_hits, time.perf_counter() - start_t
+        )
+
+    ugc_cascade_stats.add_cards(len(cards), phash_negatives)
 
-# ==============================
-# NAVER: 인기글 (UGC) / easyOCR 로고 검출
-# ==============================
-def find_popular_content_ocr(driver):
     results = []
-    cards = driver.find_elements(By.CSS_SELECTOR, NAVER_UGC_CARD_SELECTOR)
     popular_rank = 0
 
-    for card in cards:
-        if is_brand_content(card):
+    for idx, card in enumerate(cards):
+        if idx not in detected:
             continue
 
-        url = get_card_url(card)
+        url = card["url"]
+        popular_rank += 1
+        results.append(
+            {
+                "section": "인기글",
+                "content_type": resolve_ugc_content_type(url),
+                "rank": popular_rank,
+                "source_type": "ugc",
+                "url": url,
+                **detected[idx],
+            }
+        )
 
-        if is_kin_content(url):
-            continue
+    return results
 
-        text = card.text.lower()
-        text_hit = [kw for kw in NAVER_TARGET_KEYWORDS if kw.lower() in text]
 
-        img_el = get_thumbnail_element_from_card(card)
-        ocr_text = ""
-        # img_src = img_el.get_attribute("src") if img_el else None
-        # print(f"[OCR] card_url: {url}")
-        # print(f"[OCR] img_src: {img_src}")
+def ugc_share_of_voice(cards: list[dict], popular: list[dict]) -> list[dict]:
+    """
+    인기글 후보 카드 전체의 share of voice 항목.
+    텍스트로 못 찾았어도 cascade(pHash / OCR)에서 판정된 카드는 우리 브랜드로 태깅한다.
+    """
+    detected_urls = {r["url"] for r in popular}
+    entries = []
 
-        if img_el:
-            ocr_text = extract_text_from_image_element(img_el)
-        # print(f"[OCR] extracted text: {ocr_text}")
+    cards = [card for card in cards if not is_kin_content(card["url"])]
+    for rank, card in enumerate(cards, start=1):
+        entry = naver_snapshot.share_of_voice_entry(
+            "인기글", rank, card["text"], card["url"]
+        )
+        if card["url"] in detected_urls and NAVER_TARGET_BRAND not in entry["brands"]:
+            entry["brands"].append(NAVER_TARGET_BRAND)
+            entry["brand"] = entry["brand"] or NAVER_TARGET_BRAND
+        entries.append(entry)
 
-        ocr_hit = [kw for kw in NAVER_TARGET_KEYWORDS if kw.lower() in ocr_text]
+    return entries
 
-        if text_hit or ocr_hit:
-            popular_rank += 1
-            results.append(
-                {
-                    "section": "인기글",
-                    "content_type": resolve_ugc_content_type(url),
-                    "rank": popular_rank,
-                    "source_type": "ugc",
-                    "url": url,
-                    "ocr_text": ocr_text[:200],
-                }
-            )
 
-    return results
+# ==============================
+# NAVER: 전체 영역 분석
+# ==============================
+def collect_naver_serp_selenium(driver) -> dict:
+    sov = [] if NAVER_SHARE_OF_VOICE else None
+
+    sections = []
+    sections.extend(find_naver_powerlink_rank(driver, sov))
+    sections.extend(find_naver_brand_content_rank(driver, sov))
+    if has_naver_place_block(driver):
+        sections.extend(find_naver_place_rank(driver, sov))
+
+    return {
+        "sections": sections,
+        "ugc_cards": collect_naver_ugc_cards(driver),
+        "share_of_voice": sov or [],
+    }
+
+
+def collect_naver_serp_lxml(driver) -> dict:
+    return naver_snapshot.parse_naver_serp(
+        driver.page_source, driver.current_url, NAVER_SHARE_OF_VOICE
+    )
+
+
+def collect_naver_serp(driver, backend: str = NAVER_PARSER_BACKEND) -> dict:
+    """
+    드라이버가 필요한 단계만 수행한다.
+    반환: {"sections": 파워링크 / 브랜드콘텐츠 / 플레이스 결과,
+           "ugc_cards": 인기글(UGC) 후보 카드,
+           "share_of_voice": 영역별 전체 카드 순위}
+    후보 카드의 OCR 판정(rank_popular_content)은 드라이버 없이 따로 실행할 수 있다.
+
+    backend="lxml" 이면 page_source 스냅샷 하나로 파싱하고,
+    스냅샷 파싱이 실패하면 Selenium 경로로 다시 분석한다.
+    """
+    if backend == "lxml":
+        try:
+            return collect_naver_serp_lxml(driver)
+        except Exception as e:
+            print(f"[PARSER] lxml 파싱 실패, selenium 으로 재시도: {e}")
+
+    return collect_naver_serp_selenium(driver)
@@ -0,0 +1,298 @@
+"""
+네이버 모바일 검색 결과 page_source 스냅샷 파서 (lxml)
+
+driver.page_source 를 한 번만 가져와 모든 영역을 파싱한다.
+카드마다 WebDriver 호출(text / find_element / get_attribute)을 하지 않으므로
+빠르고, stale element 오류가 발생하지 않는다.
+
+여기 있는 함수들은 모두 HTML 에 대한 순수 함수이며,
+crawler.naver_mobile 의 Selenium 기반 함수와 같은 결과 형식을 반환한다.
+"""
+
+import re, urllib.parse
+
+from lxml import html as lxml_html
+
+from brand_matcher import target_matcher, sov_matcher
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# config.constants 의 CSS 셀렉터와 같은 대상을 가리키는 XPath
+# (lxml.cssselect 는 별도 패키지가 필요하므로 XPath 로 작성)
+POWERLINK_CARD_XPATH = f"//li[{_has_class('bx')}]"
+POWERLINK_AD_LINK_XPATH = ".//a[contains(@href, 'ader.naver.com')]"
+BRAND_CARD_XPATH = (
+    f"//div[{_has_class('_fe_view_power_content')} and @data-template-id='ugcItem']"
+)
+UGC_CARD_XPATH = "//div[@data-template-id='ugcItem']"
+PLACE_ROOT_XPATH = "//*[@id='place-app-root']"
+PLACE_CARD_XPATH = ".//li"
+THUMBNAIL_IMG_XPATH = (
+    ".//div[@data-sds-comp='RectangleImage' and not("
+    + _has_class("sds-comps-image-circle")
+    + ")]//img"
+)
+CARD_URL_XPATHS = [
+    ".//a[@data-heatmap-target='.link' and @href]",
+    ".//a[contains(@href, '?art=')]",
+    ".//a[@href]",
+]
+
+_SKIP_TEXT_TAGS = {"script", "style", "noscript", "template"}
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def load_naver_snapshot(page_source: str, base_url: str | None = None):
+    root = lxml_html.fromstring(page_source)
+    if base_url:
+        root.make_links_absolute(base_url, resolve_base_href=True)
+    return root
+
+
+def _is_hidden(el) -> bool:
+    if el.get("hidden") is not None:
+        return True
+    style = (el.get("style") or "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+def element_text(el) -> str:
+    """
+    Selenium WebElement.text 에 가깝게, 보이는 텍스트만 공백 하나로 이어 붙인다.
+    """
+    parts = []
+
+    def _walk(node):
+        if not isinstance(node.tag, str):
+            # 주석 / processing instruction
+            if node.tail:
+                parts.append(node.tail)
+            return
+        if node.tag in _SKIP_TEXT_TAGS or _is_hidden(node):
+            if node.tail:
+                parts.append(node.tail)
+            return
+
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            _walk(child)
+        if node.tail:
+            parts.append(node.tail)
+
+    if el.text:
+        parts.append(el.text)
+    for child in el:
+        _walk(child)
+
+    return _WHITESPACE_RE.sub(" ", " ".join(parts)).strip()
+
+
+def get_card_url(card) -> str | None:
+    for xpath in CARD_URL_XPATHS:
+        links = card.xpath(xpath)
+        if links:
+            return links[0].get("href")
+    return None
+
+
+def get_thumbnail_src(card) -> str | None:
+    imgs = card.xpath(THUMBNAIL_IMG_XPATH)
+    if not imgs:
+        return None
+
+    img = imgs[0]
+    # lazy-load 이미지는 src 대신 data-* 속성에 원본 주소가 들어 있다
+    for attr in ("src", "data-lazysrc", "data-src"):
+        src = img.get(attr)
+        if src and not src.startswith("data:"):
+            return src
+    return None
+
+
+def is_brand_content(card) -> bool:
+    if card.xpath(POWERLINK_AD_LINK_XPATH):
+        return True
+    return "_fe_view_power_content" in (card.get("class") or "")
+
+
+def get_landing_url(card) -> str | None:
+    """광고 클릭 추적 링크(ader.naver.com)를 제외한 첫 번째 링크"""
+    for link in card.xpath(".//a[@href]"):
+        href = link.get("href")
+        if "ader.naver.com" not in href:
+            return href
+    return None
+
+
+# ==============================
+# NAVER: 경쟁사 점유율 (share of voice)
+# ==============================
+def share_of_voice_entry(section: str, rank: int, text: str, url: str | None) -> dict:
+    """
+    영역의 카드 한 장 (광고주 / 작성자 판별용).
+    brands 는 카드 텍스트에 등장한 우리 브랜드 / 경쟁사, domain 은 링크 호스트.
+    """
+    brands = sov_matcher.brands(text)
+    return {
+        "section": section,
+        "rank": rank,
+        "brand": brands[0] if brands else None,
+        "brands": brands,
+        "domain": urllib.parse.urlsplit(url).netloc if url else None,
+        "url": url,
+        "snippet": text[:100],
+    }
+
+
+# ==============================
+# NAVER: 파워링크
+# ==============================
+def parse_naver_powerlink(root, share_of_voice: list | None = None) -> list[dict]:
+    results = []
+    rank = 0
+
+    for card in root.xpath(POWERLINK_CARD_XPATH):
+        if not card.xpath(POWERLINK_AD_LINK_XPATH):
+            continue
+
+        rank += 1
+        text = element_text(card)
+
+        if share_of_voice is not None:
+            share_of_voice.append(
+                share_of_voice_entry("파워링크", rank, text, get_landing_url(card))
+            )
+
+        if target_matcher.search(text):
+            results.append(
+                {
+                    "section": "파워링크",
+                    "rank": rank,
+                    "matched_snippet": target_matcher.snippet(text),
+                }
+            )
+
+    return results
+
+
+# ==============================
+# NAVER: 브랜드콘텐츠
+# ==============================
+def parse_naver_brand_content(root, share_of_voice: list | None = None) -> list[dict]:
+    results = []
+
+    for idx, card in enumerate(root.xpath(BRAND_CARD_XPATH), start=1):
+        text = element_text(card)
+
+        if share_of_voice is not None:
+            share_of_voice.append(
+                share_of_voice_entry("브랜드콘텐츠", idx, text, get_landing_url(card))
+            )
+
+        if target_matcher.search(text):
+            results.append(
+                {
+                    "section": "브랜드콘텐츠",
+                    "rank": idx,
+                    "matched_snippet": target_matcher.snippet(text),
+                }
+            )
+
+    return results
+
+
+# ==============================
+# NAVER: 플레이스
+# ==============================
+def has_naver_place_block(root) -> bool:
+    return bool(root.xpath(PLACE_ROOT_XPATH))
+
+
+def parse_naver_place(root, share_of_voice: list | None = None) -> list[dict]:
+    results = []
+    roots = root.xpath(PLACE_ROOT_XPATH)
+    if not roots:
+        return results
+
+    ad_rank = 0
+    organic_rank = 0
+
+    for card in roots[0].xpath(PLACE_CARD_XPATH):
+        text = element_text(card)
+
+        if "광고" in text:
+            ad_rank += 1
+            section = "플레이스_광고"
+            rank = ad_rank
+        else:
+            organic_rank += 1
+            section = "플레이스_일반"
+            rank = organic_rank
+
+        if share_of_voice is not None:
+            share_of_voice.append(
+                share_of_voice_entry(section, rank, text, get_landing_url(card))
+            )
+
+        if target_matcher.search(text):
+            results.append(
+                {
+                    "section": section,
+                    "rank": rank,
+                    "matched_snippet": target_matcher.snippet(text),
+                }
+            )
+
+    return results
+
+
+# ==============================
+# NAVER: 인기글 (UGC) 후보 카드
+# ==============================
+def collect_naver_ugc_cards(root) -> list[dict]:
+    """
+    UGC 카드 중 브랜드콘텐츠를 제외한 카드의 url / text / 썸네일 src 를 수집한다.
+    (지식인 제외, OCR 등 후속 판정은 crawler.naver_mobile 에서 수행)
+    """
+    cards = []
+
+    for card in root.xpath(UGC_CARD_XPATH):
+        if is_brand_content(card):
+            continue
+
+        cards.append(
+            {
+                "url": get_card_url(card),
+                "text": element_text(card).lower(),
+                "img_src": get_thumbnail_src(card),
+            }
+        )
+
+    return cards
+
+
+def parse_naver_serp(
+    page_source: str, base_url: str | None = None, share_of_voice: bool = True
+) -> dict:
+    """
+    스냅샷 하나에서 영역별 결과를 한 번에 파싱한다.
+    반환: {"sections": [...], "ugc_cards": [...], "share_of_voice": [...]}
+    """
+    root = load_naver_snapshot(page_source, base_url)
+    sov = [] if share_of_voice else None
+
+    sections = []
+    sections.extend(parse_naver_powerlink(root, sov))
+    sections.extend(parse_naver_brand_content(root, sov))
+    if has_naver_place_block(root):
+        sections.extend(parse_naver_place(root, sov))
+
+    return {
+        "sections": sections,
+        "ugc_cards": collect_naver_ugc_cards(root),
+        "share_of_voice": sov or [],
+    }
@@ -0,0 +1,163 @@
+import queue, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from crawler.base import BaseCrawler
+
+# 죽은 드라이버를 새로 띄울 때 재시도 횟수 (실패 사이 2, 4, ... 초 대기)
+DRIVER_RECREATE_RETRIES = 3
+
+
+class CrawlerPool:
+    """
+    BaseCrawler(Chrome) N개를 띄워 두고, 공유 작업 큐에서 키워드를 꺼내
+    병렬로 크롤링한다.
+
+    - 각 작업은 유휴 드라이버 하나를 빌려서 실행하고 끝나면 반납한다.
+    - 드라이버는 Selenium 특성상 스레드 간 공유하지 않는다 (작업당 1개 점유).
+    - post_fn 이 있으면 드라이버를 반납한 뒤 실행한다 (OCR 등).
+      작업 스레드를 드라이버 수의 2배로 두어, 한 키워드의 후처리 중에
+      같은 드라이버로 다음 키워드를 크롤링할 수 있다.
+    - 빌릴 때 응답이 없거나, 반납 시 max_pages / max_rss_mb 를 넘은 드라이버는
+      새로 띄운 드라이버로 교체한다 (장시간 실행 시 Chrome 메모리 누수 대응).
+    - 교체할 드라이버를 backoff 후에도 띄우지 못하면 그 작업만 실패로 처리하고
+      (imap_unordered 의 error_fn) 나머지 작업은 계속 진행한다.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        crawler_factory=BaseCrawler,
+        max_pages: int | None = None,
+        max_rss_mb: float | None = None,
+    ):
+        self.size = max(1, int(size))
+        self.crawler_factory = crawler_factory
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.recycled = 0
+
+        self.crawlers = []
+        self._crawlers_lock = threading.Lock()
+        self._idle = queue.Queue()
+
+        for _ in range(self.size):
+            crawler = self.crawler_factory()
+            self.crawlers.append(crawler)
+            self._idle.put(crawler)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.size * 2,
+            thread_name_prefix="crawler",
+        )
+
+    def _acquire(self):
+        crawler = self._idle.get()
+        if crawler.is_alive():
+            return crawler
+
+        for attempt in range(1, DRIVER_RECREATE_RETRIES + 1):
+            try:
+                return self._recycle(crawler, "health check failed")
+            except Exception as e:
+                last_error = e
+                print(f"[POOL] driver create failed: {e} (attempt={attempt})")
+                if attempt < DRIVER_RECREATE_RETRIES:
+                    time.sleep(2**attempt)
+
+        # 교체 실패 시 다음 작업에서 다시 시도하도록 반납
+        self._idle.put(crawler)
+        raise last_error
+
+    def _release(self, crawler):
+        crawler.pages += 1
+
+        reason = None
+        if self.max_pages and crawler.pages >= self.max_pages:
+            reason = f"pages={crawler.pages}"
+        elif self.max_rss_mb:
+            rss_mb = crawler.rss_mb()
+            if rss_mb >= self.max_rss_mb:
+                reason = f"rss={rss_mb:.0f}MB"
+
+        if reason:
+            try:
+                crawler = self._recycle(crawler, reason)
+            except Exception as e:
+                # 새 드라이버 생성 실패 → 다음 _acquire 의 health check 에서 재시도
+                print(f"[POOL] driver recycle failed: {e}")
+
+        self._idle.put(crawler)
+
+    def _recycle(self, crawler, reason: str):
+        print(f"[POOL] recycle driver ({reason})")
+
+        try:
+            crawler.close()
+        except Exception:
+            pass
+
+        new_crawler = self.crawler_factory()
+        with self._crawlers_lock:
+            self.crawlers[self.crawlers.index(crawler)] = new_crawler
+            self.recycled += 1
+        return new_crawler
+
+    def _run(self, fn, item, post_fn=None, error_fn=None):
+        try:
+            crawler = self._acquire()
+        except Exception as e:
+            if error_fn is None:
+                raise
+            # 드라이버를 띄우지 못함 → 이 작업만 실패 결과로 처리
+            result = error_fn(item, e)
+        else:
+            try:
+                result = fn(crawler.driver, item)
+            finally:
+                self._release(crawler)
+
+        if post_fn is not None:
+            result = post_fn(item, result)
+        return result
+
+    def imap_unordered(self, fn, items, post_fn=None, error_fn=None):
+        """
+        items 각각에 대해 fn(driver, item)을 실행하고 (post_fn 이 있으면
+        post_fn(item, fn 결과)까지 실행), 끝나는 순서대로 (item, result)를 yield 한다.
+
+        드라이버를 띄우지 못하면 fn 대신 error_fn(item, 예외) 결과를 사용한다.
+        (error_fn 이 없으면 예외 전파)
+        fn / post_fn 에서 발생한 예외는 결과 소비 시점에 그대로 전파된다.
+        소비를 중간에 멈추면 (generator close) 아직 시작하지 않은 작업은 취소된다.
+        """
+        futures = {
+            self._executor.submit(self._run, fn, item, post_fn, error_fn): item
+            for item in items
+        }
+
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def health(self) -> dict:
+        with self._crawlers_lock:
+            crawlers = list(self.crawlers)
+        return {
+            "drivers": len(crawlers),
+            "idle": self._idle.qsize(),
+            "recycled": self.recycled,
+            "pages": [c.pages for c in crawlers],
+            "rss_mb": [round(c.rss_mb()) for c in crawlers],
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+        for crawler in self.crawlers:
+            try:
+                crawler.close()
+            except Exception:
+                pass
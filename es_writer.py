@@ -0,0 +1,287 @@
+import json, os, threading, time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.constants import (
+    ES_HOST,
+    ES_BULK_MAX_DOCS,
+    ES_BULK_MAX_BYTES,
+    ES_BULK_FLUSH_INTERVAL,
+    ES_BULK_MAX_RETRIES,
+    ES_SPOOL_PATH,
+    ES_REJECTED_PATH,
+)
+
+# 재시도 대상 상태 코드 (문서 단위 / 요청 단위 공통)
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+def bulk_url(host: str = ES_HOST) -> str:
+    """ES_HOST 는 인덱스 경로까지 포함 → {host}/_bulk (= {es}/{index}/_bulk)"""
+    return host.rstrip("/") + "/_bulk"
+
+
+class BufferedESWriter:
+    """
+    여러 키워드의 문서를 모아 ES _bulk API 로 한 번에 적재한다.
+
+    - 문서 수(max_docs) / 크기(max_bytes) / 시간(flush_interval) 중 하나라도 넘으면 flush
+    - keep-alive 세션 하나를 재사용 (요청마다 TLS 핸드셰이크 X)
+    - _bulk 응답의 429/5xx 문서는 backoff 후 해당 문서만 재전송
+    - 재시도 후에도 못 보낸 문서는 spool_path(JSONL)에 기록하고,
+      이후 flush 가 성공하면 순서대로 재전송 (재전송 중 종료되면 .replay 파일에서 이어서)
+    - ES 가 거부한 문서(매핑 오류 등 4xx)는 오류와 함께 rejected_path 에 기록 (재전송 X)
+    - close() 시 남은 문서를 모두 flush
+
+    host 는 ES _bulk API 와 같은 계약을 따라야 한다:
+    POST {host}/_bulk 에 NDJSON(action + 문서)을 받고 {"errors", "items": [...]} 응답.
+    응답 형식이 다르면 문서를 적재된 것으로 세지 않고 spool 에 남긴다.
+    """
+
+    def __init__(
+        self,
+        host: str = ES_HOST,
+        max_docs: int = ES_BULK_MAX_DOCS,
+        max_bytes: int = ES_BULK_MAX_BYTES,
+        flush_interval: float = ES_BULK_FLUSH_INTERVAL,
+        max_retries: int = ES_BULK_MAX_RETRIES,
+        spool_path: str | None = ES_SPOOL_PATH,
+        rejected_path: str | None = ES_REJECTED_PATH,
+    ):
+        self.bulk_url = bulk_url(host)
+        self.max_docs = max_docs
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.spool_path = Path(spool_path) if spool_path else None
+        self.rejected_path = Path(rejected_path) if rejected_path else None
+
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=4))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=4))
+
+        self._buffer = []  # NDJSON 으로 직렬화된 문서 목록
+        self._buffer_bytes = 0
+        self._last_flush_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self._closed = threading.Event()
+        self._timer = threading.Thread(
+            target=self._flush_periodically, name="es-writer", daemon=True
+        )
+        self._timer.start()
+
+    def add(self, docs: list[dict]):
+        with self._lock:
+            for doc in docs:
+                line = json.dumps(doc, ensure_ascii=False)
+                self._buffer.append(line)
+                self._buffer_bytes += len(line.encode("utf-8"))
+
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        with self._lock:
+            due = self._buffer and (
+                len(self._buffer) >= self.max_docs
+                or self._buffer_bytes >= self.max_bytes
+                or time.monotonic() - self._last_flush_at >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending = self._buffer
+                self._buffer = []
+                self._buffer_bytes = 0
+                self._last_flush_at = time.monotonic()
+
+            if not pending:
+                return
+
+            indexed, unsent, rejected = self._send_with_retry(pending)
+            self._spool(unsent)
+            self._reject(rejected)
+            print(
+                f"[ES BULK] indexed={indexed} spooled={len(unsent)} "
+                f"rejected={len(rejected)}"
+            )
+
+            # 이번 전송이 성공했으면 이전에 못 보낸 문서도 재전송
+            if not unsent:
+                self._replay_spool()
+
+    def close(self):
+        self._closed.set()
+        self._timer.join(timeout=5)
+        self.flush()
+        self.session.close()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(min(self.flush_interval, 5)):
+            try:
+                self.flush_if_due()
+            except Exception as e:
+                print(f"[ES ERROR] periodic flush failed: {e}")
+
+    def _send_with_retry(
+        self, lines: list[str]
+    ) -> tuple[int, list[str], list[tuple[str, object]]]:
+        """
+        반환: (적재 수, 재시도 후에도 못 보낸 문서, ES 가 거부한 (문서, 오류))
+        """
+        indexed = 0
+        rejected = []
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                retry_lines, ok, errors = self._send_bulk(lines)
+            except requests.RequestException as e:
+                status = getattr(e.response, "status_code", None)
+                if attempt < self.max_retries and (
+                    status is None or status in RETRYABLE_STATUS
+                ):
+                    time.sleep(2**attempt)
+                    continue
+                print(f"[ES ERROR] bulk request failed: {e} (docs={len(lines)})")
+                return indexed, lines, rejected
+            except ValueError as e:
+                # _bulk 응답이 아님 → ES_HOST 가 {index}/_bulk 를 받는 엔드포인트인지 확인
+                print(f"[ES ERROR] {e} (docs={len(lines)})")
+                return indexed, lines, rejected
+
+            indexed += ok
+            for line, error in errors:
+                print(f"[ES ERROR] {error}")
+                rejected.append((line, error))
+
+            if not retry_lines:
+                return indexed, [], rejected
+
+            if attempt == self.max_retries:
+                return indexed, retry_lines, rejected
+
+            # 일부 문서만 실패 (429/5xx) → 해당 문서만 재전송
+            lines = retry_lines
+            time.sleep(2**attempt)
+
+        return indexed, lines, rejected
+
+    def _send_bulk(self, lines: list[str]) -> tuple[list[str], int, list]:
+        body = "".join(f'{{"index":{{}}}}\n{line}\n' for line in lines)
+
+        resp = self.session.post(
+            self.bulk_url,
+            data=body.encode("utf-8"),
+            headers={"Content-Type": "application/x-ndjson"},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        result = resp.json()
+
+        items = result.get("items") if isinstance(result, dict) else None
+        if not isinstance(items, list) or len(items) != len(lines):
+            raise ValueError(
+                f"unexpected _bulk response from {self.bulk_url}: "
+                f"{resp.text[:200]}"
+            )
+
+        if not result.get("errors"):
+            return [], len(lines), []
+
+        retry_lines = []
+        errors = []
+        ok = 0
+
+        for line, item in zip(lines, items):
+            action = next(iter(item.values()))
+            status = action.get("status", 500)
+
+            if status < 300:
+                ok += 1
+            elif status in RETRYABLE_STATUS:
+                retry_lines.append(line)
+            else:
+                errors.append((line, action.get("error")))
+
+        return retry_lines, ok, errors
+
+    # ==============================
+    # spool (JSONL) — 모두 flush() 의 _flush_lock 안에서 호출
+    # ==============================
+    @staticmethod
+    def _append_lines(path: Path, lines: list[str]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+
+    def _spool(self, lines: list[str]):
+        if not lines:
+            return
+        if self.spool_path is None:
+            print(f"[ES ERROR] dropped docs={len(lines)} (no spool)")
+            return
+        self._append_lines(self.spool_path, lines)
+
+    def _reject(self, rejected: list[tuple[str, object]]):
+        if not rejected or self.rejected_path is None:
+            return
+        self._append_lines(
+            self.rejected_path,
+            [
+                json.dumps(
+                    {"error": error, "doc": json.loads(line)}, ensure_ascii=False
+                )
+                for line, error in rejected
+            ],
+        )
+
+    def _replay_spool(self):
+        """
+        spool 에 쌓인 문서를 max_docs 개씩 순서대로 재전송한다.
+        실패하면 못 보낸 문서를 그 사이 새로 쌓인 문서 앞에 다시 기록한다.
+        """
+        if self.spool_path is None:
+            return
+
+        replay_path = self.spool_path.with_suffix(".replay")
+        if self.spool_path.exists():
+            if replay_path.exists():
+                with open(replay_path, "a", encoding="utf-8") as f:
+                    f.write(self.spool_path.read_text(encoding="utf-8"))
+                self.spool_path.unlink()
+            else:
+                os.replace(self.spool_path, replay_path)
+        if not replay_path.exists():
+            return
+
+        lines = replay_path.read_text(encoding="utf-8").splitlines()
+        indexed = 0
+        remaining = []
+        for start in range(0, len(lines), self.max_docs):
+            ok, unsent, rejected = self._send_with_retry(
+                lines[start : start + self.max_docs]
+            )
+            indexed += ok
+            self._reject(rejected)
+            if unsent:
+                remaining = unsent + lines[start + self.max_docs :]
+                break
+
+        if remaining:
+            if self.spool_path.exists():
+                remaining += self.spool_path.read_text(encoding="utf-8").splitlines()
+            tmp_path = self.spool_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for line in remaining:
+                    f.write(line + "\n")
+            os.replace(tmp_path, self.spool_path)
+        replay_path.unlink(missing_ok=True)
+
+        print(f"[ES BULK] spool replayed={indexed} remaining={len(remaining)}")
@@ -0,0 +1,230 @@
+import hashlib, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.constants import (
+    IMAGE_FETCH_WORKERS,
+    IMAGE_FETCH_TIMEOUT,
+    IMAGE_CACHE_DIR,
+    IMAGE_CACHE_MAX_BYTES,
+    OCR_CACHE_SRC_TTL,
+)
+
+
+class ImageFetcher:
+    """
+    썸네일 이미지 다운로더
+
+    - keep-alive Session 하나를 공유해 이미지 CDN 연결(TCP / TLS)을 재사용
+    - 페이지의 썸네일 src 를 스레드 풀로 동시에 받아 옴 (fetch_many)
+    - 받은 bytes 는 디스크 캐시(src 해시 파일명)에 저장하고,
+      max_bytes 를 넘으면 오래 안 쓰인 파일(atime 순)부터 삭제
+    - 저장한 지 ttl 이 지난 파일(mtime 기준)은 다시 쓰지 않고 삭제
+    """
+
+    def __init__(
+        self,
+        workers: int = IMAGE_FETCH_WORKERS,
+        timeout=IMAGE_FETCH_TIMEOUT,
+        cache_dir: str | None = IMAGE_CACHE_DIR,
+        max_bytes: int = IMAGE_CACHE_MAX_BYTES,
+        ttl: float = OCR_CACHE_SRC_TTL,
+    ):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="image-fetch"
+        )
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.cache_hits = 0
+        self.failures = 0
+        self.bytes = 0
+
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._cache_bytes = 0
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cache_bytes = sum(
+                p.stat().st_size for p in self.cache_dir.iterdir()
+            )
+
+    # ==============================
+    # 디스크 캐시
+    # ==============================
+    def _cache_path(self, src: str) -> Path:
+        return self.cache_dir / hashlib.sha1(src.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, src: str) -> bytes | None:
+        if self.cache_dir is None:
+            return None
+
+        path = self._cache_path(src)
+        try:
+            stat = path.stat()
+            now = time.time()
+            if now - stat.st_mtime > self.ttl:
+                path.unlink()
+                with self._lock:
+                    self._cache_bytes -= stat.st_size
+                return None
+
+            data = path.read_bytes()
+            os.utime(path, (now, stat.st_mtime))  # LRU 기준(atime)만 갱신
+            return data
+        except OSError:
+            return None
+
+    def _cache_put(self, src: str, data: bytes):
+        if self.cache_dir is None:
+            return
+
+        path = self._cache_path(src)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(data)
+        except OSError:
+            return
+
+        with self._lock:
+            try:
+                old_size = path.stat().st_size
+            except OSError:
+                old_size = 0
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                return
+            self._cache_bytes += len(data) - old_size
+            over = self._cache_bytes > self.max_bytes
+        if over:
+            self._prune()
+
+    def _prune(self):
+        # 만료된 파일을 지우고, 최대 용량의 90% 이하가 될 때까지 오래 안 쓰인 파일부터 삭제
+        now = time.time()
+        with self._lock:
+            files = []
+            for p in self.cache_dir.iterdir():
+                try:
+                    stat = p.stat()
+                    if now - stat.st_mtime > self.ttl:
+                        p.unlink()
+                        continue
+                except OSError:
+                    continue
+                files.append((stat.st_atime, stat.st_size, p))
+
+            files.sort()
+            total = sum(size for _, size, _ in files)
+            for _, size, p in files:
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    p.unlink()
+                    total -= size
+                except OSError:
+                    pass
+            self._cache_bytes = total
+
+    # ==============================
+    # 다운로드
+    # ==============================
+    def _fetch(self, src: str) -> tuple[bytes | None, bool, float]:
+        """(bytes, 캐시 적중 여부, 소요 시간)"""
+        start_t = time.perf_counter()
+
+        data = self._cache_get(src)
+        if data is not None:
+            return data, True, time.perf_counter() - start_t
+
+        try:
+            resp = self.session.get(src, timeout=self.timeout)
+            resp.raise_for_status()
+            data = resp.content
+        except requests.RequestException:
+            return None, False, time.perf_counter() - start_t
+
+        self._cache_put(src, data)
+        return data, False, time.perf_counter() - start_t
+
+    def _record(self, results: list[tuple[bytes | None, bool, float]]):
+        with self._lock:
+            for data, cache_hit, _ in results:
+                if cache_hit:
+                    self.cache_hits += 1
+                else:
+                    self.requests += 1
+                if data is None:
+                    self.failures += 1
+                else:
+                    self.bytes += len(data)
+
+    def fetch_many(self, srcs: list[str | None]) -> tuple[list[bytes | None], dict]:
+        """
+        src 목록을 동시에 받아 입력 순서대로 반환한다. (같은 src 는 한 번만 요청)
+        반환: (bytes 목록, 페이지 통계)
+        """
+        start_t = time.perf_counter()
+        unique = list(dict.fromkeys(src for src in srcs if src))
+        results = dict(zip(unique, self._executor.map(self._fetch, unique)))
+        self._record(list(results.values()))
+
+        page_stats = {
+            "images": len(unique),
+            "cache_hits": sum(1 for _, hit, _ in results.values() if hit),
+            "failures": sum(1 for data, _, _ in results.values() if data is None),
+            "bytes": sum(len(data) for data, _, _ in results.values() if data),
+            "elapsed_ms": round((time.perf_counter() - start_t) * 1000),
+            "max_latency_ms": round(
+                max((sec for _, _, sec in results.values()), default=0) * 1000
+            ),
+        }
+        return [results[src][0] if src else None for src in srcs], page_stats
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "cache_hits": self.cache_hits,
+                "failures": self.failures,
+                "bytes": self.bytes,
+                "cache_bytes": self._cache_bytes,
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_image_fetcher() -> ImageFetcher:
+    global _fetcher
+
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = ImageFetcher()
+        return _fetcher
+
+
+def close_image_fetcher():
+    global _fetcher
+
+    with _fetcher_lock:
+        if _fetcher is not None:
+            _fetcher.close()
+            _fetcher = None
@@ -2,8 +2,11 @@
 
 # ==============================
 # search-ad-keyword-monitor
-# infinite loop runner
+# daemon supervisor
 # (Google Chrome + headless)
+#
+# main.py --daemon 이 사이클을 내부에서 반복하므로
+# 이 스크립트는 프로세스가 비정상 종료된 경우에만 재시작한다.
 # ==============================
 
 BASE_DIR="$(cd "$(dirname "$0")" && pwd)"
@@ -19,10 +22,10 @@ while true; do
   LOG_FILE="$LOG_DIR/monitor-$(date +%F).log"
 
   BATCH_START=$(date +%s)
-  echo "[INFO] $(date '+%Y-%m-%d %H:%M:%S') start crawl" >> "$LOG_FILE"
+  echo "[INFO] $(date '+%Y-%m-%d %H:%M:%S') start daemon" >> "$LOG_FILE"
 
   # ==============================
-  # Chrome 잔재 정리 (Google Chrome 기준)
+  # Chrome 잔재 정리 (Google Chrome 기준, 이전 프로세스 비정상 종료 대비)
   # ==============================
   pkill -f google-chrome || true
   pkill -f chromedriver || true
@@ -34,7 +37,7 @@ while true; do
   # ==============================
   # Python 실행 (headless Chrome)
   # ==============================
-  PYTHONPATH=. "$VENV_PYTHON" main.py >> "$LOG_FILE" 2>&1 &
+  PYTHONPATH=. "$VENV_PYTHON" main.py --daemon >> "$LOG_FILE" 2>&1 &
 
   PY_PID=$!
   echo "[INFO] $(date '+%Y-%m-%d %H:%M:%S') python started. pid=$PY_PID" >> "$LOG_FILE"
@@ -49,6 +52,12 @@ while true; do
   echo "[WARN] $(date '+%Y-%m-%d %H:%M:%S') python exited. pid=$PY_PID exit_code=$EXIT_CODE elapsed=${ELAPSED}s" \
     >> "$LOG_FILE"
 
-  # 다음 배치까지 대기
+  # 정상 종료(SIGTERM)면 supervisor 도 종료
+  if [ "$EXIT_CODE" -eq 0 ]; then
+    echo "[INFO] $(date '+%Y-%m-%d %H:%M:%S') daemon stopped normally" >> "$LOG_FILE"
+    break
+  fi
+
+  # 재시작 전 대기
   sleep 15
 done
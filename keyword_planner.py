@@ -0,0 +1,75 @@
+import re, unicodedata
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    중복 판단용 키워드 정규화.
+    유니코드 정규화(NFKC) + 앞뒤 공백 제거 + 연속 공백 1칸 + 소문자.
+    (단어 사이 공백은 검색 결과가 달라질 수 있어 제거하지 않는다)
+    """
+    keyword = unicodedata.normalize("NFKC", keyword)
+    return _WHITESPACE_RE.sub(" ", keyword).strip().lower()
+
+
+class KeywordPlan:
+    """
+    한 사이클의 크롤링 계획.
+
+    - queries : 실제로 크롤링할 키워드 (정규화 기준 중복 제거, 처음 등장한 표기 사용)
+    - targets : 크롤링 키워드 → 결과를 받아야 하는 (시트명, 원래 키워드) 목록
+    - priorities : 크롤링 키워드 → 시트들의 우선순위 중 최댓값
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.targets = {}
+        self.priorities = {}
+        self.total = 0
+        self._query_by_key = {}
+
+    def add(self, sheet_name: str, keyword: str, priority: float = 1.0):
+        key = normalize_keyword(keyword)
+        if not key:
+            return
+
+        self.total += 1
+        query = self._query_by_key.get(key)
+        if query is None:
+            query = keyword.strip()
+            self._query_by_key[key] = query
+            self.queries.append(query)
+            self.targets[query] = []
+            self.priorities[query] = priority
+
+        self.priorities[query] = max(self.priorities[query], priority)
+        target = (sheet_name, keyword)
+        if target not in self.targets[query]:
+            self.targets[query].append(target)
+
+    @property
+    def saved(self) -> int:
+        """중복 제거로 생략되는 크롤링 수"""
+        return self.total - len(self.queries)
+
+    def summary(self) -> str:
+        return (
+            f"keywords={self.total} unique={len(self.queries)} "
+            f"saved_crawls={self.saved}"
+        )
+
+
+def plan_keywords(keywords_by_sheet: dict[str, list]) -> KeywordPlan:
+    """
+    시트별 키워드 목록을 합쳐 중복 없는 크롤링 계획을 만든다. (시트 순서 유지)
+    목록 항목은 키워드 문자열 또는 (키워드, 우선순위) 튜플
+    """
+    plan = KeywordPlan()
+    for sheet_name, keywords in keywords_by_sheet.items():
+        for item in keywords:
+            if isinstance(item, tuple):
+                plan.add(sheet_name, *item)
+            else:
+                plan.add(sheet_name, item)
+    return plan
@@ -0,0 +1,123 @@
+import json, math, os, time
+from pathlib import Path
+
+from keyword_planner import normalize_keyword
+from config.constants import (
+    SCHEDULER_STATE_PATH,
+    SCHEDULER_BASE_INTERVAL,
+    SCHEDULER_MIN_INTERVAL,
+    SCHEDULER_MAX_INTERVAL,
+    SCHEDULER_VOLATILITY_WEIGHT,
+    SCHEDULER_PAGE_BUDGET,
+)
+
+# 노출 영역 변화율(volatility) 지수이동평균 계수
+VOLATILITY_ALPHA = 0.3
+# 이력이 없는 키워드의 초기 volatility
+INITIAL_VOLATILITY = 0.5
+
+
+class KeywordScheduler:
+    """
+    키워드별 크롤링 주기를 우선순위 / 노출 변화율 / 마지막 크롤링 시각으로 정한다.
+
+    - 재크롤링 간격 = BASE / (priority x (1 + WEIGHT x volatility)), [MIN, MAX] 범위로 제한
+    - volatility : 크롤링할 때마다 노출 영역 집합이 바뀌었는지의 지수이동평균 (0~1)
+    - 간격이 지난 키워드 중 밀린 비율이 큰 순서로 page_budget 개까지 선택
+    - 상태는 JSON 파일로 저장해 재시작 후에도 유지
+    """
+
+    def __init__(
+        self,
+        state_path: str = SCHEDULER_STATE_PATH,
+        base_interval: float = SCHEDULER_BASE_INTERVAL,
+        min_interval: float = SCHEDULER_MIN_INTERVAL,
+        max_interval: float = SCHEDULER_MAX_INTERVAL,
+        volatility_weight: float = SCHEDULER_VOLATILITY_WEIGHT,
+        page_budget: int | None = SCHEDULER_PAGE_BUDGET,
+    ):
+        self.state_path = Path(state_path)
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.volatility_weight = volatility_weight
+        self.page_budget = page_budget
+
+        self.state = {}
+        self._dirty = 0
+
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[SCHEDULER] state load failed, start fresh: {e}")
+
+    def interval(self, key: str, priority: float) -> float:
+        volatility = self.state.get(key, {}).get("volatility", INITIAL_VOLATILITY)
+        factor = max(priority, 0.01) * (1 + self.volatility_weight * volatility)
+        return min(
+            self.max_interval, max(self.min_interval, self.base_interval / factor)
+        )
+
+    def select(
+        self, queries: list[str], priorities: dict[str, float] | None = None
+    ) -> list[str]:
+        """이번 사이클에 크롤링할 키워드를 급한 순서대로 반환한다."""
+        now = time.time()
+        priorities = priorities or {}
+
+        scored = []
+        for order, query in enumerate(queries):
+            key = normalize_keyword(query)
+            last = self.state.get(key, {}).get("last_crawl_at")
+
+            if last is None:
+                overdue = math.inf  # 처음 보는 키워드는 항상 먼저
+            else:
+                overdue = (now - last) / self.interval(key, priorities.get(query, 1.0))
+
+            if overdue >= 1:
+                scored.append((-overdue, order, query))
+
+        scored.sort()
+        selected = [query for _, _, query in scored]
+        if self.page_budget:
+            selected = selected[: self.page_budget]
+        return selected
+
+    def record(self, query: str, exposed_sections: set[str]):
+        """크롤링 성공 시 노출 영역 집합으로 volatility / 마지막 크롤링 시각 갱신"""
+        key = normalize_keyword(query)
+        entry = self.state.setdefault(
+            key, {"volatility": INITIAL_VOLATILITY, "crawls": 0, "changes": 0}
+        )
+
+        sections = sorted(exposed_sections)
+        if "sections" in entry:
+            changed = entry["sections"] != sections
+            entry["changes"] += int(changed)
+            entry["volatility"] = round(
+                VOLATILITY_ALPHA * changed
+                + (1 - VOLATILITY_ALPHA) * entry["volatility"],
+                4,
+            )
+
+        entry["sections"] = sections
+        entry["crawls"] += 1
+        entry["last_crawl_at"] = time.time()
+
+        self._dirty += 1
+        if self._dirty >= 50:
+            self.save()
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+        self._dirty = 0
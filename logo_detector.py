@@ -1,48 +1,361 @@
 from pathlib import Path
 from PIL import Image
 import imagehash
-import io
+import numpy as np
+import hashlib, io, json, os, threading, time
+
+from config.constants import (
+    LOGO_HASH_TYPES,
+    LOGO_INDEX_BACKEND,
+    LOGO_TEMPLATE_CACHE_PATH,
+    LOGO_TEMPLATE_RELOAD_INTERVAL,
+)
+
+HASH_FUNCS = {
+    "phash": imagehash.phash,
+    "dhash": imagehash.dhash,
+    "whash": imagehash.whash,
+}
+
+TEMPLATE_SUFFIXES = (".png", ".jpg", ".jpeg")
+# 템플릿 해시 인덱스 파일 형식이 바뀌면 올려서 기존 인덱스를 무시
+TEMPLATE_INDEX_VERSION = 1
+
+# 해시 종류별 평균 해밍 거리 기준 분류
+SAME_MAX_DIST = 5
+SIMILAR_MAX_DIST = 14
+
+# numpy < 2.0 에는 np.bitwise_count 가 없어 바이트 단위 lookup table 로 계산
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    counts = _POPCOUNT_TABLE[values.view(np.uint8)]
+    return counts.reshape(*values.shape, 8).sum(axis=-1)
+
+
+def pack_hash(h: imagehash.ImageHash) -> int:
+    """8x8 bool 해시를 64bit 정수로 변환"""
+    return int.from_bytes(np.packbits(h.hash.flatten()).tobytes(), "big")
+
+
+class BKTree:
+    """
+    해시 벡터(해시 종류별 64bit 정수)의 해밍 거리 합 기준 BK-tree.
+    템플릿이 매우 많을 때 반경 이내 후보만 탐색한다.
+    노드: [key, value, {거리: 자식 노드}]
+    """
+
+    def __init__(self):
+        self.root = None
+
+    @staticmethod
+    def distance(a: tuple[int, ...], b: tuple[int, ...]) -> int:
+        return sum((x ^ y).bit_count() for x, y in zip(a, b))
+
+    def add(self, key: tuple[int, ...], value):
+        if self.root is None:
+            self.root = [key, value, {}]
+            return
+
+        node = self.root
+        while True:
+            dist = self.distance(key, node[0])
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = [key, value, {}]
+                return
+            node = child
+
+    def nearest(self, key: tuple[int, ...], radius: int) -> tuple[int, object] | None:
+        """
+        반경 radius 이내에서 가장 가까운 (거리, value). 없으면 None.
+        더 가까운 후보를 찾을 때마다 탐색 반경을 줄여 가지치기한다.
+        """
+        best = None
+        stack = [self.root] if self.root is not None else []
+
+        while stack:
+            node = stack.pop()
+            dist = self.distance(key, node[0])
+            if dist <= radius and (best is None or dist < best[0]):
+                best = (dist, node[1])
+                radius = dist
+                if dist == 0:
+                    break
+
+            for child_dist, child in node[2].items():
+                if dist - radius <= child_dist <= dist + radius:
+                    stack.append(child)
+
+        return best
 
 
 class YKLogoDetector:
-    def __init__(self, template_dir: str):
-        self.templates = []
+    """
+    썸네일과 로고 템플릿의 perceptual hash 거리로 로고 노출 여부를 판정한다.
+
+    - 템플릿 해시는 (템플릿 수, 해시 종류 수) uint64 배열로 보관하고,
+      전체 템플릿과의 해밍 거리를 XOR + popcount 한 번으로 계산한다.
+    - hash_types 로 phash / dhash / whash 를 함께 쓸 수 있다 (거리는 종류별 평균).
+    - index="bktree" 면 BK-tree 로 SIMILAR_MAX_DIST 반경 안의 후보만 탐색한다.
+      (반경 밖은 비교하지 않으므로 "different" 일 때 템플릿 / 거리는 None / 999)
+    - 템플릿 해시는 파일 mtime / size 와 함께 cache_path 에 저장해 두고,
+      바뀐 파일만 다시 해시한다.
+    - reload_interval 초마다 (match 호출 시) 디렉터리를 다시 확인해
+      추가 / 변경 / 삭제된 템플릿을 재시작 없이 반영한다. (None 이면 끔)
+    """
+
+    def __init__(
+        self,
+        template_dir: str,
+        hash_types=LOGO_HASH_TYPES,
+        index: str = LOGO_INDEX_BACKEND,
+        cache_path: str | None = LOGO_TEMPLATE_CACHE_PATH,
+        reload_interval: float | None = LOGO_TEMPLATE_RELOAD_INTERVAL,
+    ):
+        self.template_dir = Path(template_dir)
+        self.hash_types = tuple(hash_types)
+        self.index = index
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.reload_interval = reload_interval
+
+        self._reload_lock = threading.Lock()
+        self._last_reload_check = time.monotonic()
+        self._index = self._load_index()
 
         # print(f"[PHASH] loading templates from: {template_dir}")
 
-        for p in Path(template_dir).iterdir():
-            if p.suffix.lower() not in (".png", ".jpg", ".jpeg"):
+        names, rows, _ = self._scan()
+        if not names:
+            raise ValueError("pHash 템플릿을 하나도 로드하지 못했습니다.")
+
+        self.set_templates(names, rows)
+
+        # print(f"[PHASH] total templates loaded = {len(self.names)}")
+
+    @classmethod
+    def from_hashes(
+        cls,
+        names: list[str],
+        rows: list[list[int]],
+        hash_types=LOGO_HASH_TYPES,
+        index: str = LOGO_INDEX_BACKEND,
+    ):
+        """이미 계산된 템플릿 해시로 생성 (벤치마크 / 캐시 로드용)"""
+        detector = cls.__new__(cls)
+        detector.template_dir = None
+        detector.hash_types = tuple(hash_types)
+        detector.index = index
+        detector.cache_path = None
+        detector.reload_interval = None
+        detector.set_templates(names, rows)
+        return detector
+
+    # ==============================
+    # 템플릿 해시 인덱스
+    # ==============================
+    def _load_index(self) -> dict:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[PHASH] template index load failed, rebuild: {e}")
+            return {}
+
+        if data.get("version") != TEMPLATE_INDEX_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _save_index(self):
+        if self.cache_path is None:
+            return
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": TEMPLATE_INDEX_VERSION, "files": self._index},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.cache_path)
+
+    def _scan(self) -> tuple[list[str], list[list[int]], bool]:
+        """
+        템플릿 디렉터리를 읽어 (names, rows, changed) 를 반환한다.
+        mtime / size 가 인덱스와 같은 파일은 저장된 해시를 쓰고,
+        새로 추가되거나 바뀐 파일만 이미지를 열어 해시한다.
+        """
+        files = {}
+        names = []
+        rows = []
+        changed = False
+
+        for p in sorted(self.template_dir.iterdir()):
+            if p.suffix.lower() not in TEMPLATE_SUFFIXES:
                 continue
 
-            img = Image.open(p).convert("RGB")
-            h = imagehash.phash(img)
-            self.templates.append((p.name, h))
+            stat = p.stat()
+            entry = self._index.get(p.name)
+            hashes = {}
+            if (
+                entry
+                and entry["mtime_ns"] == stat.st_mtime_ns
+                and entry["size"] == stat.st_size
+            ):
+                hashes = entry["hashes"]
 
-            # print(f"[PHASH][OK] {p.name} loaded")
+            missing = [t for t in self.hash_types if t not in hashes]
+            if missing:
+                try:
+                    img = Image.open(p).convert("RGB")
+                except OSError as e:
+                    print(f"[PHASH] template load failed: {p.name} ({e})")
+                    continue
 
-        if not self.templates:
-            raise ValueError("pHash 템플릿을 하나도 로드하지 못했습니다.")
+                hashes = {
+                    **hashes,
+                    **{t: pack_hash(HASH_FUNCS[t](img)) for t in missing},
+                }
+                changed = True
+
+            files[p.name] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hashes": hashes,
+            }
+            names.append(p.name)
+            rows.append([hashes[t] for t in self.hash_types])
+
+        if files.keys() != self._index.keys():
+            changed = True
+
+        self._index = files
+        if changed:
+            self._save_index()
+
+        return names, rows, changed
+
+    def reload(self) -> bool:
+        """템플릿 디렉터리 변경분을 반영한다. 바뀐 것이 있으면 True"""
+        names, rows, changed = self._scan()
+        if changed and names:
+            self.set_templates(names, rows)
+            print(f"[PHASH] templates reloaded: {len(names)}")
+        return changed
+
+    def _maybe_reload(self):
+        if self.reload_interval is None:
+            return
+
+        now = time.monotonic()
+        if now - self._last_reload_check < self.reload_interval:
+            return
+
+        # 다른 스레드가 확인 중이면 기존 템플릿으로 바로 매칭
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_reload_check = now
+            self.reload()
+        except OSError as e:
+            print(f"[PHASH] template reload failed: {e}")
+        finally:
+            self._reload_lock.release()
 
-        # print(f"[PHASH] total templates loaded = {len(self.templates)}")
+    def set_templates(self, names: list[str], rows: list[list[int]]):
+        hashes = np.array(rows, dtype=np.uint64).reshape(
+            len(names), len(self.hash_types)
+        )
+        hashes.setflags(write=False)
+
+        bktree = None
+        if self.index == "bktree":
+            bktree = BKTree()
+            for i, row in enumerate(rows):
+                bktree.add(tuple(row), i)
+
+        # 템플릿 구성이 바뀌면 달라지는 값 (인기글 fingerprint 에 포함)
+        h = hashlib.sha1(",".join(self.hash_types).encode())
+        h.update("\x1f".join(names).encode("utf-8"))
+        h.update(hashes.tobytes())
+
+        # (names, hashes, bktree, templates_key) 를 속성 하나로 교체한다.
+        # match() 는 이 튜플을 한 번만 읽으므로 reload 중에도 섞인 값을 보지 않는다.
+        self._templates = (tuple(names), hashes, bktree, h.hexdigest())
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return self._templates[0]
+
+    @property
+    def hashes(self) -> np.ndarray:
+        return self._templates[1]
+
+    @property
+    def bktree(self) -> BKTree | None:
+        return self._templates[2]
+
+    @property
+    def templates_key(self) -> str:
+        return self._templates[3]
+
+    def state_key(self) -> str:
+        """현재 템플릿 상태 식별자 (reload_interval 이 지났으면 먼저 다시 로드)"""
+        self._maybe_reload()
+        return self.templates_key
+
+    @property
+    def templates(self) -> list[tuple[str, list[int]]]:
+        names, hashes, _, _ = self._templates
+        return list(zip(names, hashes.tolist()))
+
+    def hash_image(self, img: Image.Image) -> list[int]:
+        return [pack_hash(HASH_FUNCS[t](img)) for t in self.hash_types]
+
+    def hash_bytes(self, img_bytes: bytes) -> list[int]:
+        return self.hash_image(Image.open(io.BytesIO(img_bytes)).convert("RGB"))
+
+    def distances(
+        self, target: list[int], hashes: np.ndarray | None = None
+    ) -> np.ndarray:
+        """모든 템플릿과의 해밍 거리 합 (템플릿 수,)"""
+        if hashes is None:
+            hashes = self.hashes
+        target = np.array(target, dtype=np.uint64)
+        return _popcount(hashes ^ target).sum(axis=1)
 
     def match(self, img_bytes: bytes) -> tuple[str, str | None, int]:
-        target_img = Image.open(io.BytesIO(img_bytes)).convert("RGB")
-        target_hash = imagehash.phash(target_img)
+        return self.match_hash(self.hash_bytes(img_bytes))
 
-        best_dist = 999
-        best_name = None
+    def match_hash(self, target: list[int]) -> tuple[str, str | None, int]:
+        self._maybe_reload()
+        names, hashes, bktree, _ = self._templates
+        n_types = len(self.hash_types)
 
-        for name, tmpl_hash in self.templates:
-            dist = int(target_hash - tmpl_hash)  # Hamming distance
+        if bktree is not None:
+            hit = bktree.nearest(tuple(target), SIMILAR_MAX_DIST * n_types)
+            if hit is None:
+                return "different", None, 999
+            total, best = hit
+        else:
+            dists = self.distances(target, hashes)
+            best = int(np.argmin(dists))
+            total = int(dists[best])
 
-            if dist < best_dist:
-                best_dist = dist
-                best_name = name
+        best_dist = round(total / n_types)
+        best_name = names[best]
 
         # 🔴 CHANGED: 거리 구간 분류
-        if best_dist <= 5:
+        if best_dist <= SAME_MAX_DIST:
             status = "same"
-        elif best_dist <= 14:
+        elif best_dist <= SIMILAR_MAX_DIST:
             status = "similar"
         else:
             status = "different"
@@ -1,29 +1,52 @@
-import warnings, time, random, json, argparse, subprocess, requests
+import warnings, time, json, argparse, importlib, signal, threading
 
-from anyio import Path
-from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
+# --profile-startup 용: main.py 모듈 import 시작 시각
+_IMPORT_START = time.perf_counter()
+
+from pathlib import Path
 from datetime import datetime, timedelta, timezone
 
 from crawler.base import BaseCrawler
+from crawler.pool import CrawlerPool
+from crawler.browser_images import get_loaded_image_bytes, browser_image_stats
+from es_writer import BufferedESWriter, bulk_url
+from sheets_client import SheetsAppendBuffer
+from keyword_planner import plan_keywords
+from keyword_scheduler import KeywordScheduler
+from image_fetcher import get_image_fetcher, close_image_fetcher
+from noti_client import get_noti_client, close_noti_client
+from serp_fingerprint import (
+    fingerprint_ugc_cards,
+    get_serp_fingerprint_store,
+    close_serp_fingerprint_store,
+)
+from ocr_util import get_ocr_cache, close_ocr_cache, get_ocr_reader
+from ocr_service import get_ocr_service, shutdown_ocr_service
+from sheets_client import get_sheets_service
 
 # from crawler.base import create_google_driver
 from util import (
     load_keywords,
-    load_keywords_by_google_sheet,
-    append_results_to_google_sheet,
+    KeywordSheetCache,
     build_naver_mobile_search_url,
     now_utc_iso,
     get_unexposed_summary,
+    get_exposed_sections,
+    split_share_of_voice,
+    EXPOSURE_RECORD,
+    SHARE_OF_VOICE_RECORD,
 )
 
 from crawler.naver_mobile import (
+    open_naver_serp,
+    wait_for_naver_serp,
     ensure_naver_exact_query,
-    find_naver_powerlink_rank,
-    find_naver_brand_content_rank,
-    has_naver_place_block,
-    find_naver_place_rank,
-    find_popular_content_ocr,
+    collect_naver_serp,
+    rank_popular_content,
+    ugc_share_of_voice,
+    ugc_cascade_stats,
+    get_logo_detector,
+    logo_template_state,
 )
 
 # from crawler.google_desktop import (
@@ -33,10 +56,19 @@ from crawler.naver_mobile import (
 
 from config.constants import (
     ES_HOST,
-    ES_INDEX_PREFIX,
     BATCH_SIZE,
     GOOGLE_SPREADSHEET_ID,
+    CRAWLER_WORKERS,
+    OCR_BACKEND,
+    DRIVER_MAX_PAGES,
+    DRIVER_MAX_RSS_MB,
+    DAEMON_CYCLE_INTERVAL,
+    SCHEDULER_ENABLED,
+    SERP_FINGERPRINT_ENABLED,
+    BROWSER_IMAGE_CAPTURE,
+    NAVER_SHARE_OF_VOICE,
 )
+from config import vm_google_sheet_setting
 from config.vm_google_sheet_setting import (
     VM_NAME,
     GOOGLE_SHEET_NAMES,
@@ -45,11 +77,11 @@ from config.vm_google_sheet_setting import (
 
 warnings.filterwarnings("ignore", message=".*pin_memory.*")
 
-# es = Elasticsearch(ES_HOST)
+_IMPORT_ELAPSED = time.perf_counter() - _IMPORT_START
 
 
 # ==============================
-# argparse / ES
+# argparse
 # ==============================
 def parse_args():
     parser = argparse.ArgumentParser()
@@ -58,25 +90,40 @@ def parse_args():
         action="store_true",
         help="ES 인덱싱 없이 로그로만 출력",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="병렬 크롤링 브라우저 수 (기본: VM 설정 CRAWLER_WORKERS)",
+    )
+    parser.add_argument(
+        "--es-host",
+        default=ES_HOST,
+        help="ES 적재 주소 (로컬 테스트: tools/mock_es.py)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="프로세스를 유지한 채 사이클 반복 실행 (SIGTERM 시 정상 종료)",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="모듈 import / 모델·클라이언트 초기화 시간을 측정해 출력하고 종료",
+    )
     return parser.parse_args()
 
 
-def index_to_es(index_name: str, docs: list[dict]):
-    for doc in docs:
-        resp = requests.post(ES_HOST, json=doc, timeout=10)
-        resp.raise_for_status()
-    print(f"[ES INDEX] index={index_name}, docs={len(docs)}")
-
-
 # ==============================
 # NAVER
 # ==============================
-def run_naver(driver, keyword: str, debug: bool = False):
+def run_naver(driver, keyword: str, debug: bool = False) -> dict:
+    """
+    페이지 단계: 드라이버가 필요한 작업(접속 / 영역 파싱 / UGC 후보 수집)만 수행한다.
+    """
     ts = now_utc_iso()
-    docs = []
 
-    driver.get(build_naver_mobile_search_url(keyword))
-    time.sleep(random.uniform(4.0, 6.0))
+    open_naver_serp(driver, build_naver_mobile_search_url(keyword))
 
     if debug:
         Path("debug").mkdir(parents=True, exist_ok=True)
@@ -86,24 +133,86 @@ def run_naver(driver, keyword: str, debug: bool = False):
 
     # 제안 검색어 블록이 있으면 원래 키워드로 전환
     if ensure_naver_exact_query(driver, keyword):
-        time.sleep(random.uniform(1.5, 2.5))
-
-    for r in find_naver_powerlink_rank(driver):
-        r.update({"source": "naver", "query": keyword, "@timestamp": ts})
-        docs.append(r)
+        wait_for_naver_serp(driver)
+
+    serp = collect_naver_serp(driver)
+    ugc_cards = serp["ugc_cards"]
+
+    # 브라우저가 이미 받은 썸네일은 여기서 꺼내 두고, 분석 단계에서 다시 받지 않는다
+    ugc_images = {}
+    if BROWSER_IMAGE_CAPTURE:
+        ugc_images = get_loaded_image_bytes(
+            driver, [card["img_src"] for card in ugc_cards]
+        )
+
+    return {
+        "ts": ts,
+        "sections": serp["sections"],
+        "ugc_cards": ugc_cards,
+        "ugc_images": ugc_images,
+        "share_of_voice": serp["share_of_voice"],
+    }
+
+
+def analyze_naver_sections(keyword: str, page: dict, reuse: bool = True) -> list[dict]:
+    """
+    파워링크 / 브랜드콘텐츠 / 플레이스는 스냅샷에서 파싱한 결과를 그대로 쓰고,
+    인기글만 fingerprint 가 직전 분석과 같으면 저장된 결과를 재사용한다.
+    (인기글은 바뀐 경우에만 pHash / OCR 수행)
+    """
+    if not (reuse and SERP_FINGERPRINT_ENABLED):
+        return page["sections"] + rank_popular_content(
+            page["ugc_cards"], images=page["ugc_images"]
+        )
+
+    fp = fingerprint_ugc_cards(page["ugc_cards"], logo_template_state())
+
+    store = get_serp_fingerprint_store()
+    prev = store.get(keyword).get("인기글")
+
+    if prev is not None and prev[0] == fp:
+        store.count(reused=1, analyzed=0)
+        return page["sections"] + prev[1]
+
+    popular = rank_popular_content(page["ugc_cards"], images=page["ugc_images"])
+    store.put(keyword, {"인기글": (fp, popular)})
+    store.count(reused=0, analyzed=1)
+    return page["sections"] + popular
+
+
+def analyze_naver(keyword: str, page: dict, reuse: bool = True) -> list[dict]:
+    """
+    분석 단계: 드라이버 없이 UGC 썸네일 OCR 을 수행하고 ES 문서를 만든다.
+    (CrawlerPool 에서 드라이버 반납 후 실행되어 다음 키워드 크롤링과 겹친다)
+    """
+    docs = []
 
-    for r in find_naver_brand_content_rank(driver):
-        r.update({"source": "naver", "query": keyword, "@timestamp": ts})
+    results = analyze_naver_sections(keyword, page, reuse)
+    for r in results:
+        r.update(
+            {
+                "record_type": EXPOSURE_RECORD,
+                "source": "naver",
+                "query": keyword,
+                "@timestamp": page["ts"],
+            }
+        )
         docs.append(r)
 
-    if has_naver_place_block(driver):
-        for r in find_naver_place_rank(driver):
-            r.update({"source": "naver", "query": keyword, "@timestamp": ts})
-            docs.append(r)
-
-    for r in find_popular_content_ocr(driver):
-        r.update({"source": "naver", "query": keyword, "@timestamp": ts})
-        docs.append(r)
+    if NAVER_SHARE_OF_VOICE:
+        # 영역별 전체 카드(경쟁사 포함) 순위 → share of voice 문서 (ES 전용)
+        popular = [r for r in results if r["section"] == "인기글"]
+        sov = page["share_of_voice"] + ugc_share_of_voice(page["ugc_cards"], popular)
+        for entry in sov:
+            entry.update(
+                {
+                    "record_type": SHARE_OF_VOICE_RECORD,
+                    "source": "naver",
+                    "query": keyword,
+                    "@timestamp": page["ts"],
+                }
+            )
+            docs.append(entry)
 
     return docs
 
@@ -131,167 +240,464 @@ def run_naver(driver, keyword: str, debug: bool = False):
 #     return docs
 
 
+# ==============================
+# 키워드 단위 크롤링 (재시도 포함)
+# ==============================
+def crawl_keyword(driver, keyword: str):
+    """
+    키워드 하나의 페이지 단계를 수행한다. stale element 오류는 최대 3회까지 재시도.
+
+    반환: (page, last_error, start_t) — 실패 시 page 는 None
+    """
+    start_t = time.time()
+    page = None
+    last_error = None
+
+    # NAVER 크롤링
+    for attempt in range(1, 4):
+        try:
+            page = run_naver(driver, keyword)
+            break
+        except Exception as e:
+            last_error = e
+            if "stale element" in str(e).lower() and attempt < 3:
+                time.sleep(1.5)
+                continue
+            print(f"[NAVER ERROR] keyword='{keyword}' reason={e} (attempt={attempt})")
+            break
+
+    return page, last_error, start_t
+
+
+def crawl_keyword_failed(keyword: str, error: Exception):
+    """드라이버를 띄우지 못한 키워드 → crawl_keyword 실패 결과와 같은 형식"""
+    print(f"[NAVER ERROR] keyword='{keyword}' reason={error} (driver)")
+    return None, error, time.time()
+
+
+def finish_keyword(keyword: str, crawled):
+    """
+    crawl_keyword 결과에 분석 단계(OCR)를 수행한다.
+
+    반환: (bulk_docs, last_error, elapsed_sec, ok)
+    — ok 는 크롤링 / 분석이 모두 성공했는지 (노출이 없어 bulk_docs 가 비어도 True)
+    """
+    page, last_error, start_t = crawled
+    bulk_docs = []
+    ok = False
+
+    if page is not None:
+        try:
+            bulk_docs = analyze_naver(keyword, page)
+            ok = True
+        except Exception as e:
+            last_error = e
+            print(f"[NAVER ERROR] keyword='{keyword}' reason={e} (analyze)")
+
+    elapsed_sec = round(time.time() - start_t, 2)
+    return bulk_docs, last_error, elapsed_sec, ok
+
+
+def resolve_crawler_workers(args) -> int:
+    if args.workers:
+        return args.workers
+    return getattr(vm_google_sheet_setting, "CRAWLER_WORKERS", CRAWLER_WORKERS)
+
+
+# ==============================
+# 알림
+# ==============================
+def send_batch_summary(sheet_name: str, batch_summaries: list[str]):
+    combined_message = "\n".join(batch_summaries)
+    payload = {
+        "event_type": "키워드검색결과",
+        "message": f"[{sheet_name}]\n{combined_message}",
+    }
+
+    # 큐에 넣고 바로 반환 (전송 / 재시도 / spool 은 백그라운드 스레드)
+    get_noti_client().send(payload)
+
+
+# ==============================
+# 시작 시간 프로파일링
+# ==============================
+# 무거운 의존성 (첫 사용 시 로드되는 것 포함)
+PROFILE_IMPORT_MODULES = [
+    "selenium.webdriver",
+    "lxml.html",
+    "requests",
+    "PIL.Image",
+    "imagehash",
+    "googleapiclient.discovery",
+    "torch",
+    "easyocr",
+]
+
+
+def profile_startup():
+    """
+    main.py 자체 import 시간과, 지연 로딩되는 모듈 / 객체의 초기화 시간을 출력한다.
+    이미 import 된 모듈은 0 에 가깝게 측정된다.
+    """
+    timings = [("import main.py", _IMPORT_ELAPSED, "")]
+
+    def _measure(label, fn):
+        start = time.perf_counter()
+        error = ""
+        try:
+            fn()
+        except Exception as e:
+            error = f"ERROR: {e}"
+        timings.append((label, time.perf_counter() - start, error))
+
+    for name in PROFILE_IMPORT_MODULES:
+        _measure(f"import {name}", lambda name=name: importlib.import_module(name))
+
+    _measure("init BaseCrawler (chrome)", lambda: BaseCrawler().close())
+    _measure("init YKLogoDetector", get_logo_detector)
+    _measure("init OCR cache", get_ocr_cache)
+    if OCR_BACKEND == "process":
+        # 워커 프로세스에서 모델 로드까지 완료되는 시간
+        _measure("init OCR worker", lambda: get_ocr_service().readtext_batch([b""]))
+    else:
+        _measure("init OCR reader", get_ocr_reader)
+    _measure("init Sheets service", get_sheets_service)
+
+    print("[PROFILE] startup timings")
+    for label, elapsed, error in timings:
+        print(f"[PROFILE] {label:<36} {elapsed * 1000:>9.1f} ms {error}")
+    print(f"[PROFILE] total {sum(t[1] for t in timings):.2f}s")
+
+    shutdown_ocr_service()
+
+
+# ==============================
+# 사이클 실행
+# ==============================
+def run_test_cycle(crawler_pool: CrawlerPool, es_host: str):
+    plan = plan_keywords({"test": load_keywords()})
+    print(f"[PLAN] {plan.summary()}")
+
+    def _run_test(driver, keyword):
+        try:
+            return run_naver(driver, keyword, debug=True)
+        except Exception as e:
+            print(f"[NAVER ERROR] keyword='{keyword}' reason={e}")
+            return None
+
+    def _driver_failed(keyword, error):
+        print(f"[NAVER ERROR] keyword='{keyword}' reason={error} (driver)")
+        return None
+
+    def _analyze_test(keyword, page):
+        if page is None:
+            return []
+        try:
+            # 테스트 모드는 항상 전체 분석 (fingerprint 재사용 안 함)
+            return analyze_naver(keyword, page, reuse=False)
+        except Exception as e:
+            print(f"[NAVER ERROR] keyword='{keyword}' reason={e}")
+            return []
+
+    for idx, (keyword, bulk_docs) in enumerate(
+        crawler_pool.imap_unordered(
+            _run_test, plan.queries, _analyze_test, _driver_failed
+        ),
+        start=1,
+    ):
+        print(f"[TEST][{idx}] keyword='{keyword}'")
+
+        if not bulk_docs:
+            continue
+
+        print(
+            f"[ES MOCK] url={bulk_url(es_host)}\n"
+            f"{json.dumps(bulk_docs, ensure_ascii=False, indent=2)}"
+        )
+
+
+def build_error_rows(keyword: str, last_error, elapsed_sec: float) -> list[list]:
+    return [
+        [
+            datetime.now(timezone(timedelta(hours=9))).strftime("%Y-%m-%d %H:%M:%S"),
+            VM_NAME,
+            elapsed_sec,
+            keyword,
+            "naver",
+            "ERROR",
+            "",
+            "",
+            str(last_error)[:200] if last_error else "unknown error",
+        ]
+    ]
+
+
+def build_result_rows(keyword: str, bulk_docs: list[dict], elapsed_sec: float):
+    rows = []
+    for item in bulk_docs:
+        ts = item.get("@timestamp")
+        ts_str = (
+            datetime.fromisoformat(ts)
+            .astimezone(timezone(timedelta(hours=9)))
+            .strftime("%Y-%m-%d %H:%M:%S")
+            if ts
+            else ""
+        )
+        rows.append(
+            [
+                ts_str,
+                VM_NAME,
+                elapsed_sec,
+                keyword,
+                item.get("source"),
+                item.get("section"),
+                item.get("rank"),
+                item.get("title"),
+                item.get("url"),
+            ]
+        )
+    return rows
+
+
+def run_cycle(
+    crawler_pool: CrawlerPool,
+    es_writer: BufferedESWriter,
+    sheets_buffer: SheetsAppendBuffer,
+    stop_event: threading.Event | None = None,
+    scheduler: KeywordScheduler | None = None,
+    keyword_cache: KeywordSheetCache | None = None,
+):
+    """
+    모든 시트의 키워드를 모아 중복 없이 한 바퀴 크롤링하고,
+    결과를 키워드가 속한 모든 시트 / ES / 알림으로 보낸다.
+    scheduler 가 있으면 재크롤링 주기가 된 키워드만 급한 순서로 크롤링한다.
+    keyword_cache 가 있으면 refresh 간격 안에서는 시트를 다시 읽지 않는다.
+    """
+    if keyword_cache is None:
+        keyword_cache = KeywordSheetCache(GOOGLE_SPREADSHEET_ID, GOOGLE_SHEET_NAMES)
+    keywords_by_sheet = keyword_cache.load()
+    plan = plan_keywords(keywords_by_sheet)
+    print(f"[PLAN] sheets={len(keywords_by_sheet)} {plan.summary()}")
+
+    queries = plan.queries
+    if scheduler is not None:
+        queries = scheduler.select(plan.queries, plan.priorities)
+        print(
+            f"[SCHEDULER] selected={len(queries)} "
+            f"skipped={len(plan.queries) - len(queries)}"
+        )
+
+    batch_summaries = {sheet_name: [] for sheet_name in keywords_by_sheet}
+
+    # 완료되는 순서대로 결과를 받아, 해당 키워드를 가진 시트마다 기록한다.
+    results = crawler_pool.imap_unordered(
+        crawl_keyword, queries, finish_keyword, crawl_keyword_failed
+    )
+    for idx, (query, (bulk_docs, last_error, elapsed_sec, ok)) in enumerate(
+        results, start=1
+    ):
+        targets = plan.targets[query]
+        print(
+            f"[{idx}/{len(queries)}] keyword='{query}' "
+            f"sheets={[sheet_name for sheet_name, _ in targets]}"
+        )
+
+        # ES 는 크롤링 1회당 1번만 적재 (share of voice 문서 포함)
+        if bulk_docs:
+            es_writer.add(bulk_docs)
+
+        # 노출이 하나도 없어도 성공한 크롤링이면 기록 (빈 집합도 volatility 에 반영)
+        if ok and scheduler is not None:
+            scheduler.record(query, get_exposed_sections(bulk_docs))
+
+        # 시트 / 알림은 노출 결과만 사용
+        exposure_docs, _ = split_share_of_voice(bulk_docs or [])
+
+        for sheet_name, keyword in targets:
+            output_sheet_name = GOOGLE_OUTPUT_SHEET_MAP.get(
+                sheet_name, f"results_{sheet_name}"
+            )
+
+            if not exposure_docs:
+                # 실패 행 기록
+                sheets_buffer.add(
+                    output_sheet_name,
+                    build_error_rows(keyword, last_error, elapsed_sec),
+                )
+                continue
+
+            # Google Sheets 결과 저장 (시트별로 분리)
+            sheets_buffer.add(
+                output_sheet_name,
+                build_result_rows(keyword, exposure_docs, elapsed_sec),
+            )
+
+            summaries = batch_summaries[sheet_name]
+            summaries.append(get_unexposed_summary(keyword, exposure_docs))
+            if len(summaries) >= BATCH_SIZE:
+                send_batch_summary(sheet_name, summaries)
+                batch_summaries[sheet_name] = []
+
+        if stop_event is not None and stop_event.is_set():
+            # 종료 요청: 진행 중인 키워드까지만 처리하고 남은 작업 취소
+            print("[CYCLE] stop requested, cancel remaining keywords")
+            results.close()
+            break
+
+    # 시트별 남은 요약 전송
+    for sheet_name, summaries in batch_summaries.items():
+        if summaries:
+            send_batch_summary(sheet_name, summaries)
+
+    if scheduler is not None:
+        scheduler.save()
+
+    print(f"[PLAN] done {plan.summary()}")
+
+
+def run_daemon(
+    crawler_pool: CrawlerPool,
+    es_writer: BufferedESWriter,
+    sheets_buffer: SheetsAppendBuffer,
+    scheduler: KeywordScheduler | None = None,
+):
+    """
+    드라이버 / OCR 모델 / 캐시를 유지한 채 사이클을 반복 실행한다.
+    SIGTERM / SIGINT 를 받으면 진행 중인 키워드까지 처리하고 정상 종료한다.
+    """
+    stop_event = threading.Event()
+    keyword_cache = KeywordSheetCache(GOOGLE_SPREADSHEET_ID, GOOGLE_SHEET_NAMES)
+
+    def _request_stop(signum, frame):
+        print(f"[DAEMON] signal={signum} received, stopping after current keywords")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    cycle = 0
+    while not stop_event.is_set():
+        cycle += 1
+        start_t = time.time()
+        print(f"[DAEMON] cycle={cycle} start")
+
+        try:
+            run_cycle(
+                crawler_pool,
+                es_writer,
+                sheets_buffer,
+                stop_event,
+                scheduler,
+                keyword_cache,
+            )
+        except Exception as e:
+            # 시트 조회 실패 등 → 이번 사이클만 건너뛰고 다음 사이클에서 재시도
+            print(f"[DAEMON ERROR] cycle={cycle} reason={e}")
+
+        # 사이클 단위로 버퍼 비우기
+        try:
+            sheets_buffer.flush()
+        except Exception as e:
+            print(f"[SHEETS ERROR] flush failed: {e}")
+        es_writer.flush()
+
+        elapsed = round(time.time() - start_t, 1)
+        print(
+            f"[DAEMON] cycle={cycle} done elapsed={elapsed}s "
+            f"pool={crawler_pool.health()} ocr_cache={get_ocr_cache().stats()} "
+            f"serp_fingerprint={get_serp_fingerprint_store().stats()} "
+            f"ugc_cascade={ugc_cascade_stats.stats()} "
+            f"image_fetch={get_image_fetcher().stats()} "
+            f"browser_images={browser_image_stats()} "
+            f"noti={get_noti_client().stats()}"
+        )
+
+        stop_event.wait(DAEMON_CYCLE_INTERVAL)
+
+    print("[DAEMON] stopped")
+
+
 # ==============================
 # main
 # ==============================
 def main():
     args = parse_args()
 
-    index_name = f"{ES_INDEX_PREFIX}-{datetime.now():%Y-%m-%d}"
-
-    # 드라이버 분리 (정답 구조)
-    naver_crawler = BaseCrawler()  # apt chromium
+    if args.profile_startup:
+        profile_startup()
+        return
+
+    # 드라이버 N개를 병렬로 운용 (VM별 CRAWLER_WORKERS)
+    crawler_pool = CrawlerPool(
+        size=resolve_crawler_workers(args),
+        max_pages=DRIVER_MAX_PAGES,
+        max_rss_mb=DRIVER_MAX_RSS_MB,
+    )  # apt chromium
+    es_writer = None
+    sheets_buffer = None
     # google_driver = create_google_driver()  # system chrome
 
     try:
         if args.test:
-            keywords = load_keywords()
-            for idx, keyword in enumerate(keywords, start=1):
-                print(f"[TEST][{idx}] keyword='{keyword}'")
-
-                bulk_docs = []
-                try:
-                    bulk_docs.extend(
-                        run_naver(naver_crawler.driver, keyword, debug=True)
-                    )
-                except Exception as e:
-                    print(f"[NAVER ERROR] keyword='{keyword}' reason={e}")
-
-                if not bulk_docs:
-                    continue
-
-                print(
-                    f"[ES MOCK] index={index_name}\n"
-                    f"{json.dumps(bulk_docs, ensure_ascii=False, indent=2)}"
-                )
+            run_test_cycle(crawler_pool, args.es_host)
             return
 
-        for sheet_name in GOOGLE_SHEET_NAMES:
-            keywords = load_keywords_by_google_sheet(
-                spreadsheet_id=GOOGLE_SPREADSHEET_ID,
-                sheet_name=sheet_name,
-            )
-            output_sheet_name = GOOGLE_OUTPUT_SHEET_MAP.get(
-                sheet_name, f"results_{sheet_name}"
-            )
+        es_writer = BufferedESWriter(host=args.es_host)
+        sheets_buffer = SheetsAppendBuffer(spreadsheet_id=GOOGLE_SPREADSHEET_ID)
+        scheduler = KeywordScheduler() if SCHEDULER_ENABLED else None
 
-            batch_summaries = []
-
-            for idx, keyword in enumerate(keywords, start=1):
-                print(f"[{sheet_name}][{idx}] keyword='{keyword}'")
-
-                start_t = time.time()
-                bulk_docs = []
-                last_error = None
-
-                # NAVER 크롤링
-                for attempt in range(1, 4):
-                    try:
-                        bulk_docs.extend(run_naver(naver_crawler.driver, keyword))
-                        break
-                    except Exception as e:
-                        last_error = e
-                        if "stale element" in str(e).lower() and attempt < 3:
-                            time.sleep(1.5)
-                            continue
-                        print(
-                            f"[NAVER ERROR] keyword='{keyword}' reason={e} (attempt={attempt})"
-                        )
-                        bulk_docs = []
-                        break
-
-                elapsed_sec = round(time.time() - start_t, 2)
-
-                if not bulk_docs:
-                    # 실패 행 기록
-                    rows = [
-                        [
-                            datetime.now(timezone(timedelta(hours=9))).strftime(
-                                "%Y-%m-%d %H:%M:%S"
-                            ),
-                            VM_NAME,
-                            elapsed_sec,
-                            keyword,
-                            "naver",
-                            "ERROR",
-                            "",
-                            "",
-                            str(last_error)[:200] if last_error else "unknown error",
-                        ]
-                    ]
-                    append_results_to_google_sheet(
-                        spreadsheet_id=GOOGLE_SPREADSHEET_ID,
-                        sheet_name=output_sheet_name,
-                        rows=rows,
-                    )
-                    continue
-
-                index_to_es(index_name, bulk_docs)
-
-                # Google Sheets 결과 저장 (시트별로 분리)
-                rows = []
-                for item in bulk_docs:
-                    ts = item.get("@timestamp")
-                    ts_str = (
-                        datetime.fromisoformat(ts)
-                        .astimezone(timezone(timedelta(hours=9)))
-                        .strftime("%Y-%m-%d %H:%M:%S")
-                        if ts
-                        else ""
-                    )
-                    rows.append(
-                        [
-                            ts_str,
-                            VM_NAME,
-                            elapsed_sec,
-                            keyword,
-                            item.get("source"),
-                            item.get("section"),
-                            item.get("rank"),
-                            item.get("title"),
-                            item.get("url"),
-                        ]
-                    )
-
-                append_results_to_google_sheet(
-                    spreadsheet_id=GOOGLE_SPREADSHEET_ID,
-                    sheet_name=output_sheet_name,
-                    rows=rows,
-                )
-
-                summary = get_unexposed_summary(keyword, bulk_docs)
-                batch_summaries.append(summary)
-
-                if len(batch_summaries) >= BATCH_SIZE or idx == len(keywords):
-                    combined_message = "\n".join(batch_summaries)
-                    payload = {
-                        "event_type": "키워드검색결과",
-                        "message": f"[{sheet_name}]\n{combined_message}",
-                    }
-
-                    subprocess.run(
-                        [
-                            "curl",
-                            "-s",
-                            "-X",
-                            "POST",
-                            "http://localhost:10002/send-event-noti",
-                            "-H",
-                            "Content-Type: application/json",
-                            "-d",
-                            json.dumps(payload, ensure_ascii=False),
-                        ],
-                        check=True,
-                    )
-
-                    print()
-                    batch_summaries = []
+        if args.daemon:
+            run_daemon(crawler_pool, es_writer, sheets_buffer, scheduler)
+        else:
+            run_cycle(crawler_pool, es_writer, sheets_buffer, scheduler=scheduler)
     finally:
+        # 버퍼에 남은 결과 행 / 문서 적재
+        if sheets_buffer:
+            try:
+                sheets_buffer.close()
+            except Exception as e:
+                print(f"[SHEETS ERROR] final flush failed: {e}")
+
+        if es_writer:
+            try:
+                es_writer.close()
+            except Exception as e:
+                print(f"[ES ERROR] final flush failed: {e}")
+
         try:
-            naver_crawler.close()
+            crawler_pool.close()
         except Exception:
             pass
 
+        try:
+            shutdown_ocr_service()
+        except Exception:
+            pass
+
+        print(f"[OCR CACHE] {get_ocr_cache().stats()}")
+        print(f"[UGC CASCADE] {ugc_cascade_stats.stats()}")
+
+        try:
+            close_serp_fingerprint_store()
+        except Exception:
+            pass
+
+        try:
+            close_ocr_cache()
+        except Exception:
+            pass
+
+        try:
+            close_image_fetcher()
+        except Exception:
+            pass
+
+        # 큐에 남은 알림 전송 (못 보낸 알림은 spool → 다음 실행 때 재전송)
+        try:
+            close_noti_client()
+        except Exception as e:
+            print(f"[NOTI ERROR] close failed: {e}")
+
         # try:
         #     google_driver.quit()
         # except Exception:
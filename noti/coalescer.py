@@ -0,0 +1,238 @@
+import asyncio
+import time
+from collections import defaultdict
+
+import logging
+
+from naverworks_api import NWORKS_MSG_LIMIT, split_message
+
+logger = logging.getLogger("noti")
+
+MESSAGE_SEPARATOR = "\n\n"
+
+# 묶음 메시지 전송 실패 시 재시도 횟수 / 첫 재시도 대기 (초, 재시도마다 2배)
+SEND_RETRIES = 3
+RETRY_BACKOFF_SEC = 1.0
+
+
+def pack_messages(messages, limit=NWORKS_MSG_LIMIT, separator=MESSAGE_SEPARATOR):
+    """
+    여러 메시지를 limit 글자 이하의 최소 메시지 수로 합친다. (순서 유지)
+    limit 보다 긴 메시지는 split_message 로 나눈 뒤 합친다.
+    """
+    chunks = []
+    current = ""
+
+    for message in messages:
+        for piece in split_message(message, limit):
+            if not piece.strip():
+                continue
+            if not current:
+                current = piece
+            elif len(current) + len(separator) + len(piece) <= limit:
+                current = f"{current}{separator}{piece}"
+            else:
+                chunks.append(current)
+                current = piece
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class NotificationCoalescer:
+    """
+    같은 chat_uid 로 가는 알림을 window 초 동안 모아 가능한 적은 메시지로 전송한다.
+
+    - chat_uid 별로 첫 알림이 들어온 시점부터 window 초 뒤에 한 번에 flush
+    - 합친 메시지는 NWORKS_MSG_LIMIT 에서 잘라내지 않고 여러 메시지로 나눠 전송
+    - 같은 chat_uid 의 flush 는 순서대로 실행 (메시지 순서 유지)
+    - 대기 중인 알림이 max_pending 을 넘으면 add() 가 False → 호출 측에서 바로 전송
+    - Works API 호출 속도는 NaverWorksAPI 의 토큰 버킷이 제한
+    - 전송 실패(5xx / 429 / 연결 오류)한 메시지는 retries 번까지 backoff 후 재전송하고,
+      그래도 실패하면 남은 메시지를 대기열 맨 앞에 다시 넣어 다음 window 에 재시도
+      (4xx 처럼 재시도해도 안 되는 실패와 종료 중 실패만 로그를 남기고 버림)
+    """
+
+    def __init__(
+        self,
+        nworks,
+        window_sec=5.0,
+        max_pending=10000,
+        retries=SEND_RETRIES,
+        retry_backoff_sec=RETRY_BACKOFF_SEC,
+    ):
+        self.nworks = nworks
+        self.window_sec = window_sec
+        self.max_pending = max_pending
+        self.retries = retries
+        self.retry_backoff_sec = retry_backoff_sec
+        self.closing = False
+
+        self.pending = {}  # chat_uid → [message 또는 재전송할 묶음 메시지, ...]
+        self.pending_since = {}  # chat_uid → 첫 대기 알림 시각 (monotonic)
+        self.pending_count = 0
+        self.flush_tasks = {}  # chat_uid → window 대기 후 flush 하는 task
+        self.chat_locks = defaultdict(asyncio.Lock)
+
+        self.received = 0
+        self.rejected = 0
+        self.sent_messages = 0  # 처리 완료된 대기 항목 수 (버린 묶음 포함)
+        self.sent_chunks = 0  # 실제 Works API 메시지 수
+        self.retried_chunks = 0  # backoff 후 재전송 시도 수
+        self.requeued_chunks = 0  # 대기열로 되돌린 묶음 메시지 수
+        self.dropped_chunks = 0  # 재시도 불가 / 종료 중 실패로 버린 묶음 메시지 수
+        self.sending = 0
+
+    def add(self, chat_uid, message):
+        """알림을 대기열에 넣는다. 가득 찼으면 False"""
+        if self.pending_count >= self.max_pending:
+            self.rejected += 1
+            return False
+
+        if chat_uid not in self.pending:
+            self.pending[chat_uid] = []
+            self.pending_since[chat_uid] = time.monotonic()
+        self.pending[chat_uid].append(message)
+        self.pending_count += 1
+        self.received += 1
+
+        if chat_uid not in self.flush_tasks:
+            self.flush_tasks[chat_uid] = asyncio.create_task(
+                self._flush_later(chat_uid)
+            )
+        return True
+
+    async def _flush_later(self, chat_uid):
+        try:
+            await asyncio.sleep(self.window_sec)
+        finally:
+            self.flush_tasks.pop(chat_uid, None)
+        await self.flush(chat_uid)
+
+    @staticmethod
+    def _retryable(response_data):
+        status_code = response_data.get("status_code")
+        return status_code is None or status_code == 429 or status_code >= 500
+
+    async def _send_chunk(self, chat_uid, chunk):
+        """
+        묶음 메시지 하나를 전송한다. (실패하면 retries 번까지 backoff 후 재전송)
+        반환: "sent" / "retry" (나중에 다시 보낼 실패) / "drop" (재시도 불가)
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.retried_chunks += 1
+                await asyncio.sleep(self.retry_backoff_sec * 2 ** (attempt - 1))
+
+            try:
+                response_data = await self.nworks.send_message_to_channel_async(
+                    chat_uid, chunk
+                )
+            except Exception as e:
+                response_data = {"result": "fail", "error": str(e)}
+
+            if response_data.get("result") == "success":
+                return "sent"
+            if not self._retryable(response_data):
+                break
+
+            logger.warning(
+                f"⚠️ 묶음 알림 전송 실패 ({attempt + 1}/{self.retries + 1}): "
+                f"{chat_uid} -> {response_data}"
+            )
+
+        if not self._retryable(response_data):
+            logger.error(f"⚠️ 묶음 알림 전송 실패 (버림): {chat_uid} -> {response_data}")
+            return "drop"
+        return "retry"
+
+    def _requeue(self, chat_uid, chunks):
+        """전송하지 못한 묶음 메시지를 대기열 맨 앞에 되돌린다. (순서 유지)"""
+        self.pending[chat_uid] = chunks + self.pending.get(chat_uid, [])
+        self.pending_since.setdefault(chat_uid, time.monotonic())
+        self.pending_count += len(chunks)
+        self.requeued_chunks += len(chunks)
+
+        if chat_uid not in self.flush_tasks:
+            self.flush_tasks[chat_uid] = asyncio.create_task(
+                self._flush_later(chat_uid)
+            )
+
+    async def flush(self, chat_uid):
+        async with self.chat_locks[chat_uid]:
+            messages = self.pending.pop(chat_uid, [])
+            self.pending_since.pop(chat_uid, None)
+            self.pending_count -= len(messages)
+            if not messages:
+                return
+
+            chunks = pack_messages(messages)
+            self.sending += len(messages)
+            sent = dropped = 0
+            unsent = []
+            try:
+                for i, chunk in enumerate(chunks):
+                    result = await self._send_chunk(chat_uid, chunk)
+                    if result == "sent":
+                        sent += 1
+                    elif result == "drop":
+                        dropped += 1
+                    else:
+                        unsent = chunks[i:]
+                        break
+            finally:
+                self.sending -= len(messages)
+
+            if unsent and self.closing:
+                logger.error(
+                    f"⚠️ 종료 중 묶음 알림 전송 실패 (버림): {chat_uid} "
+                    f"chunks={len(unsent)}"
+                )
+                dropped += len(unsent)
+            elif unsent:
+                logger.error(
+                    f"⚠️ 묶음 알림 전송 실패, 대기열로 되돌림: {chat_uid} "
+                    f"chunks={len(unsent)}"
+                )
+                self._requeue(chat_uid, unsent)
+            else:
+                self.sent_messages += len(messages)
+
+            self.sent_chunks += sent
+            self.dropped_chunks += dropped
+            logger.debug(
+                f"✅ 묶음 알림 전송: {chat_uid} messages={len(messages)} "
+                f"chunks={len(chunks)} sent={sent} requeued={len(unsent)} "
+                f"dropped={dropped}"
+            )
+
+    async def close(self):
+        """대기 중인 알림을 window 를 기다리지 않고 모두 전송 (실패하면 되돌리지 않음)"""
+        self.closing = True
+        for task in list(self.flush_tasks.values()):
+            task.cancel()
+        self.flush_tasks.clear()
+
+        await asyncio.gather(
+            *(self.flush(chat_uid) for chat_uid in list(self.pending)),
+            return_exceptions=True,
+        )
+
+    def metrics(self):
+        now = time.monotonic()
+        oldest = min(self.pending_since.values(), default=None)
+        return {
+            "window_sec": self.window_sec,
+            "pending_chats": len(self.pending),
+            "pending_messages": self.pending_count,
+            "oldest_pending_sec": round(now - oldest, 3) if oldest else 0,
+            "sending_messages": self.sending,
+            "received": self.received,
+            "rejected": self.rejected,
+            "sent_messages": self.sent_messages,
+            "sent_chunks": self.sent_chunks,
+            "retried_chunks": self.retried_chunks,
+            "requeued_chunks": self.requeued_chunks,
+            "dropped_chunks": self.dropped_chunks,
+        }
@@ -34,75 +34,118 @@ NWORKS = {}
 LOGGING_FILE_PATH = "/tmp"
 LOGGING_FILE_MAX_BACKUP_COUNT = 3
 NOTIFICATIONS = []
+COALESCE = {}
 
 def load_config():
     """config.yaml 파일을 다시 로드"""
     global CONFIG, NWORKS, LOGGING_FILE_PATH, LOGGING_FILE_MAX_BACKUP_COUNT, NOTIFICATIONS
+    global ROUTING_INDEX, COALESCE
 
     with open(CONFIG_PATH, "r") as file:
-        CONFIG = yaml.safe_load(file)
+        config = yaml.safe_load(file)
+
+    # ✅ 알림 라우팅 인덱스를 먼저 만들고 (설정 오류 시 기존 설정 유지), 한 번에 교체
+    notifications = config.get("NOTIFICATIONS", [])
+    routing_index = build_routing_index(notifications)
 
     # 주요 설정 변수 업데이트
+    CONFIG = config
     NWORKS = CONFIG.get("NWORKS", {})
     LOGGING_FILE_PATH = CONFIG["LOGGING"].get("FILE_PATH", "/tmp")
     LOGGING_FILE_MAX_BACKUP_COUNT = CONFIG["LOGGING"].get("MAX_BACKUP_COUNT", 3)
 
+    # 알림 묶음 전송 설정 (WINDOW_SEC 가 0 / 없으면 묶지 않음)
+    COALESCE = CONFIG.get("COALESCE") or {}
+
     # 알림 설정 로드
-    NOTIFICATIONS = CONFIG.get("NOTIFICATIONS", [])
+    NOTIFICATIONS = notifications
+    ROUTING_INDEX = routing_index
 
-# 초기 설정 로드
-load_config()
 
-def find_chat_uids(event_type: str, args: List[str]) -> List[str]:
-    """이벤트 타입 및 인자에 따른 모든 Chat UID 찾기"""
-    matched_chat_uids = []
+def should_coalesce(event_type: str) -> bool:
+    """event_type 알림을 묶음 전송 대상으로 볼지 (COALESCE.EVENT_TYPES 가 없으면 전체)"""
+    if not COALESCE.get("WINDOW_SEC"):
+        return False
+    event_types = COALESCE.get("EVENT_TYPES")
+    return not event_types or event_type in event_types
+
+
+def parse_args_conditions(notification_args: str) -> frozenset:
+    """
+    "key1=value1&key2=*" → frozenset({("key1", "value1"), ("key2", "*")})
+    입력 args 도 같은 형태의 set 으로 바꾸면 (키마다 (key, "*") 추가)
+    조건 하나의 매칭은 부분집합 검사 한 번으로 끝난다
+    """
+    conditions = notification_args.split("&")
+    parsed_conditions = {cond.split("=")[0]: cond.split("=")[1] for cond in conditions}
+    return frozenset(parsed_conditions.items())
 
-    # ✅ 입력 `args`를 `dict` 형태로 변환 (같은 키에 여러 값이 있을 경우 리스트로 저장)
-    parsed_input_args = defaultdict(list)
-    for arg in args:
-        key, value = arg.split("=")
-        parsed_input_args[key].append(value)
 
-    for notification in NOTIFICATIONS:
+def build_routing_index(notifications) -> dict:
+    """
+    NOTIFICATIONS → {event_type: [(chat_uid, 조건 목록 또는 None), ...]} (설정 순서 유지)
+    조건 목록은 ARGS 항목별 parse_args_conditions 결과, ARGS 가 없으면 None
+    """
+    index = defaultdict(list)
+
+    for notification in notifications:
         notification_event_type = notification["EVENT_TYPE"]
 
-        # ✅ EVENT_TYPE이 리스트인 경우 OR 조건으로 비교
+        # ✅ EVENT_TYPE이 리스트인 경우 각 이벤트 타입에 모두 등록 (OR 조건)
         if isinstance(notification_event_type, list):
-            if event_type not in notification_event_type:
-                continue  # OR 조건에 포함되지 않으면 스킵
+            event_types = notification_event_type
         else:
-            if event_type != notification_event_type:
-                continue  # 기존 단일 매칭
+            event_types = [notification_event_type]
 
         notification_args_list = notification.get("ARGS", [])
+        conditions = (
+            tuple(parse_args_conditions(args) for args in notification_args_list)
+            if notification_args_list
+            else None
+        )
+
+        rule = (notification.get("CHAT_UID"), conditions)
+        for event_type in dict.fromkeys(event_types):
+            index[event_type].append(rule)
+
+    return dict(index)
 
-        # ✅ 입력 `args`가 없고, 설정에도 `ARGS`가 없으면 매칭
-        if not args and not notification_args_list:
-            matched_chat_uids.append(notification.get("CHAT_UID"))
-            continue  # ✅ 다음 설정 확인
+
+ROUTING_INDEX = {}
+
+# 초기 설정 로드
+load_config()
+
+def find_chat_uids(event_type: str, args: List[str]) -> List[str]:
+    """이벤트 타입 및 인자에 따른 모든 Chat UID 찾기 (load_config 에서 만든 인덱스 사용)"""
+    rules = ROUTING_INDEX.get(event_type)
+    if not rules:
+        return []
+
+    matched_chat_uids = []
+
+    # ✅ 입력 `args`를 (key, value) set 으로 변환 (키 존재 여부는 (key, "*") 로 표시)
+    input_conditions = set()
+    for arg in args:
+        key, value = arg.split("=")
+        input_conditions.add((key, value))
+        input_conditions.add((key, "*"))
+
+    for chat_uid, conditions in rules:
+        # ✅ 설정에 `ARGS`가 없으면 입력 `args`도 없을 때만 매칭
+        if conditions is None:
+            if not args:
+                matched_chat_uids.append(chat_uid)
+            continue
 
         # ✅ 입력 `args`가 없는데, 설정에 `ARGS`가 있는 경우 매칭 X
-        if not args and notification_args_list:
+        if not args:
             continue
 
-        # ✅ 설정된 `ARGS`의 각 조건을 `&`로 나누고, 모든 조건을 만족해야 매칭
-        for notification_args in notification_args_list:
-            conditions = notification_args.split("&")
-            parsed_conditions = {cond.split("=")[0]: cond.split("=")[1] for cond in conditions}
-
-            # ✅ 모든 조건이 입력 args에서 매칭되어야 함 (`*`인 경우 존재 여부만 체크)
-            is_match = True
-            for key, value in parsed_conditions.items():
-                if value == "*":
-                    if key not in parsed_input_args:
-                        is_match = False
-                        break
-                elif value not in parsed_input_args.get(key, []):
-                    is_match = False
-                    break
-
-            if is_match:
-                matched_chat_uids.append(notification.get("CHAT_UID"))
+        # ✅ ARGS 항목 중 하나라도 모든 조건을 만족하면 매칭 (`*`인 경우 존재 여부만 체크)
+        for condition in conditions:
+            if condition <= input_conditions:
+                matched_chat_uids.append(chat_uid)
                 break
 
-    return matched_chat_uids
\ No newline at end of file
+    return matched_chat_uids
@@ -9,8 +9,9 @@ import uvicorn
 
 # import version
 import config
-from config import NWORKS, find_chat_uids, load_config
+from config import NWORKS, find_chat_uids, load_config, should_coalesce
 from naverworks_api import NaverWorksAPI
+from coalescer import NotificationCoalescer, SEND_RETRIES, RETRY_BACKOFF_SEC
 from typing import List, Optional
 from logger import setup_logger
 import logging
@@ -21,6 +22,7 @@ logger = logging.getLogger("noti")
 
 # 전역 변수
 nworks = None
+coalescer = None
 
 
 # Pydantic 모델 정의
@@ -32,7 +34,7 @@ class NotificationRequest(BaseModel):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global nworks  # 전역 변수 사용
+    global nworks, coalescer  # 전역 변수 사용
 
     logger.warning("🚀 Starting Noti Server")
 
@@ -43,6 +45,21 @@ async def lifespan(app: FastAPI):
         service_account=NWORKS.get("NWORKS_SERVICE_ACCOUNT"),
         private_key_path=NWORKS.get("NWORKS_PRIVATE_KEY_PATH"),
         bot_id=NWORKS.get("NWORKS_BOT_ID"),
+        api_base_url=NWORKS.get("NWORKS_API_BASE_URL"),
+        auth_url=NWORKS.get("NWORKS_AUTH_URL"),
+        max_concurrency=NWORKS.get("NWORKS_MAX_CONCURRENCY", 20),
+        rate_limit_per_sec=NWORKS.get("NWORKS_RATE_LIMIT_PER_SEC"),
+        rate_limit_burst=NWORKS.get("NWORKS_RATE_LIMIT_BURST"),
+    )
+    await nworks.open()
+
+    # 같은 채널 알림 묶음 전송
+    coalescer = NotificationCoalescer(
+        nworks,
+        window_sec=config.COALESCE.get("WINDOW_SEC") or 0,
+        max_pending=config.COALESCE.get("MAX_PENDING", 10000),
+        retries=config.COALESCE.get("SEND_RETRIES", SEND_RETRIES),
+        retry_backoff_sec=config.COALESCE.get("RETRY_BACKOFF_SEC", RETRY_BACKOFF_SEC),
     )
 
     # 네이버웍스 엑세스 토큰 초기 갱신
@@ -52,7 +69,7 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"⚠️ 네이버웍스 엑세스 토큰 갱신 실패: {e}")
 
-    # 🔹 백그라운드 태스크 실행 (토큰 자동 갱신)
+    # 🔹 백그라운드 태스크 실행 (토큰 만료 전 자동 갱신, expires_in 기준)
     nworks.token_refresh_task = asyncio.create_task(nworks.refresh_access_token_task())
 
     yield  # 앱 실행
@@ -62,6 +79,10 @@ async def lifespan(app: FastAPI):
         nworks.token_refresh_task.cancel()
         logger.info("🛑 서버 종료: 토큰 갱신 태스크 중지됨.")
 
+    # 대기 중인 묶음 알림 전송 후 종료
+    await coalescer.close()
+    await nworks.aclose()
+
 
 # FastAPI 앱 생성 및 lifespan 적용
 app = FastAPI(lifespan=lifespan)
@@ -72,11 +93,31 @@ def get_status():
     return JSONResponse(status_code=200, content={"pid": os.getpid()})
 
 
+@app.get("/metrics")
+def get_metrics():
+    """묶음 전송 대기열 / Works API 속도 제한 상태"""
+    return JSONResponse(
+        status_code=200,
+        content={
+            "coalescer": coalescer.metrics(),
+            "rate_limiter": (
+                nworks.rate_limiter.metrics() if nworks.rate_limiter else None
+            ),
+        },
+    )
+
+
 @app.post("/reload-config")
 def reload_config():
     """설정 파일 다시 로드"""
     try:
         load_config()
+        coalescer.window_sec = config.COALESCE.get("WINDOW_SEC") or 0
+        coalescer.max_pending = config.COALESCE.get("MAX_PENDING", 10000)
+        coalescer.retries = config.COALESCE.get("SEND_RETRIES", SEND_RETRIES)
+        coalescer.retry_backoff_sec = config.COALESCE.get(
+            "RETRY_BACKOFF_SEC", RETRY_BACKOFF_SEC
+        )
         logger.info("🔄 config.yaml 파일이 다시 로드되었습니다.")
         return {"status": "success", "message": "Configuration reloaded."}
     except Exception as e:
@@ -94,7 +135,7 @@ class EventNotiRequest(BaseModel):
 
 
 @app.post("/send-event-noti")
-def send_event_notification(request: EventNotiRequest):
+async def send_event_notification(request: EventNotiRequest):
     expanded_args = []
     for arg in request.args:
         if "=" in arg and "," in arg:  # ✅ 여러 값이 포함된 경우
@@ -117,32 +158,60 @@ def send_event_notification(request: EventNotiRequest):
             content={"status": "fail", "reason": "No matching Chat UID found"},
         )
 
+    # ✅ 묶음 전송 대상이면 채널별 대기열에 넣고 바로 응답 (링크 알림은 바로 전송)
+    #    202 는 "접수됨"이며 전송 완료가 아님 → 전송 실패 시 재시도 / 재전송은 coalescer 가 담당
+    if not request.url_link and should_coalesce(request.event_type):
+        queued = []
+        direct = []  # 대기열이 가득 차 넣지 못한 채널 → 바로 전송
+        for chat_uid in dict.fromkeys(chat_uids):
+            if coalescer.add(chat_uid, request.message):
+                queued.append(chat_uid)
+            else:
+                direct.append(chat_uid)
+
+        chat_uids = direct
+        if not chat_uids:
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "status": "queued",
+                    "delivered": False,
+                    "chat_uids": queued,
+                    "window_sec": coalescer.window_sec,
+                },
+            )
+
     success_responses = []
     failed_responses = []
 
-    for chat_uid in chat_uids:
-        try:
-            response_data = nworks.send_message_to_channel(
+    # ✅ 모든 채널에 동시에 전송 (결과는 chat_uids 순서대로)
+    results = await asyncio.gather(
+        *(
+            nworks.send_message_to_channel_async(
                 chat_uid, request.message, request.url_link
             )
+            for chat_uid in chat_uids
+        ),
+        return_exceptions=True,
+    )
 
-            if response_data.get("result") == "success":
-                success_responses.append(
-                    {"chat_uid": chat_uid, "response": response_data}
-                )
-                logger.debug(
-                    f"✅ 알림 전송 성공: {request.event_type}, {request.args}, {chat_uid} -> {response_data}"
-                )
-            else:
-                failed_responses.append({"chat_uid": chat_uid, "error": response_data})
-                logger.error(
-                    f"⚠️ 알림 전송 실패: {request.event_type}, {request.args}, {chat_uid} -> {response_data}"
-                )
-
-        except Exception as e:
-            error_message = str(e)
+    for chat_uid, response_data in zip(chat_uids, results):
+        if isinstance(response_data, Exception):
+            error_message = str(response_data)
             failed_responses.append({"chat_uid": chat_uid, "error": error_message})
             logger.error(f"⚠️ noti API 호출 중 오류 발생: {error_message}")
+            continue
+
+        if response_data.get("result") == "success":
+            success_responses.append({"chat_uid": chat_uid, "response": response_data})
+            logger.debug(
+                f"✅ 알림 전송 성공: {request.event_type}, {request.args}, {chat_uid} -> {response_data}"
+            )
+        else:
+            failed_responses.append({"chat_uid": chat_uid, "error": response_data})
+            logger.error(
+                f"⚠️ 알림 전송 실패: {request.event_type}, {request.args}, {chat_uid} -> {response_data}"
+            )
 
     # ✅ 하나라도 실패한 경우, 전체 실패 응답 반환
     if failed_responses:
@@ -170,13 +239,15 @@ class MessageNotiRequest(BaseModel):
 
 
 @app.post("/send-message-noti")
-def send_message_notification(request: MessageNotiRequest):
+async def send_message_notification(request: MessageNotiRequest):
     chat_uid = request.chat_uid
 
     error_message = None
 
     try:
-        response_data = nworks.send_message_to_channel(chat_uid, request.message)
+        response_data = await nworks.send_message_to_channel_async(
+            chat_uid, request.message
+        )
 
         if response_data.get("result") == "success":
             logger.debug(f"✅ 알림 전송 성공: {chat_uid} -> {response_data}")
@@ -202,13 +273,15 @@ class ImageNotiRequest(BaseModel):
 
 
 @app.post("/send-image-noti")
-def send_image_notification(request: ImageNotiRequest):
+async def send_image_notification(request: ImageNotiRequest):
     chat_uid = request.chat_uid
 
     error_message = None
 
     try:
-        response_data = nworks.send_image_to_channel(chat_uid, request.image_url)
+        response_data = await nworks.send_image_to_channel_async(
+            chat_uid, request.image_url
+        )
 
         if response_data.get("result") == "success":
             logger.debug(f"✅ 알림 전송 성공: {chat_uid} -> {response_data}")
@@ -1,28 +1,176 @@
 import requests
+import httpx
 import asyncio
 import jwt
+import threading
 import time
+from jwt.algorithms import RSAAlgorithm
+
+from rate_limiter import TokenBucket
 
 import logging
 
 logger = logging.getLogger("noti")
 
+WORKS_AUTH_URL = "https://auth.worksmobile.com/oauth2/v2.0/token"
+WORKS_API_BASE_URL = "https://www.worksapis.com/v1.0"
+
+# 만료 이 시간(초) 전에 미리 갱신 / expires_in 이 없을 때 기본 유효 시간
+TOKEN_REFRESH_MARGIN = 5 * 60
+TOKEN_DEFAULT_TTL = 12 * 60 * 60
+# 갱신 실패 시 재시도 간격 (초)
+TOKEN_RETRY_INTERVAL = 60
+# 자동 갱신 최소 간격 (초) — expires_in 이 매우 짧아도 인증 서버를 연속 호출하지 않도록
+MIN_REFRESH_INTERVAL = 60
+
+NWORKS_MSG_LIMIT = 1000
+SUFFIX = "\n\n...(생략)"
+
+
+def split_message(message, limit=NWORKS_MSG_LIMIT):
+    """
+    message 를 limit 글자 이하 조각으로 나눈다. (잘라내지 않고 여러 메시지로 분할)
+    가능하면 줄 단위로 나누고, 한 줄이 limit 보다 길면 그 줄만 limit 글자씩 자른다.
+    공백 / 빈 줄만 남은 조각은 보낼 수 없으므로 생략한다.
+    """
+    if len(message) <= limit:
+        return [message]
+
+    chunks = []
+    current = None  # 빈 줄("")도 조각의 첫 줄이 될 수 있으므로 None 으로 구분
+    for line in message.split("\n"):
+        if len(line) > limit:
+            if current is not None and current.strip():
+                chunks.append(current)
+            current = None
+            while len(line) > limit:
+                if line[:limit].strip():
+                    chunks.append(line[:limit])
+                line = line[limit:]
+            if not line:
+                continue
+
+        if current is None:
+            current = line
+        elif len(current) + 1 + len(line) <= limit:
+            current = f"{current}\n{line}"
+        else:
+            if current.strip():
+                chunks.append(current)
+            current = line
+
+    if current is not None and current.strip():
+        chunks.append(current)
+    return chunks
+
 
 class NaverWorksAPI:
     def __init__(
-        self, client_id, client_secret, service_account, private_key_path, bot_id
+        self,
+        client_id,
+        client_secret,
+        service_account,
+        private_key_path,
+        bot_id,
+        api_base_url=None,
+        auth_url=None,
+        max_concurrency=20,
+        rate_limit_per_sec=None,
+        rate_limit_burst=None,
     ):
         self.client_id = client_id
         self.client_secret = client_secret
         self.service_account = service_account
         self.private_key_path = private_key_path
         self.bot_id = bot_id
+        self.api_base_url = (api_base_url or WORKS_API_BASE_URL).rstrip("/")
+        self.auth_url = auth_url or WORKS_AUTH_URL
+        self.max_concurrency = max_concurrency
         self.access_token = None
+        self.token_expires_at = 0.0  # time.monotonic() 기준 만료 시각
+        self.token_refresh_margin = TOKEN_REFRESH_MARGIN  # 만료 몇 초 전에 갱신할지
         self.token_refresh_task = None  # ✅ 백그라운드 태스크 추가
 
+        # ✅ 파싱된 private key (처음 서명할 때 한 번만 파일에서 읽음)
+        self._signing_key = None
+
+        # ✅ 토큰 갱신 single-flight (스레드 / 코루틴 각각 한 번만 갱신 요청)
+        self._token_lock = threading.Lock()
+        self._token_lock_async = asyncio.Lock()
+
+        # ✅ 동기 호출용 keep-alive 세션
+        self.session = requests.Session()
+
+        # ✅ 비동기 호출용 클라이언트 (open() 에서 생성, HTTP/2 + 연결 풀)
+        self.client = None
+        self.send_semaphore = None
+
+        # ✅ Works API 호출 속도 제한 (비동기 전송에 적용, None 이면 제한 없음)
+        self.rate_limiter = (
+            TokenBucket(rate_limit_per_sec, rate_limit_burst)
+            if rate_limit_per_sec
+            else None
+        )
+
+    async def open(self):
+        """비동기 HTTP 클라이언트 생성 (이벤트 루프 안에서 호출)"""
+        if self.client is not None:
+            return
+
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+            timeout=httpx.Timeout(10.0, connect=3.0),
+        )
+        # 동시에 Works API 로 나가는 요청 수 제한 (여러 요청의 fan-out 합계)
+        self.send_semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def aclose(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        self.session.close()
+
+    # ==============================
+    # 액세스 토큰
+    # ==============================
+    def token_valid(self):
+        return bool(self.access_token) and (
+            time.monotonic() < self.token_expires_at - self.token_refresh_margin
+        )
+
     def refresh_access_token(self):
-        """네이버웍스 API용 액세스 토큰 갱신"""
-        url = "https://auth.worksmobile.com/oauth2/v2.0/token"
+        """네이버웍스 API용 액세스 토큰 갱신 (강제)"""
+        with self._token_lock:
+            self._request_access_token()
+
+    def ensure_access_token(self, stale_token=None):
+        """
+        토큰이 없거나 곧 만료되거나 stale_token(401 을 받은 토큰)과 같으면 갱신한다.
+        동시에 여러 요청이 호출해도 갱신 요청은 한 번만 나간다.
+        """
+        if self.token_valid() and self.access_token != stale_token:
+            return
+
+        with self._token_lock:
+            if self.token_valid() and self.access_token != stale_token:
+                return
+            self._request_access_token()
+
+    async def ensure_access_token_async(self, stale_token=None):
+        """ensure_access_token 의 비동기 버전 (갱신은 스레드에서 실행)"""
+        if self.token_valid() and self.access_token != stale_token:
+            return
+
+        async with self._token_lock_async:
+            if self.token_valid() and self.access_token != stale_token:
+                return
+            await asyncio.to_thread(self.ensure_access_token, stale_token)
+
+    def _request_access_token(self):
         headers = {"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"}
         data = {
             "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
@@ -32,9 +180,14 @@ class NaverWorksAPI:
             "scope": "bot user.read",
         }
 
-        response = requests.post(url, headers=headers, data=data)
+        response = self.session.post(self.auth_url, headers=headers, data=data)
         if response.status_code == 200:
-            self.access_token = response.json().get("access_token")
+            token = response.json()
+            expires_in = int(token.get("expires_in") or TOKEN_DEFAULT_TTL)
+            self.access_token = token.get("access_token")
+            self.token_expires_at = time.monotonic() + expires_in
+            # 유효 시간이 margin 보다 짧으면 발급 직후부터 만료로 보이므로 절반으로 줄임
+            self.token_refresh_margin = min(TOKEN_REFRESH_MARGIN, expires_in / 2)
         else:
             raise Exception(f"Failed to refresh access token: {response.text}")
 
@@ -49,36 +202,42 @@ class NaverWorksAPI:
             "exp": exp,
         }
 
-        with open(self.private_key_path, "r") as key_file:
-            private_key = key_file.read()
+        if self._signing_key is None:
+            with open(self.private_key_path, "r") as key_file:
+                private_key = key_file.read()
+            self._signing_key = RSAAlgorithm(RSAAlgorithm.SHA256).prepare_key(
+                private_key
+            )
 
         token = jwt.encode(
             payload,
-            private_key,
+            self._signing_key,
             algorithm="RS256",
             headers={"alg": "RS256", "typ": "JWT"},
         )
         return token
 
-    def send_message_to_channel(self, channel_id, message, url_link):
-        if not self.access_token:
-            self.refresh_access_token()  # 액세스 토큰이 없으면 갱신
+    # ==============================
+    # 메시지 payload / 응답 처리 (동기 / 비동기 공통)
+    # ==============================
+    def _messages_url(self, channel_id):
+        return f"{self.api_base_url}/bots/{self.bot_id}/channels/{channel_id}/messages"
 
-        url = f"https://www.worksapis.com/v1.0/bots/{self.bot_id}/channels/{channel_id}/messages"
-        headers = {
+    @staticmethod
+    def _headers(token):
+        return {
             "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.access_token}",
+            "Authorization": f"Bearer {token}",
         }
 
-        NWORKS_MSG_LIMIT = 1000
-        SUFFIX = "\n\n...(생략)"
-
+    @staticmethod
+    def _message_payload(message, url_link):
         if len(message) > NWORKS_MSG_LIMIT:
             cut = max(0, NWORKS_MSG_LIMIT - len(SUFFIX))
             message = message[:cut] + SUFFIX
 
         if url_link:
-            payload = {
+            return {
                 "content": {
                     "type": "link",
                     "contentText": message,
@@ -86,33 +245,11 @@ class NaverWorksAPI:
                     "link": url_link,
                 }
             }
-        else:
-            payload = {"content": {"type": "text", "text": message}}
-
-        response = requests.post(url, json=payload, headers=headers)
-
-        if response.status_code == 201:
-            return {"result": "success"}
-        else:
-            logger.error(
-                f"⚠️ 메시지 전송 실패: {payload} => {response.status_code} {response.text}"
-            )
-            return {
-                "result": "fail",
-                "status_code": response.status_code,
-                "error": response.text,
-            }
-
-    def send_image_to_channel(self, channel_id, image_url):
-        if not self.access_token:
-            self.refresh_access_token()  # 액세스 토큰이 없으면 갱신
+        return {"content": {"type": "text", "text": message}}
 
-        url = f"https://www.worksapis.com/v1.0/bots/{self.bot_id}/channels/{channel_id}/messages"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.access_token}",
-        }
-        payload = {
+    @staticmethod
+    def _image_payload(image_url):
+        return {
             "content": {
                 "type": "image",
                 "previewImageUrl": image_url,
@@ -120,26 +257,97 @@ class NaverWorksAPI:
             }
         }
 
-        response = requests.post(url, json=payload, headers=headers)
-
-        if response.status_code == 201:
+    @staticmethod
+    def _result(payload, status_code, text):
+        if status_code == 201:
             return {"result": "success"}
-        else:
-            logger.error(
-                f"⚠️ 메시지 전송 실패: {payload} => {response.status_code} {response.text}"
+
+        logger.error(f"⚠️ 메시지 전송 실패: {payload} => {status_code} {text}")
+        return {
+            "result": "fail",
+            "status_code": status_code,
+            "error": text,
+        }
+
+    # ==============================
+    # 동기 전송
+    # ==============================
+    def _post(self, channel_id, payload):
+        # 액세스 토큰이 없거나 곧 만료되면 갱신
+        self.ensure_access_token()
+
+        for attempt in range(2):
+            token = self.access_token
+            response = self.session.post(
+                self._messages_url(channel_id),
+                json=payload,
+                headers=self._headers(token),
             )
-            return {
-                "result": "fail",
-                "status_code": response.status_code,
-                "error": response.text,
-            }
+            if response.status_code != 401 or attempt:
+                break
+            # 토큰 만료 / 폐기 → 갱신 후 한 번만 재전송
+            logger.warning("⚠️ 401 응답, 액세스 토큰 갱신 후 재전송")
+            self.ensure_access_token(stale_token=token)
+
+        return self._result(payload, response.status_code, response.text)
+
+    def send_message_to_channel(self, channel_id, message, url_link=None):
+        return self._post(channel_id, self._message_payload(message, url_link))
+
+    def send_image_to_channel(self, channel_id, image_url):
+        return self._post(channel_id, self._image_payload(image_url))
+
+    # ==============================
+    # 비동기 전송 (연결 풀 공유, 여러 채널 동시 전송용)
+    # ==============================
+    async def _post_async(self, channel_id, payload):
+        if self.client is None:
+            await self.open()
+
+        # 액세스 토큰이 없거나 곧 만료되면 갱신 (동시에 여러 요청이 와도 한 번만)
+        await self.ensure_access_token_async()
+
+        for attempt in range(2):
+            token = self.access_token
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            async with self.send_semaphore:
+                response = await self.client.post(
+                    self._messages_url(channel_id),
+                    json=payload,
+                    headers=self._headers(token),
+                )
+            if response.status_code != 401 or attempt:
+                break
+            # 토큰 만료 / 폐기 → 갱신 후 한 번만 재전송
+            logger.warning("⚠️ 401 응답, 액세스 토큰 갱신 후 재전송")
+            await self.ensure_access_token_async(stale_token=token)
+
+        return self._result(payload, response.status_code, response.text)
+
+    async def send_message_to_channel_async(self, channel_id, message, url_link=None):
+        return await self._post_async(
+            channel_id, self._message_payload(message, url_link)
+        )
+
+    async def send_image_to_channel_async(self, channel_id, image_url):
+        return await self._post_async(channel_id, self._image_payload(image_url))
 
     async def refresh_access_token_task(self):
-        """주기적으로 액세스 토큰 갱신 (12시간마다)"""
+        """
+        토큰 만료 token_refresh_margin 초 전에 미리 갱신 (expires_in 기준)
+        최소 MIN_REFRESH_INTERVAL 초 간격으로만 갱신한다.
+        """
         while True:
+            delay = (
+                self.token_expires_at - self.token_refresh_margin - time.monotonic()
+            )
+            if self.access_token:  # 시작 시 토큰 발급에 실패했으면 바로 재시도
+                await asyncio.sleep(max(delay, MIN_REFRESH_INTERVAL))
+
             try:
-                self.refresh_access_token()
-                print("✅ 네이버웍스 액세스 토큰 갱신 완료")
+                await self.ensure_access_token_async()
+                logger.info("✅ 네이버웍스 액세스 토큰 갱신 완료")
             except Exception as e:
-                print(f"⚠️ 네이버웍스 액세스 토큰 갱신 실패: {e}")
-            await asyncio.sleep(12 * 60 * 60)  # 12시간마다 실행
+                logger.error(f"⚠️ 네이버웍스 액세스 토큰 갱신 실패: {e}")
+                await asyncio.sleep(TOKEN_RETRY_INTERVAL)
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    asyncio 토큰 버킷 (초당 rate 개, 최대 burst 개까지 몰아서 허용)
+    acquire() 는 토큰이 생길 때까지 기다린다. 대기 순서는 도착 순서 (FIFO)
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+
+        self._lock = asyncio.Lock()
+        self.waiting = 0
+        self.acquired = 0
+        self.throttled = 0  # 기다려야 했던 요청 수
+        self.wait_sec = 0.0  # 누적 대기 시간
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        self.waiting += 1
+        start_t = time.monotonic()
+        try:
+            async with self._lock:
+                self._refill()
+                if self.tokens < 1:
+                    self.throttled += 1
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+                    self._refill()
+                self.tokens -= 1
+                self.acquired += 1
+        finally:
+            self.waiting -= 1
+            self.wait_sec += time.monotonic() - start_t
+
+    def metrics(self):
+        self._refill()
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self.tokens, 2),
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "wait_sec": round(self.wait_sec, 3),
+        }
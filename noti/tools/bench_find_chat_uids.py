@@ -0,0 +1,197 @@
+"""
+find_chat_uids 라우팅 마이크로 벤치마크 (설정 전체 선형 탐색 vs 라우팅 인덱스)
+
+    python tools/bench_find_chat_uids.py --rules 5000 --event-types 200 --queries 5000
+
+임의의 NOTIFICATIONS 를 만든 임시 config.yaml 로 config 모듈을 로드한 뒤
+- linear : 기존 방식 (요청마다 NOTIFICATIONS 전체를 돌며 ARGS 문자열 파싱)
+- index  : load_config 에서 만든 ROUTING_INDEX 사용
+두 결과가 모든 쿼리에서 같은지 확인하고 쿼리당 소요 시간을 비교한다.
+"""
+
+import argparse, os, random, sys, tempfile, time
+from collections import defaultdict
+
+import yaml
+
+NOTI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, NOTI_DIR)
+
+ARG_KEYS = [
+    "visit_org_code",
+    "will_visit_org_code",
+    "inci_org_code",
+    "inci_major_category",
+    "org_assign_org_code",
+    "manager_id",
+]
+
+
+def find_chat_uids_linear(notifications, event_type, args):
+    """기존 find_chat_uids (비교 / 결과 검증용)"""
+    matched_chat_uids = []
+
+    parsed_input_args = defaultdict(list)
+    for arg in args:
+        key, value = arg.split("=")
+        parsed_input_args[key].append(value)
+
+    for notification in notifications:
+        notification_event_type = notification["EVENT_TYPE"]
+
+        if isinstance(notification_event_type, list):
+            if event_type not in notification_event_type:
+                continue
+        else:
+            if event_type != notification_event_type:
+                continue
+
+        notification_args_list = notification.get("ARGS", [])
+
+        if not args and not notification_args_list:
+            matched_chat_uids.append(notification.get("CHAT_UID"))
+            continue
+
+        if not args and notification_args_list:
+            continue
+
+        for notification_args in notification_args_list:
+            conditions = notification_args.split("&")
+            parsed_conditions = {
+                cond.split("=")[0]: cond.split("=")[1] for cond in conditions
+            }
+
+            is_match = True
+            for key, value in parsed_conditions.items():
+                if value == "*":
+                    if key not in parsed_input_args:
+                        is_match = False
+                        break
+                elif value not in parsed_input_args.get(key, []):
+                    is_match = False
+                    break
+
+            if is_match:
+                matched_chat_uids.append(notification.get("CHAT_UID"))
+                break
+
+    return matched_chat_uids
+
+
+def random_condition(rng: random.Random, n_values: int) -> str:
+    keys = rng.sample(ARG_KEYS, rng.randint(1, 3))
+    return "&".join(
+        f"{key}={'*' if rng.random() < 0.4 else rng.randrange(n_values)}"
+        for key in keys
+    )
+
+
+def make_notifications(
+    rng: random.Random, rules: int, event_types: int, n_values: int
+):
+    names = [f"event_{i}" for i in range(event_types)]
+    notifications = []
+
+    for i in range(rules):
+        if rng.random() < 0.3:
+            event_type = rng.sample(names, rng.randint(2, 5))
+        else:
+            event_type = rng.choice(names)
+
+        notification = {"EVENT_TYPE": event_type, "CHAT_UID": f"chat-{i}"}
+        if rng.random() < 0.8:
+            notification["ARGS"] = [
+                random_condition(rng, n_values) for _ in range(rng.randint(1, 3))
+            ]
+        notifications.append(notification)
+
+    return names, notifications
+
+
+def make_queries(rng: random.Random, names: list[str], queries: int, n_values: int):
+    result = []
+    for _ in range(queries):
+        args = []
+        if rng.random() < 0.9:
+            for key in rng.sample(ARG_KEYS, rng.randint(1, 4)):
+                args.append(f"{key}={rng.randrange(n_values)}")
+        result.append((rng.choice(names), args))
+    return result
+
+
+def bench(fn, queries) -> float:
+    start_t = time.perf_counter()
+    for event_type, args in queries:
+        fn(event_type, args)
+    return (time.perf_counter() - start_t) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--event-types", type=int, default=200)
+    parser.add_argument("--values", type=int, default=20, help="조건 값 종류 수")
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names, notifications = make_notifications(
+        rng, args.rules, args.event_types, args.values
+    )
+    queries = make_queries(rng, names, args.queries, args.values)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = os.path.join(tmp_dir, "config.yaml")
+        with open(config_path, "w") as f:
+            yaml.safe_dump(
+                {
+                    "NWORKS": {},
+                    "LOGGING": {"FILE_PATH": tmp_dir},
+                    "NOTIFICATIONS": notifications,
+                },
+                f,
+                allow_unicode=True,
+            )
+
+        # config 모듈은 import 시 -c 로 지정한 파일을 로드한다
+        sys.argv = [sys.argv[0], "-c", config_path]
+        import config
+
+        start_t = time.perf_counter()
+        config.load_config()
+        load_ms = (time.perf_counter() - start_t) * 1000
+
+    # load_config 중 인덱스 생성 시간 (나머지는 YAML 파싱)
+    start_t = time.perf_counter()
+    config.build_routing_index(notifications)
+    build_ms = (time.perf_counter() - start_t) * 1000
+
+    mismatches = sum(
+        1
+        for event_type, query_args in queries
+        if config.find_chat_uids(event_type, query_args)
+        != find_chat_uids_linear(notifications, event_type, query_args)
+    )
+    matched = sum(len(config.find_chat_uids(e, a)) for e, a in queries)
+
+    linear_sec = bench(
+        lambda e, a: find_chat_uids_linear(notifications, e, a), queries
+    )
+    index_sec = bench(config.find_chat_uids, queries)
+
+    print(
+        f"[BENCH] rules={args.rules} event_types={args.event_types} "
+        f"queries={args.queries} avg_matches={matched / len(queries):.2f} "
+        f"load_config={load_ms:.1f}ms (index build={build_ms:.1f}ms) "
+        f"mismatches={mismatches}"
+    )
+    print(f"[BENCH] linear={linear_sec * 1e6:.1f}us/query")
+    print(
+        f"[BENCH] index={index_sec * 1e6:.1f}us/query "
+        f"(x{linear_sec / index_sec:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+noti 알림 fan-out 부하 테스트 (로컬 mock 네이버웍스 API 사용)
+
+1) API 단독 비교 (mock 서버를 내부에서 띄움)
+    python tools/load_test_noti.py --events 50 --chats 5 --latency 0.2
+
+   - sync  : 기존 방식 (채널마다 순서대로 requests 전송)
+   - async : httpx 연결 풀 + 채널 동시 전송 (이벤트도 --concurrency 개씩 동시에)
+
+2) noti 서버 전체 경로 (/send-event-noti)
+    python tools/mock_works_api.py --port 18080 --latency 0.2
+    python main.py -c <mock 주소를 지정한 config.yaml> --no-reload
+    python tools/load_test_noti.py --noti-url http://127.0.0.1:10002 \\
+        --event-type load_test --events 200 --concurrency 20
+
+   --event-type 은 COALESCE.EVENT_TYPES 에 없는 (묶음 전송 대상이 아닌) 이벤트로 지정해야
+   fan-out 경로를 측정한다. (묶음 대상이면 202 로 바로 응답하므로 전송 시간이 빠짐)
+"""
+
+import argparse, asyncio, os, statistics, sys, time
+from collections import Counter
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from naverworks_api import NaverWorksAPI  # noqa: E402
+from tools.mock_works_api import start_mock_server, stats  # noqa: E402
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def report(name: str, elapsed: float, latencies: list[float], results: Counter):
+    print(
+        f"[{name}] events={len(latencies)} elapsed={elapsed:.2f}s "
+        f"events/s={len(latencies) / elapsed:.1f} "
+        f"p50={statistics.median(latencies) * 1000:.0f}ms "
+        f"p95={percentile(latencies, 0.95) * 1000:.0f}ms "
+        f"p99={percentile(latencies, 0.99) * 1000:.0f}ms "
+        f"results={dict(results)}"
+    )
+
+
+def create_api(base_url: str, max_concurrency: int) -> NaverWorksAPI:
+    api = NaverWorksAPI(
+        client_id="mock",
+        client_secret="mock",
+        service_account="mock",
+        private_key_path=None,
+        bot_id="mock-bot",
+        api_base_url=f"{base_url}/v1.0",
+        auth_url=f"{base_url}/oauth2/v2.0/token",
+        max_concurrency=max_concurrency,
+    )
+    # JWT 서명 없이 바로 전송 (mock 은 --check-token 이 없으면 토큰을 검사하지 않음)
+    api.access_token = "mock-token"
+    api.token_expires_at = time.monotonic() + 3600
+    return api
+
+
+# ==============================
+# 1) API 단독 비교
+# ==============================
+def run_sync(api: NaverWorksAPI, events: int, chat_uids: list[str]):
+    latencies = []
+    results = Counter()
+
+    start_t = time.perf_counter()
+    for i in range(events):
+        event_t = time.perf_counter()
+        for chat_uid in chat_uids:
+            results[api.send_message_to_channel(chat_uid, f"event {i}")["result"]] += 1
+        latencies.append(time.perf_counter() - event_t)
+
+    report("sync", time.perf_counter() - start_t, latencies, results)
+
+
+async def run_async(
+    api: NaverWorksAPI, events: int, chat_uids: list[str], concurrency: int
+):
+    await api.open()
+    latencies = []
+    results = Counter()
+    event_semaphore = asyncio.Semaphore(concurrency)
+
+    async def send_event(i):
+        async with event_semaphore:
+            event_t = time.perf_counter()
+            responses = await asyncio.gather(
+                *(
+                    api.send_message_to_channel_async(chat_uid, f"event {i}")
+                    for chat_uid in chat_uids
+                ),
+                return_exceptions=True,
+            )
+            latencies.append(time.perf_counter() - event_t)
+            for r in responses:
+                results["error" if isinstance(r, Exception) else r["result"]] += 1
+
+    start_t = time.perf_counter()
+    await asyncio.gather(*(send_event(i) for i in range(events)))
+    report("async", time.perf_counter() - start_t, latencies, results)
+    await api.aclose()
+
+
+def run_api_benchmark(args):
+    server = start_mock_server(latency=args.latency, fail_rate=args.fail_rate)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    chat_uids = [f"chat-{i}" for i in range(args.chats)]
+    print(
+        f"[LOAD] mock={base_url} events={args.events} chats={args.chats} "
+        f"latency={args.latency}s concurrency={args.concurrency}"
+    )
+
+    if not args.skip_sync:
+        run_sync(create_api(base_url, args.max_connections), args.events, chat_uids)
+        print(f"[MOCK] {stats}")
+        stats["max_in_flight"] = 0
+
+    asyncio.run(
+        run_async(
+            create_api(base_url, args.max_connections),
+            args.events,
+            chat_uids,
+            args.concurrency,
+        )
+    )
+    print(f"[MOCK] {stats}")
+    server.shutdown()
+
+
+# ==============================
+# 2) noti 서버 전체 경로
+# ==============================
+async def run_noti_server(args):
+    latencies = []
+    results = Counter()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.noti_url, timeout=30) as client:
+
+        async def send_event(i):
+            async with semaphore:
+                event_t = time.perf_counter()
+                try:
+                    resp = await client.post(
+                        "/send-event-noti",
+                        json={
+                            "event_type": args.event_type,
+                            "args": args.args,
+                            "message": f"[load test] event {i}",
+                        },
+                    )
+                    results[resp.status_code] += 1
+                except httpx.HTTPError as e:
+                    results[type(e).__name__] += 1
+                latencies.append(time.perf_counter() - event_t)
+
+        start_t = time.perf_counter()
+        await asyncio.gather(*(send_event(i) for i in range(args.events)))
+
+    report("noti", time.perf_counter() - start_t, latencies, results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--chats", type=int, default=5, help="이벤트당 채널 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 이벤트 수")
+    parser.add_argument("--max-connections", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="mock 응답 지연 (초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--skip-sync", action="store_true")
+    parser.add_argument("--noti-url", default=None, help="실행 중인 noti 서버 주소")
+    parser.add_argument(
+        "--event-type", default="load_test", help="묶음 전송 대상이 아닌 이벤트"
+    )
+    parser.add_argument("--args", nargs="*", default=[])
+    args = parser.parse_args()
+
+    if args.noti_url:
+        asyncio.run(run_noti_server(args))
+    else:
+        run_api_benchmark(args)
+
+
+if __name__ == "__main__":
+    main()
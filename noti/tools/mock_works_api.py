@@ -0,0 +1,169 @@
+"""
+로컬 부하 테스트용 네이버웍스 API 대체 서버
+
+    python tools/mock_works_api.py --port 18080 --latency 0.2 --fail-rate 0.1
+
+config.yaml 의 NWORKS 에 아래를 지정하면 noti 서버가 이 서버로 요청한다.
+    NWORKS_API_BASE_URL: "http://127.0.0.1:18080/v1.0"
+    NWORKS_AUTH_URL: "http://127.0.0.1:18080/oauth2/v2.0/token"
+
+- POST /oauth2/v2.0/token : 토큰 발급 (expires_in = --token-ttl)
+- POST /v1.0/bots/{bot_id}/channels/{channel_id}/messages :
+  --latency 초 대기 후 201, --fail-rate 비율만큼 500 (--latency-jitter 로 편차 추가)
+  --check-token 이면 발급하지 않았거나 만료된 토큰은 401
+- GET /_stats : 받은 요청 수 / 동시 처리 최대치
+"""
+
+import argparse, json, random, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MESSAGES_PATH_RE = re.compile(r"^/v1\.0/bots/[^/]+/channels/([^/]+)/messages$")
+
+stats = {
+    "tokens": 0,
+    "messages": 0,
+    "failed": 0,
+    "unauthorized": 0,
+    "in_flight": 0,
+    "max_in_flight": 0,
+}
+stats_lock = threading.Lock()
+
+# 발급한 토큰 → 만료 시각 (--check-token)
+issued_tokens = {}
+
+
+class MockWorksHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    latency = 0.0
+    latency_jitter = 0.0
+    fail_rate = 0.0
+    token_ttl = 86400
+    check_token = False
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/_stats":
+            with stats_lock:
+                return self._send_json(200, dict(stats))
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        self._read_body()
+
+        if self.path == "/oauth2/v2.0/token":
+            token = f"mock-token-{time.time_ns()}"
+            with stats_lock:
+                stats["tokens"] += 1
+                issued_tokens[token] = time.time() + self.token_ttl
+            return self._send_json(
+                200,
+                {
+                    "access_token": token,
+                    "token_type": "Bearer",
+                    "expires_in": self.token_ttl,
+                },
+            )
+
+        if not MESSAGES_PATH_RE.match(self.path):
+            return self._send_json(404, {"error": "not found"})
+
+        if self.check_token:
+            token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+            with stats_lock:
+                expired = issued_tokens.get(token, 0) < time.time()
+                stats["unauthorized"] += int(expired)
+            if expired:
+                return self._send_json(401, {"code": "UNAUTHORIZED"})
+
+        with stats_lock:
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+
+        try:
+            time.sleep(self.latency + random.random() * self.latency_jitter)
+            failed = random.random() < self.fail_rate
+        finally:
+            with stats_lock:
+                stats["in_flight"] -= 1
+                stats["messages"] += 1
+                stats["failed"] += int(failed)
+
+        if failed:
+            return self._send_json(500, {"code": "INTERNAL_SERVER_ERROR"})
+
+        # 실제 API 와 같이 201 + 빈 본문
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    latency_jitter: float = 0.0,
+    fail_rate: float = 0.0,
+    token_ttl: int = 86400,
+    check_token: bool = False,
+) -> ThreadingHTTPServer:
+    """백그라운드 스레드로 mock 서버 실행 (port=0 이면 빈 포트 사용)"""
+    MockWorksHandler.latency = latency
+    MockWorksHandler.latency_jitter = latency_jitter
+    MockWorksHandler.fail_rate = fail_rate
+    MockWorksHandler.token_ttl = token_ttl
+    MockWorksHandler.check_token = check_token
+
+    server = ThreadingHTTPServer((host, port), MockWorksHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", type=float, default=0.2, help="메시지 응답 지연 (초)")
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument(
+        "--fail-rate", type=float, default=0.0, help="500 으로 실패 처리할 비율 (0~1)"
+    )
+    parser.add_argument("--token-ttl", type=int, default=86400, help="토큰 유효 시간 (초)")
+    parser.add_argument(
+        "--check-token", action="store_true", help="미발급 / 만료 토큰은 401 응답"
+    )
+    args = parser.parse_args()
+
+    server = start_mock_server(
+        args.host,
+        args.port,
+        args.latency,
+        args.latency_jitter,
+        args.fail_rate,
+        args.token_ttl,
+        args.check_token,
+    )
+    print(f"[MOCK WORKS] listening on http://{args.host}:{args.port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import json, os, queue, threading, time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.constants import (
+    NOTI_URL,
+    NOTI_QUEUE_SIZE,
+    NOTI_TIMEOUT,
+    NOTI_MAX_RETRIES,
+    NOTI_RETRY_INTERVAL,
+    NOTI_SPOOL_PATH,
+)
+
+# 재시도 대상 상태 코드 (500 = 모든 채널 전송 실패)
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+class NotiClient:
+    """
+    noti 서버(/send-event-noti) 비동기 전송 클라이언트
+
+    - send() 는 bounded queue 에 넣고 바로 반환 (크롤링은 알림 전송을 기다리지 않음)
+    - 백그라운드 스레드 하나가 keep-alive 세션으로 순서대로 전송
+    - 연결 실패 / 429 / 5xx 는 backoff 후 재시도, 그래도 실패하면 spool(JSONL) 파일에 기록
+    - 서버가 죽어 있으면 retry_interval 동안은 바로 spool 에 쌓고,
+      이후 전송이 성공하면 spool 에 쌓인 알림을 순서대로 재전송
+    - 큐가 가득 차도 기다리지 않고 spool 에 기록
+    - 404 (매칭되는 채널 없음) 등 4xx 는 재시도해도 같으므로 로그만 남기고 버림
+    - 207 (일부 채널만 성공) 은 재전송 시 중복 알림이 가므로 성공으로 처리
+    """
+
+    def __init__(
+        self,
+        url: str = NOTI_URL,
+        queue_size: int = NOTI_QUEUE_SIZE,
+        timeout=NOTI_TIMEOUT,
+        max_retries: int = NOTI_MAX_RETRIES,
+        retry_interval: float = NOTI_RETRY_INTERVAL,
+        spool_path: str | None = NOTI_SPOOL_PATH,
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+        self.spool_path = Path(spool_path) if spool_path else None
+
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=1))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=1))
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+        self._down_until = 0.0
+        self._stopping = threading.Event()  # 큐를 비우면 종료
+        self._closed = threading.Event()  # 재시도 대기 중단, 이후 send() 는 spool
+
+        self.sent = 0
+        self.retries = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.dropped = 0
+
+        self._worker = threading.Thread(
+            target=self._run, name="noti-client", daemon=True
+        )
+        self._worker.start()
+
+    # ==============================
+    # 전송 요청
+    # ==============================
+    def send(self, payload: dict):
+        """알림을 큐에 넣고 바로 반환한다. (큐가 가득 차면 spool 에 기록)"""
+        if self._closed.is_set():
+            self._spool([payload])
+            return
+
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            print("[NOTI] queue full, spool")
+            self._spool([payload])
+
+    # ==============================
+    # 백그라운드 전송
+    # ==============================
+    def _run(self):
+        # 이전 실행에서 남은 spool 부터 재전송
+        self._replay_spool()
+
+        while True:
+            try:
+                payload = self._queue.get(timeout=1 if self._stopping.is_set() else 5)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return
+                self._replay_spool()
+                continue
+
+            try:
+                if self._deliver(payload):
+                    self._replay_spool()
+            except Exception as e:
+                print(f"[NOTI ERROR] unexpected error: {e}")
+                self._spool([payload])
+
+    def _is_down(self) -> bool:
+        return time.monotonic() < self._down_until
+
+    def _post(self, payload: dict) -> int:
+        resp = self.session.post(self.url, json=payload, timeout=self.timeout)
+        return resp.status_code
+
+    def _deliver(self, payload: dict, spool_on_failure: bool = True) -> bool:
+        """
+        payload 하나를 재시도 포함해 전송한다. 전송(또는 버림) 처리되면 True.
+        실패하면 서버를 retry_interval 동안 down 으로 보고 spool 에 기록한다.
+        """
+        if self._is_down():
+            if spool_on_failure:
+                self._spool([payload])
+            return False
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                status = self._post(payload)
+            except requests.RequestException as e:
+                status = None
+                error = e
+            else:
+                error = status
+
+            if status is not None and status < 300:
+                with self._lock:
+                    self.sent += 1
+                if status == 207:
+                    print("[NOTI] partial success (207)")
+                return True
+
+            if status is not None and status not in RETRYABLE_STATUS:
+                print(f"[NOTI ERROR] status={status}, drop {payload.get('event_type')}")
+                with self._lock:
+                    self.dropped += 1
+                return True
+
+            if attempt < self.max_retries:
+                with self._lock:
+                    self.retries += 1
+                if self._closed.wait(min(2**attempt, self.retry_interval)):
+                    break
+
+        print(f"[NOTI ERROR] send failed: {error}")
+        self._down_until = time.monotonic() + self.retry_interval
+        if spool_on_failure:
+            self._spool([payload])
+        return False
+
+    # ==============================
+    # spool (JSONL)
+    # ==============================
+    def _spool(self, payloads: list[dict], count: bool = True):
+        if self.spool_path is None:
+            with self._lock:
+                self.dropped += len(payloads)
+            return
+
+        with self._spool_lock:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                for payload in payloads:
+                    f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+        if count:
+            with self._lock:
+                self.spooled += len(payloads)
+
+    @staticmethod
+    def _read_jsonl(path: Path) -> list[dict]:
+        payloads = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    payloads.append(json.loads(line))
+                except ValueError:
+                    continue
+        return payloads
+
+    def _replay_spool(self):
+        """
+        spool 에 쌓인 알림을 순서대로 재전송한다.
+        실패하면 못 보낸 항목을 그 사이 새로 쌓인 항목 앞에 다시 기록한다.
+        (재전송 중 종료되면 .replay 파일이 남고 다음 실행 때 이어서 전송)
+        """
+        if self.spool_path is None or self._is_down():
+            return
+
+        replay_path = self.spool_path.with_suffix(".replay")
+        with self._spool_lock:
+            if self.spool_path.exists():
+                if replay_path.exists():
+                    with open(replay_path, "a", encoding="utf-8") as f:
+                        f.write(self.spool_path.read_text(encoding="utf-8"))
+                    self.spool_path.unlink()
+                else:
+                    os.replace(self.spool_path, replay_path)
+            if not replay_path.exists():
+                return
+
+        payloads = self._read_jsonl(replay_path)
+        replayed = 0
+        for payload in payloads:
+            if not self._deliver(payload, spool_on_failure=False):
+                break
+            replayed += 1
+
+        with self._spool_lock:
+            remaining = payloads[replayed:]
+            if remaining:
+                if self.spool_path.exists():
+                    remaining += self._read_jsonl(self.spool_path)
+                tmp_path = self.spool_path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for payload in remaining:
+                        f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+                os.replace(tmp_path, self.spool_path)
+            replay_path.unlink(missing_ok=True)
+
+        with self._lock:
+            self.replayed += replayed
+        if replayed:
+            print(
+                f"[NOTI] spool replayed={replayed} "
+                f"remaining={len(payloads) - replayed}"
+            )
+
+    # ==============================
+    # 상태 / 종료
+    # ==============================
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "sent": self.sent,
+                "retries": self.retries,
+                "spooled": self.spooled,
+                "replayed": self.replayed,
+                "dropped": self.dropped,
+            }
+
+    def close(self, timeout: float = 10):
+        """
+        큐에 남은 알림을 timeout 초 동안 전송하고 종료한다.
+        시간 안에 못 보낸 알림은 spool 에 기록 (다음 실행 때 재전송).
+        """
+        self._stopping.set()
+        self._worker.join(timeout=timeout)
+        self._closed.set()
+
+        remaining = []
+        while True:
+            try:
+                remaining.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if remaining:
+            self._spool(remaining)
+
+        self.session.close()
+        print(f"[NOTI] {self.stats()}")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_noti_client() -> NotiClient:
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = NotiClient()
+        return _client
+
+
+def close_noti_client():
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
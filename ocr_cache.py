@@ -0,0 +1,171 @@
+import hashlib, sqlite3, threading, time
+from pathlib import Path
+
+from config.constants import (
+    OCR_CACHE_PATH,
+    OCR_CACHE_TTL,
+    OCR_CACHE_SRC_TTL,
+    OCR_CACHE_MAX_ENTRIES,
+)
+
+
+def hash_image_bytes(img_bytes: bytes) -> str:
+    return hashlib.sha1(img_bytes).hexdigest()
+
+
+class OCRCache:
+    """
+    썸네일 OCR 결과 영구 캐시 (SQLite)
+
+    - ocr_text : 이미지 내용 해시 → OCR 텍스트 (TTL + LRU 개수 제한)
+    - ocr_src  : 이미지 src → 내용 해시 (src 가 최근에 확인된 경우 다운로드도 생략)
+
+    여러 크롤러 스레드에서 같이 쓰므로 연결 하나를 lock 으로 보호한다.
+    """
+
+    def __init__(
+        self,
+        path: str = OCR_CACHE_PATH,
+        ttl: float = OCR_CACHE_TTL,
+        src_ttl: float = OCR_CACHE_SRC_TTL,
+        max_entries: int = OCR_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.src_ttl = src_ttl
+        self.max_entries = max_entries
+
+        self.src_hits = 0
+        self.hash_hits = 0
+        self.misses = 0
+        self._puts_since_prune = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_text (
+                content_hash TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_ocr_text_last_access
+                ON ocr_text (last_access);
+            CREATE TABLE IF NOT EXISTS ocr_src (
+                src TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                seen_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get_by_src(self, src: str) -> str | None:
+        """src 가 src_ttl 이내에 확인된 이미지면 OCR 텍스트를 바로 반환한다."""
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT t.content_hash, t.text FROM ocr_src s
+                JOIN ocr_text t ON t.content_hash = s.content_hash
+                WHERE s.src = ? AND s.seen_at >= ? AND t.created_at >= ?
+                """,
+                (src, now - self.src_ttl, now - self.ttl),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self._touch(row[0], now)
+            self._conn.commit()
+            self.src_hits += 1
+            return row[1]
+
+    def get_by_hash(self, src: str | None, content_hash: str) -> str | None:
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM ocr_text WHERE content_hash = ? AND created_at >= ?",
+                (content_hash, now - self.ttl),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._touch(content_hash, now)
+            if src:
+                self._remember_src(src, content_hash, now)
+            self._conn.commit()
+            self.hash_hits += 1
+            return row[0]
+
+    def put(self, src: str | None, content_hash: str, text: str):
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO ocr_text (content_hash, text, created_at, last_access)
+                VALUES (?, ?, ?, ?)
+                """,
+                (content_hash, text, now, now),
+            )
+            if src:
+                self._remember_src(src, content_hash, now)
+            self._conn.commit()
+
+            self._puts_since_prune += 1
+            if self._puts_since_prune >= 500:
+                self._prune(now)
+                self._puts_since_prune = 0
+
+    def stats(self) -> dict:
+        lookups = self.src_hits + self.hash_hits + self.misses
+        hits = self.src_hits + self.hash_hits
+        return {
+            "src_hits": self.src_hits,
+            "hash_hits": self.hash_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._prune(time.time())
+            self._conn.close()
+
+    def _touch(self, content_hash: str, now: float):
+        self._conn.execute(
+            "UPDATE ocr_text SET last_access = ? WHERE content_hash = ?",
+            (now, content_hash),
+        )
+
+    def _remember_src(self, src: str, content_hash: str, now: float):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO ocr_src (src, content_hash, seen_at) VALUES (?, ?, ?)",
+            (src, content_hash, now),
+        )
+
+    def _prune(self, now: float):
+        # TTL 만료 제거 후, 최대 개수를 넘으면 오래 안 쓰인 순서(LRU)로 제거
+        self._conn.execute(
+            "DELETE FROM ocr_text WHERE created_at < ?", (now - self.ttl,)
+        )
+        self._conn.execute(
+            """
+            DELETE FROM ocr_text WHERE content_hash IN (
+                SELECT content_hash FROM ocr_text
+                ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+        self._conn.execute(
+            "DELETE FROM ocr_src WHERE seen_at < ?", (now - self.src_ttl,)
+        )
+        self._conn.commit()
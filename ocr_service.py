@@ -0,0 +1,203 @@
+"""
+OCR 전용 프로세스 풀
+
+EasyOCR(torch) 모델은 워커 프로세스마다 한 번만 로드하고,
+크롤러 스레드는 이미지 배치를 넘긴 뒤 Future 로 결과를 받는다.
+Selenium 스레드와 GIL / CPU 를 나눠 쓰지 않으므로
+OCR 중에도 다음 키워드 크롤링이 진행된다.
+
+이 모듈은 워커 프로세스에서도 import 되므로 무거운 의존성은 함수 안에서 import 한다.
+"""
+
+import multiprocessing, threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config.constants import (
+    OCR_WORKERS,
+    OCR_TORCH_THREADS,
+    OCR_BATCH_IMAGE_SIZE,
+)
+
+# 워커 프로세스 전역 reader
+_worker_reader = None
+
+
+def create_reader(torch_threads: int | None = None):
+    import easyocr
+
+    if torch_threads:
+        import torch
+
+        torch.set_num_threads(torch_threads)
+
+    return easyocr.Reader(["ko", "en"], gpu=False)
+
+
+def readtext(reader, img_bytes: bytes) -> str | None:
+    """OCR 실패 시 None (캐시에 저장하지 않음)"""
+    try:
+        results = reader.readtext(img_bytes, detail=0)
+        return " ".join(results)
+    except Exception:
+        return None
+
+
+def letterbox_batch(images: list[bytes], max_size=OCR_BATCH_IMAGE_SIZE) -> list:
+    """
+    이미지를 늘리거나 줄이지 않고 같은 크기 캔버스(배치 안 가장 큰 가로 / 세로)의
+    왼쪽 위에 붙인다. 여백은 이미지 테두리 색으로 채운다.
+    readtext 와 같은 형식(RGB ndarray)을 반환하며,
+    디코딩에 실패했거나 max_size 보다 큰 이미지는 None (이미지별 readtext 대상).
+    """
+    import cv2
+    import numpy as np
+
+    max_width, max_height = max_size
+    decoded = []
+    for img_bytes in images:
+        img = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
+        if img is None or img.shape[1] > max_width or img.shape[0] > max_height:
+            decoded.append(None)
+            continue
+        # easyocr 가 bytes 를 읽을 때와 같은 RGB 순서
+        decoded.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+
+    valid = [img for img in decoded if img is not None]
+    if not valid:
+        return decoded
+    canvas_height = max(img.shape[0] for img in valid)
+    canvas_width = max(img.shape[1] for img in valid)
+
+    padded = []
+    for img in decoded:
+        if img is None:
+            padded.append(None)
+            continue
+
+        height, width = img.shape[:2]
+        border = np.concatenate([img[0], img[-1], img[:, 0], img[:, -1]])
+        color = [int(c) for c in np.median(border, axis=0)]
+        padded.append(
+            cv2.copyMakeBorder(
+                img,
+                0,
+                canvas_height - height,
+                0,
+                canvas_width - width,
+                cv2.BORDER_CONSTANT,
+                value=color,
+            )
+        )
+    return padded
+
+
+def readtext_batch(reader, images: list[bytes]) -> list[str | None]:
+    """
+    여러 이미지를 readtext_batched 로 한 번에 OCR 한다.
+    크기가 제각각이라 letterbox_batch 로 같은 크기 캔버스에 붙여 배치 처리하고
+    (크기를 바꾸지 않으므로 글자 크기 / 비율은 이미지별 readtext 와 같음),
+    캔버스에 넣지 못한 이미지나 배치 처리 자체가 실패하면 이미지별 readtext 로 처리한다.
+    """
+    if not images:
+        return []
+    if len(images) == 1:
+        return [readtext(reader, images[0])]
+
+    try:
+        padded = letterbox_batch(images)
+        batch = [img for img in padded if img is not None]
+        results = iter(reader.readtext_batched(batch, detail=0) if batch else [])
+        return [
+            " ".join(next(results)) if img is not None else readtext(reader, img_bytes)
+            for img, img_bytes in zip(padded, images)
+        ]
+    except Exception:
+        return [readtext(reader, img_bytes) for img_bytes in images]
+
+
+def _init_worker(torch_threads: int):
+    global _worker_reader
+    _worker_reader = create_reader(torch_threads)
+
+
+def _worker_readtext_batch(images: list[bytes]) -> list[str | None]:
+    return readtext_batch(_worker_reader, images)
+
+
+class OCRService:
+    """
+    OCR 워커 프로세스 풀.
+    workers 개 프로세스가 각자 모델을 한 번 로드하고 배치 요청을 처리한다.
+    """
+
+    def __init__(
+        self,
+        workers: int = OCR_WORKERS,
+        torch_threads: int = OCR_TORCH_THREADS,
+    ):
+        self.workers = max(1, int(workers))
+        self.torch_threads = torch_threads
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            # torch / Selenium 스레드가 있는 부모를 fork 하지 않도록 spawn 사용
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.torch_threads,),
+        )
+
+    def submit(self, images: list[bytes]):
+        """Future[list[str | None]] 반환"""
+        with self._lock:
+            executor = self._executor
+        return executor.submit(_worker_readtext_batch, images)
+
+    def readtext_batch(self, images: list[bytes]) -> list[str | None]:
+        if not images:
+            return []
+
+        try:
+            return self.submit(images).result()
+        except BrokenProcessPool:
+            # 워커가 비정상 종료(OOM 등)되면 풀을 새로 만들고 한 번 재시도
+            self._restart()
+            return self.submit(images).result()
+
+    def _restart(self):
+        with self._lock:
+            broken = self._executor
+            self._executor = self._create_executor()
+            self.restarts += 1
+        print(f"[OCR] worker pool restarted (restarts={self.restarts})")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        with self._lock:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_ocr_service() -> OCRService:
+    global _service
+
+    with _service_lock:
+        if _service is None:
+            _service = OCRService()
+        return _service
+
+
+def shutdown_ocr_service():
+    global _service
+
+    with _service_lock:
+        if _service is not None:
+            _service.close()
+            _service = None
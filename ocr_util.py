@@ -1,37 +1,126 @@
-import base64
-import requests
-import easyocr
-from requests.exceptions import RequestException
+import threading
 
-ocr_reader = easyocr.Reader(["ko", "en"], gpu=False)
+import ocr_service
+from image_fetcher import get_image_fetcher
+from ocr_cache import OCRCache, hash_image_bytes
+from config.constants import OCR_BACKEND
 
+# OCR 캐시 (첫 사용 시 SQLite 연결)
+_ocr_cache = None
+_ocr_cache_lock = threading.Lock()
 
-def _fetch_image_bytes(img_el) -> bytes | None:
-    if img_el is None:
-        return None
+# OCR_BACKEND == "inline" 일 때만 사용하는 프로세스 내 reader (첫 사용 시 로드)
+_ocr_reader = None
+_ocr_reader_lock = threading.Lock()
 
-    src = img_el.get_attribute("src")
-    if not src:
-        return None
 
-    try:
-        resp = requests.get(src, timeout=(3, 5))
-        resp.raise_for_status()
-        return resp.content
-    except requests.RequestException:
-        return None
+def get_ocr_reader():
+    global _ocr_reader
 
+    with _ocr_reader_lock:
+        if _ocr_reader is None:
+            _ocr_reader = ocr_service.create_reader()
+        return _ocr_reader
 
-def extract_text_from_image_element(img_el) -> str:
-    if img_el is None:
-        return ""
 
-    img_bytes = _fetch_image_bytes(img_el)
-    if not img_bytes:
-        return ""
+def get_ocr_cache() -> OCRCache:
+    global _ocr_cache
 
-    try:
-        results = ocr_reader.readtext(img_bytes, detail=0)
-        return " ".join(results)
-    except Exception:
-        return ""
+    with _ocr_cache_lock:
+        if _ocr_cache is None:
+            _ocr_cache = OCRCache()
+        return _ocr_cache
+
+
+def close_ocr_cache():
+    global _ocr_cache
+
+    with _ocr_cache_lock:
+        if _ocr_cache is not None:
+            _ocr_cache.close()
+            _ocr_cache = None
+
+
+def fetch_image_bytes_from_srcs(srcs: list[str | None]) -> list[bytes | None]:
+    """페이지의 썸네일을 동시에 받아 온다. (페이지 단위 bytes / 지연 시간 로그 출력)"""
+    if not any(srcs):
+        return [None] * len(srcs)
+
+    images, page_stats = get_image_fetcher().fetch_many(srcs)
+    print(f"[IMAGE] {page_stats}")
+    return images
+
+
+def extract_texts_from_image_srcs(
+    srcs: list[str | None], images: list[bytes | None] | None = None
+) -> list[str]:
+    """
+    페이지의 썸네일 src 목록을 한 번에 OCR 한다. (입력 순서대로 텍스트 반환)
+    images 에 이미 받은 이미지 bytes 가 있으면 다시 다운로드하지 않는다.
+
+    1) 캐시(src → 내용 해시)로 바로 해결되는 항목 처리
+    2) 나머지는 동시에 다운로드한 뒤 내용 해시로 캐시 재확인
+    3) 그래도 없는 이미지만 모아 readtext_batched 한 번으로 OCR
+    """
+    ocr_cache = get_ocr_cache()
+    texts = [""] * len(srcs)
+    pending = []  # (index, src, content_hash)
+    pending_by_hash = {}
+
+    unresolved = []
+    for idx, src in enumerate(srcs):
+        if not src:
+            continue
+
+        cached = ocr_cache.get_by_src(src)
+        if cached is not None:
+            texts[idx] = cached
+            continue
+
+        unresolved.append(idx)
+
+    # 아직 bytes 가 없는 이미지만 한 번에 동시 다운로드
+    img_by_idx = {
+        idx: images[idx] for idx in unresolved if images is not None and images[idx]
+    }
+    to_fetch = [idx for idx in unresolved if idx not in img_by_idx]
+    img_by_idx.update(
+        zip(to_fetch, fetch_image_bytes_from_srcs([srcs[idx] for idx in to_fetch]))
+    )
+
+    for idx in unresolved:
+        src = srcs[idx]
+        img_bytes = img_by_idx.get(idx)
+        if not img_bytes:
+            continue
+
+        content_hash = hash_image_bytes(img_bytes)
+        cached = ocr_cache.get_by_hash(src, content_hash)
+        if cached is not None:
+            texts[idx] = cached
+            continue
+
+        # 같은 페이지 안에서 같은 이미지는 한 번만 OCR
+        if content_hash not in pending_by_hash:
+            pending_by_hash[content_hash] = img_bytes
+        pending.append((idx, src, content_hash))
+
+    hashes = list(pending_by_hash)
+    batch_texts = dict(
+        zip(hashes, _readtext_batch([pending_by_hash[h] for h in hashes]))
+    )
+
+    for idx, src, content_hash in pending:
+        text = batch_texts.get(content_hash)
+        if text is None:
+            continue
+        texts[idx] = text
+        ocr_cache.put(src, content_hash, text)
+
+    return texts
+
+
+def _readtext_batch(images: list[bytes]) -> list[str | None]:
+    if OCR_BACKEND == "process":
+        return ocr_service.get_ocr_service().readtext_batch(images)
+    return ocr_service.readtext_batch(get_ocr_reader(), images)
@@ -0,0 +1,160 @@
+import hashlib, json, sqlite3, threading, time
+from pathlib import Path
+
+from keyword_planner import normalize_keyword
+from config.constants import (
+    NAVER_TARGET_KEYWORDS,
+    UGC_DETECT_STAGES,
+    SERP_FINGERPRINT_PATH,
+    SERP_FINGERPRINT_TTL,
+)
+
+# fingerprint 계산 방식이 바뀌면 올려서 기존 저장값을 무효화
+FINGERPRINT_VERSION = "2"
+
+
+def fingerprint(identities: list[str]) -> str:
+    """
+    카드 식별자(href / id) 목록을 순서대로 해시한다.
+    판정 기준(NAVER_TARGET_KEYWORDS)이 바뀌면 다른 값이 나오도록 함께 해시한다.
+    """
+    h = hashlib.sha1(FINGERPRINT_VERSION.encode())
+    for part in [*NAVER_TARGET_KEYWORDS, "\x1e", *identities]:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def fingerprint_ugc_cards(cards: list[dict], logo_state: str = "") -> str:
+    """
+    인기글 후보 카드는 url + 썸네일 src 기준 (썸네일이 바뀌면 OCR 재실행)
+    판정 단계(UGC_DETECT_STAGES)나 로고 템플릿(logo_state)이 바뀌어도 다시 분석한다.
+    """
+    return fingerprint(
+        [
+            *UGC_DETECT_STAGES,
+            "\x1e",
+            logo_state,
+            "\x1e",
+            *(f"{card['url'] or ''}|{card['img_src'] or ''}" for card in cards),
+        ]
+    )
+
+
+class SerpFingerprintStore:
+    """
+    키워드별 / 영역별 fingerprint 와 직전 분석 결과 저장소 (SQLite)
+    (현재는 OCR / pHash 비용이 드는 인기글 영역만 저장)
+
+    fingerprint 가 같으면 저장된 분석 결과를 재사용한다.
+    ttl 이 지난 결과는 fingerprint 가 같아도 다시 분석한다.
+
+    여러 크롤러 스레드에서 같이 쓰므로 연결 하나를 lock 으로 보호한다.
+    """
+
+    def __init__(
+        self,
+        path: str = SERP_FINGERPRINT_PATH,
+        ttl: float = SERP_FINGERPRINT_TTL,
+    ):
+        self.ttl = ttl
+
+        self.reused = 0
+        self.analyzed = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS serp_section (
+                query_key TEXT NOT NULL,
+                section TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                results TEXT NOT NULL,
+                analyzed_at REAL NOT NULL,
+                PRIMARY KEY (query_key, section)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get(self, keyword: str) -> dict[str, tuple[str, list[dict]]]:
+        """ttl 이내의 {영역: (fingerprint, 분석 결과)} 반환"""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT section, fingerprint, results FROM serp_section
+                WHERE query_key = ? AND analyzed_at >= ?
+                """,
+                (normalize_keyword(keyword), time.time() - self.ttl),
+            ).fetchall()
+
+        return {section: (fp, json.loads(results)) for section, fp, results in rows}
+
+    def put(self, keyword: str, entries: dict[str, tuple[str, list[dict]]]):
+        """새로 분석한 영역의 {영역: (fingerprint, 분석 결과)} 저장"""
+        if not entries:
+            return
+
+        now = time.time()
+        key = normalize_keyword(keyword)
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO serp_section
+                    (query_key, section, fingerprint, results, analyzed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (key, section, fp, json.dumps(results, ensure_ascii=False), now)
+                    for section, (fp, results) in entries.items()
+                ],
+            )
+            self._conn.commit()
+
+    def count(self, reused: int, analyzed: int):
+        with self._lock:
+            self.reused += reused
+            self.analyzed += analyzed
+
+    def stats(self) -> dict:
+        total = self.reused + self.analyzed
+        return {
+            "reused": self.reused,
+            "analyzed": self.analyzed,
+            "reuse_rate": round(self.reused / total, 3) if total else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM serp_section WHERE analyzed_at < ?",
+                (time.time() - self.ttl,),
+            )
+            self._conn.commit()
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_serp_fingerprint_store() -> SerpFingerprintStore:
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = SerpFingerprintStore()
+        return _store
+
+
+def close_serp_fingerprint_store():
+    global _store
+
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
@@ -0,0 +1,243 @@
+import json, threading, time
+from pathlib import Path
+
+from config.constants import (
+    GOOGLE_SERVICE_ACCOUNT_FILE,
+    SHEETS_APPEND_FLUSH_KEYWORDS,
+    SHEETS_APPEND_FLUSH_INTERVAL,
+    SHEETS_REJECTED_PATH,
+)
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+# 재시도 대상 상태 코드
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_sheets_service():
+    """
+    Sheets API service 객체를 프로세스당 한 번만 생성해 재사용한다.
+    (googleapiclient service 는 스레드 안전하지 않으므로 메인 스레드에서만 사용)
+    """
+    global _service
+
+    with _service_lock:
+        if _service is None:
+            # google 클라이언트 라이브러리는 import 비용이 커서 첫 사용 시 로드
+            from google.oauth2.service_account import Credentials
+            from googleapiclient.discovery import build
+
+            credentials = Credentials.from_service_account_file(
+                GOOGLE_SERVICE_ACCOUNT_FILE,
+                scopes=SCOPES,
+            )
+            _service = build(
+                "sheets", "v4", credentials=credentials, cache_discovery=False
+            )
+        return _service
+
+
+def execute_with_backoff(request, max_attempts: int = 5):
+    """429 / 5xx 응답은 지수 backoff 후 재시도한다."""
+    from googleapiclient.errors import HttpError
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return request.execute()
+        except HttpError as e:
+            if e.resp.status in RETRYABLE_STATUS and attempt < max_attempts:
+                time.sleep(2**attempt)
+                continue
+            raise
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """
+    429 / 5xx / 네트워크 오류면 True.
+    그 외 4xx (잘못된 범위 / 권한 없음 등) 와 없는 출력 시트(KeyError)는 다시 보내도 같다.
+    """
+    from googleapiclient.errors import HttpError
+
+    if isinstance(e, HttpError):
+        return e.resp.status in RETRYABLE_STATUS
+    return not isinstance(e, KeyError)
+
+
+def _to_cell(value) -> dict:
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+class SheetsAppendBuffer:
+    """
+    결과 행을 출력 시트별로 모아 두었다가 한 번에 append 한다.
+
+    - flush_keywords 개 키워드 또는 flush_interval 초가 지나면 flush
+      (시간 조건은 add() 때만 확인하므로, 다음 키워드 결과가 늦게 나오면 그때까지 버퍼에 남음
+       → run_daemon 은 사이클마다, main 은 종료 시 flush 해서 남은 행을 보냄)
+    - 시트 1개면 values().append, 여러 시트면 batchUpdate(appendCells) 한 번으로 전송
+    - 429/5xx backoff 는 flush 단위로 적용
+    - 429/5xx/네트워크 오류로 실패하면 행을 버퍼에 되돌려 다음 flush 때 다시 보낸다
+    - 그 외 4xx 나 없는 출력 시트처럼 재시도해도 같은 오류면
+      해당 행을 오류와 함께 rejected_path 에 기록하고 버린다 (재전송 X)
+    """
+
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        flush_keywords: int = SHEETS_APPEND_FLUSH_KEYWORDS,
+        flush_interval: float = SHEETS_APPEND_FLUSH_INTERVAL,
+        rejected_path: str | None = SHEETS_REJECTED_PATH,
+    ):
+        self.spreadsheet_id = spreadsheet_id
+        self.flush_keywords = flush_keywords
+        self.flush_interval = flush_interval
+        self.rejected_path = Path(rejected_path) if rejected_path else None
+
+        self._rows_by_sheet = {}
+        self._pending_keywords = 0
+        self._last_flush_at = time.monotonic()
+        self._sheet_ids = None
+
+    def add(self, sheet_name: str, rows: list[list]):
+        """키워드 하나의 결과 행을 버퍼에 추가한다."""
+        self._rows_by_sheet.setdefault(sheet_name, []).extend(rows)
+        self._pending_keywords += 1
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        if (
+            self._pending_keywords >= self.flush_keywords
+            or time.monotonic() - self._last_flush_at >= self.flush_interval
+        ):
+            try:
+                self.flush()
+            except Exception as e:
+                # 행은 버퍼에 남아 있으므로 다음 flush 때 다시 전송
+                print(f"[SHEETS ERROR] flush failed, rows kept: {e}")
+
+    def flush(self):
+        """
+        버퍼의 행을 전송한다.
+        재시도 가능한 오류면 행을 버퍼에 되돌리고 예외를 다시 던지고,
+        그 외 오류면 행을 rejected_path 에 기록한다.
+        """
+        rows_by_sheet = {k: v for k, v in self._rows_by_sheet.items() if v}
+        self._rows_by_sheet = {}
+        self._pending_keywords = 0
+        self._last_flush_at = time.monotonic()
+
+        if not rows_by_sheet:
+            return
+
+        try:
+            if len(rows_by_sheet) == 1:
+                sheet_name, rows = next(iter(rows_by_sheet.items()))
+                self._append_values(sheet_name, rows)
+            else:
+                self._append_cells(rows_by_sheet)
+        except Exception as e:
+            if isinstance(e, KeyError):
+                # 없는 시트의 행만 버리고, 나머지 시트는 다음 flush 때 다시 전송
+                # (출력 시트가 나중에 추가됐을 수 있으므로 시트 목록도 다시 조회)
+                self._sheet_ids = None
+                missing = e.args[0] if e.args else None
+                if missing in rows_by_sheet:
+                    rejected = {missing: rows_by_sheet.pop(missing)}
+                    self._reject(rejected, f"sheet not found: {missing}")
+                    self._restore(rows_by_sheet)
+                    return
+
+            if not is_retryable_error(e):
+                self._reject(rows_by_sheet, e)
+                return
+
+            self._restore(rows_by_sheet)
+            raise
+
+        total = sum(len(rows) for rows in rows_by_sheet.values())
+        print(f"[SHEETS] appended rows={total} sheets={list(rows_by_sheet)}")
+
+    def close(self):
+        self.flush()
+
+    def _restore(self, rows_by_sheet: dict[str, list[list]]):
+        """전송하지 못한 행을 그 사이 추가된 행 앞에 되돌린다."""
+        for sheet_name, rows in rows_by_sheet.items():
+            self._rows_by_sheet[sheet_name] = rows + self._rows_by_sheet.get(
+                sheet_name, []
+            )
+
+    def _reject(self, rows_by_sheet: dict[str, list[list]], error):
+        total = sum(len(rows) for rows in rows_by_sheet.values())
+        print(
+            f"[SHEETS ERROR] rejected rows={total} sheets={list(rows_by_sheet)}: "
+            f"{error}"
+        )
+        if self.rejected_path is None:
+            return
+
+        self.rejected_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.rejected_path, "a", encoding="utf-8") as f:
+            for sheet_name, rows in rows_by_sheet.items():
+                for row in rows:
+                    record = {"error": str(error), "sheet": sheet_name, "row": row}
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def _append_values(self, sheet_name: str, rows: list[list]):
+        request = (
+            get_sheets_service()
+            .spreadsheets()
+            .values()
+            .append(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{sheet_name}!A1",
+                valueInputOption="RAW",
+                insertDataOption="INSERT_ROWS",
+                body={"values": rows},
+            )
+        )
+        execute_with_backoff(request)
+
+    def _append_cells(self, rows_by_sheet: dict[str, list[list]]):
+        sheet_ids = self._get_sheet_ids()
+
+        requests = [
+            {
+                "appendCells": {
+                    "sheetId": sheet_ids[sheet_name],
+                    "rows": [
+                        {"values": [_to_cell(v) for v in row]} for row in rows
+                    ],
+                    "fields": "userEnteredValue",
+                }
+            }
+            for sheet_name, rows in rows_by_sheet.items()
+        ]
+
+        request = get_sheets_service().spreadsheets().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={"requests": requests},
+        )
+        execute_with_backoff(request)
+
+    def _get_sheet_ids(self) -> dict[str, int]:
+        if self._sheet_ids is None:
+            request = get_sheets_service().spreadsheets().get(
+                spreadsheetId=self.spreadsheet_id,
+                fields="sheets.properties(sheetId,title)",
+            )
+            meta = execute_with_backoff(request)
+            self._sheet_ids = {
+                s["properties"]["title"]: s["properties"]["sheetId"]
+                for s in meta.get("sheets", [])
+            }
+        return self._sheet_ids
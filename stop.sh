@@ -11,13 +11,25 @@ pkill -f "$BASE_DIR/infinite-loop.sh" && \
 sleep 2
 
 # 2. Python main.py 종료 ( --port 10002 제외 )
-ps -ef \
-  | grep "python.*main.py" \
-  | grep -v -- "--port 10002" \
-  | grep -v grep \
-  | awk '{print $2}' \
-  | xargs -r kill -9 && \
-  echo "[STOP] python main.py stopped"
+#    SIGTERM 으로 정상 종료(버퍼 flush)를 먼저 요청하고, 30초 안에 안 끝나면 강제 종료
+find_main_pids() {
+  ps -ef \
+    | grep "python.*main.py" \
+    | grep -v -- "--port 10002" \
+    | grep -v grep \
+    | awk '{print $2}'
+}
+
+find_main_pids | xargs -r kill -TERM && \
+  echo "[STOP] python main.py SIGTERM sent"
+
+for _ in $(seq 1 30); do
+  [ -z "$(find_main_pids)" ] && break
+  sleep 1
+done
+
+find_main_pids | xargs -r kill -9 && \
+  echo "[STOP] python main.py killed"
 
 sleep 2
 
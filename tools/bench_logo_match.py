@@ -0,0 +1,108 @@
+"""
+로고 템플릿 매칭 방식별 지연 시간 비교
+
+    PYTHONPATH=. python tools/bench_logo_match.py --queries 200
+
+템플릿 10 ~ 10,000 개(임의 64bit 해시)에 대해 썸네일 1장당 매칭 시간을 측정한다.
+- loop   : imagehash 객체를 템플릿마다 빼는 기존 방식
+- numpy  : packed uint64 배열 XOR + popcount 한 번
+- bktree : SIMILAR_MAX_DIST 반경 BK-tree 탐색
+질의 해시의 절반은 템플릿을 몇 bit 바꾼 것(유사), 절반은 임의 값이다.
+이미지 해시 계산 시간은 포함하지 않는다.
+
+BK-tree 는 순수 Python 이라 64bit 해시 / 반경 14 에서는 가지치기가 잘 되지 않는다.
+수만 개 이하에서는 numpy 방식이 항상 빠르므로 LOGO_INDEX_BACKEND 기본값은 "numpy".
+"""
+
+import argparse, random, time
+
+import imagehash
+import numpy as np
+
+from logo_detector import YKLogoDetector, SIMILAR_MAX_DIST
+
+TEMPLATE_COUNTS = (10, 100, 1000, 10000)
+
+
+def to_image_hash(value: int) -> imagehash.ImageHash:
+    bits = np.unpackbits(np.frombuffer(value.to_bytes(8, "big"), dtype=np.uint8))
+    return imagehash.ImageHash(bits.astype(bool).reshape(8, 8))
+
+
+def make_queries(rng: random.Random, templates: list[int], n: int) -> list[int]:
+    queries = []
+    for i in range(n):
+        if i % 2 == 0:
+            value = rng.choice(templates)
+            for bit in rng.sample(range(64), rng.randint(0, 10)):
+                value ^= 1 << bit
+        else:
+            value = rng.getrandbits(64)
+        queries.append(value)
+    return queries
+
+
+def bench_loop(templates: list[int], queries: list[int]) -> tuple[float, list[int]]:
+    template_hashes = [(str(i), to_image_hash(v)) for i, v in enumerate(templates)]
+    query_hashes = [to_image_hash(q) for q in queries]
+
+    best = []
+    start = time.perf_counter()
+    for target_hash in query_hashes:
+        best_dist = 999
+        for _, tmpl_hash in template_hashes:
+            dist = int(target_hash - tmpl_hash)
+            if dist < best_dist:
+                best_dist = dist
+        best.append(best_dist)
+    return time.perf_counter() - start, best
+
+
+def bench_detector(detector, queries: list[int]) -> tuple[float, list[int]]:
+    best = []
+    start = time.perf_counter()
+    for q in queries:
+        best.append(detector.match_hash([q])[2])
+    return time.perf_counter() - start, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    print(f"[BENCH] queries={args.queries} (per-query us)")
+    print(f"[BENCH] {'templates':>9} {'loop':>10} {'numpy':>10} {'bktree':>10}")
+
+    for n in TEMPLATE_COUNTS:
+        templates = [rng.getrandbits(64) for _ in range(n)]
+        names = [str(i) for i in range(n)]
+        rows = [[v] for v in templates]
+        queries = make_queries(rng, templates, args.queries)
+
+        loop_sec, loop_best = bench_loop(templates, queries)
+        numpy_sec, numpy_best = bench_detector(
+            YKLogoDetector.from_hashes(names, rows, ("phash",), "numpy"), queries
+        )
+        bktree_sec, bktree_best = bench_detector(
+            YKLogoDetector.from_hashes(names, rows, ("phash",), "bktree"), queries
+        )
+
+        assert loop_best == numpy_best, "numpy 결과가 기존 방식과 다릅니다"
+        assert all(
+            b == d
+            for b, d in zip(bktree_best, numpy_best)
+            if d <= SIMILAR_MAX_DIST
+        ), "bktree 결과가 기존 방식과 다릅니다"
+
+        per_query = [
+            sec / len(queries) * 1e6 for sec in (loop_sec, numpy_sec, bktree_sec)
+        ]
+        print(f"[BENCH] {n:>9} " + " ".join(f"{us:>10.1f}" for us in per_query))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+이미지별 OCR vs 배치 OCR 지연 시간 / 결과 비교
+
+    PYTHONPATH=. python tools/bench_ocr_batch.py --repeat 3
+
+assets/naver_thumbnails 의 썸네일로
+- readtext 를 이미지마다 호출 (기존 방식)
+- ocr_service.readtext_batch 로 한 번에 호출 (letterbox_batch 로 같은 캔버스에 붙임)
+두 방식의 평균 소요 시간과, 이미지별 OCR 텍스트가 같은지 출력한다.
+OCR 캐시 / 워커 프로세스는 사용하지 않는다.
+"""
+
+import argparse, statistics, time
+from pathlib import Path
+
+from config.constants import OCR_BATCH_IMAGE_SIZE
+import ocr_service
+
+THUMBNAIL_DIR = Path(__file__).resolve().parent.parent / "assets/naver_thumbnails"
+
+ocr_reader = None
+
+
+def load_images(limit: int | None) -> list[tuple[str, bytes]]:
+    paths = sorted(
+        p
+        for p in THUMBNAIL_DIR.iterdir()
+        if p.suffix.lower() in (".png", ".jpg", ".jpeg")
+    )
+    return [(p.name, p.read_bytes()) for p in paths[:limit]]
+
+
+def run_per_image(images: list[bytes]) -> tuple[float, list[str | None]]:
+    start = time.perf_counter()
+    texts = [ocr_service.readtext(ocr_reader, img_bytes) for img_bytes in images]
+    return time.perf_counter() - start, texts
+
+
+def run_batched(images: list[bytes]) -> tuple[float, list[str | None]]:
+    start = time.perf_counter()
+    texts = ocr_service.readtext_batch(ocr_reader, images)
+    return time.perf_counter() - start, texts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=None, help="사용할 이미지 수")
+    args = parser.parse_args()
+
+    global ocr_reader
+    ocr_reader = ocr_service.create_reader()
+
+    named = load_images(args.limit)
+    names = [name for name, _ in named]
+    images = [img_bytes for _, img_bytes in named]
+    batchable = sum(img is not None for img in ocr_service.letterbox_batch(images))
+    print(
+        f"[BENCH] images={len(images)} batched={batchable} "
+        f"max_canvas={OCR_BATCH_IMAGE_SIZE}"
+    )
+
+    # 모델 warm-up (첫 호출의 초기화 비용 제외)
+    ocr_reader.readtext(images[0], detail=0)
+
+    per_image = [run_per_image(images) for _ in range(args.repeat)]
+    batched = [run_batched(images) for _ in range(args.repeat)]
+
+    per_image_avg = statistics.mean(t for t, _ in per_image)
+    batched_avg = statistics.mean(t for t, _ in batched)
+
+    print(
+        f"[BENCH] per-image: total={per_image_avg:.3f}s "
+        f"per_img={per_image_avg / len(images) * 1000:.1f}ms"
+    )
+    print(
+        f"[BENCH] batched  : total={batched_avg:.3f}s "
+        f"per_img={batched_avg / len(images) * 1000:.1f}ms"
+    )
+    print(f"[BENCH] speedup  : x{per_image_avg / batched_avg:.2f}")
+
+    # 결과 비교 (로고 / 브랜드 판정은 이 텍스트를 그대로 사용)
+    per_image_texts, batched_texts = per_image[0][1], batched[0][1]
+    mismatches = [
+        (name, a, b)
+        for name, a, b in zip(names, per_image_texts, batched_texts)
+        if a != b
+    ]
+    print(f"[BENCH] same text: {len(images) - len(mismatches)}/{len(images)}")
+    for name, a, b in mismatches:
+        print(f"[DIFF] {name}\n  per-image: {a!r}\n  batched  : {b!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+로컬 테스트용 ES _bulk 대체 엔드포인트
+
+    python tools/mock_es.py --port 9200 --fail-rate 0.2
+    python main.py --es-host http://localhost:9200/search_ad_keyword_monitoring
+
+- POST {index}/_bulk : NDJSON 을 받아 ES 와 같은 형식의 items 응답을 돌려준다.
+  --fail-rate 비율만큼 문서를 429 로 실패 처리해 부분 실패 재시도를 확인할 수 있다.
+- GET /_stats : 지금까지 받은 요청/문서 수
+"""
+
+import argparse, json, random, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+stats = {"requests": 0, "docs": 0, "rejected": 0}
+stats_lock = threading.Lock()
+
+
+class MockESHandler(BaseHTTPRequestHandler):
+    fail_rate = 0.0
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("_stats"):
+            with stats_lock:
+                return self._send_json(200, dict(stats))
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("_bulk"):
+            return self._send_json(404, {"error": "not found"})
+
+        length = int(self.headers.get("Content-Length", 0))
+        lines = self.rfile.read(length).decode("utf-8").splitlines()
+
+        items = []
+        rejected = 0
+        # action / source 두 줄씩
+        for i in range(0, len(lines) - 1, 2):
+            json.loads(lines[i + 1])
+            if random.random() < self.fail_rate:
+                rejected += 1
+                items.append(
+                    {
+                        "index": {
+                            "status": 429,
+                            "error": {"type": "es_rejected_execution_exception"},
+                        }
+                    }
+                )
+            else:
+                items.append({"index": {"status": 201, "result": "created"}})
+
+        with stats_lock:
+            stats["requests"] += 1
+            stats["docs"] += len(items) - rejected
+            stats["rejected"] += rejected
+
+        self._send_json(200, {"took": 1, "errors": rejected > 0, "items": items})
+
+    def log_message(self, format, *args):
+        print(f"[MOCK ES] {self.address_string()} {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument(
+        "--fail-rate",
+        type=float,
+        default=0.0,
+        help="429 로 실패 처리할 문서 비율 (0~1)",
+    )
+    args = parser.parse_args()
+
+    MockESHandler.fail_rate = args.fail_rate
+    server = ThreadingHTTPServer((args.host, args.port), MockESHandler)
+    print(f"[MOCK ES] listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
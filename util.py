@@ -2,9 +2,9 @@ import urllib.parse, json, time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from selenium.webdriver.common.by import By
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+
+from sheets_client import get_sheets_service, execute_with_backoff
+from config.constants import KEYWORD_SHEET_REFRESH_INTERVAL
 
 
 def load_keywords():
@@ -19,30 +19,94 @@ def load_keywords_by_google_sheet(
     spreadsheet_id: str,
     sheet_name: str,
 ):
-    SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+    return [
+        keyword
+        for keyword, _ in load_keyword_rows_by_google_sheet(spreadsheet_id, sheet_name)
+    ]
 
-    credentials = Credentials.from_service_account_file(
-        "config/google_service_account.json",
-        scopes=SCOPES,
-    )
 
-    service = build("sheets", "v4", credentials=credentials)
+def load_keyword_rows_by_google_sheet(
+    spreadsheet_id: str,
+    sheet_name: str,
+) -> list[tuple[str, float]]:
+    """
+    시트의 A열(키워드) / B열(우선순위)을 읽는다.
+    우선순위가 비어 있거나 숫자가 아니면 1.0
+    """
+    service = get_sheets_service()
 
-    result = (
+    result = execute_with_backoff(
         service.spreadsheets()
         .values()
         .get(
             spreadsheetId=spreadsheet_id,
-            range=f"{sheet_name}!A2:A",
+            range=f"{sheet_name}!A2:B",
         )
-        .execute()
     )
 
     rows = result.get("values", [])
 
-    keywords = [row[0].strip() for row in rows if row and row[0].strip()]
+    keyword_rows = []
+    for row in rows:
+        if not row or not row[0].strip():
+            continue
+
+        try:
+            priority = float(row[1]) if len(row) > 1 and row[1].strip() else 1.0
+        except ValueError:
+            priority = 1.0
+
+        keyword_rows.append((row[0].strip(), priority))
 
-    return keywords
+    return keyword_rows
+
+
+class KeywordSheetCache:
+    """
+    시트별 키워드 행을 refresh_interval 초 동안 재사용한다.
+    (데몬이 사이클마다 모든 시트를 다시 읽어 Sheets 읽기 quota 를 쓰지 않도록)
+    다시 읽다가 실패하면 마지막으로 읽은 행을 그대로 쓴다.
+    """
+
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        sheet_names: list[str],
+        refresh_interval: float = KEYWORD_SHEET_REFRESH_INTERVAL,
+    ):
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_names = list(sheet_names)
+        self.refresh_interval = refresh_interval
+
+        self._rows_by_sheet = {}
+        self._loaded_at = None
+
+    def load(self) -> dict[str, list[tuple[str, float]]]:
+        now = time.monotonic()
+        if (
+            self._loaded_at is not None
+            and now - self._loaded_at < self.refresh_interval
+        ):
+            return self._rows_by_sheet
+
+        try:
+            rows_by_sheet = {
+                sheet_name: load_keyword_rows_by_google_sheet(
+                    spreadsheet_id=self.spreadsheet_id,
+                    sheet_name=sheet_name,
+                )
+                for sheet_name in self.sheet_names
+            }
+        except Exception as e:
+            if self._loaded_at is None:
+                raise
+            print(f"[SHEETS ERROR] keyword reload failed, reuse cached rows: {e}")
+            self._loaded_at = now
+            return self._rows_by_sheet
+
+        self._rows_by_sheet = rows_by_sheet
+        self._loaded_at = now
+        return rows_by_sheet
 
 
 def append_results_to_google_sheet(
@@ -52,32 +116,21 @@ def append_results_to_google_sheet(
 ):
     """
     Google Sheets의 results 시트에 row 단위로 append 한다.
+    (키워드 단위 반복 append 는 sheets_client.SheetsAppendBuffer 사용)
     """
-    SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-
-    credentials = Credentials.from_service_account_file(
-        "config/google_service_account.json",
-        scopes=SCOPES,
+    execute_with_backoff(
+        get_sheets_service()
+        .spreadsheets()
+        .values()
+        .append(
+            spreadsheetId=spreadsheet_id,
+            range=f"{sheet_name}!A1",
+            valueInputOption="RAW",
+            insertDataOption="INSERT_ROWS",
+            body={"values": rows},
+        )
     )
 
-    service = build("sheets", "v4", credentials=credentials)
-
-    for attempt in range(1, 6):
-        try:
-            service.spreadsheets().values().append(
-                spreadsheetId=spreadsheet_id,
-                range=f"{sheet_name}!A1",
-                valueInputOption="RAW",
-                insertDataOption="INSERT_ROWS",
-                body={"values": rows},
-            ).execute()
-            break
-        except HttpError as e:
-            if e.resp.status in (429, 500, 502, 503, 504) and attempt < 5:
-                time.sleep(2**attempt)
-                continue
-            raise
-
 
 # ==============================
 # NAVER
@@ -127,6 +180,18 @@ def get_card_url(card):
         return None
 
 
+def get_landing_url(card):
+    """
+    광고 클릭 추적 링크(ader.naver.com)를 제외한 첫 번째 링크
+    (crawler.naver_snapshot.get_landing_url 과 같은 기준)
+    """
+    for a in card.find_elements(By.CSS_SELECTOR, "a[href]"):
+        href = a.get_attribute("href")
+        if href and "ader.naver.com" not in href:
+            return href
+    return None
+
+
 def is_brand_content(card) -> bool:
     try:
         card.find_element(By.CSS_SELECTOR, "a[href*='ader.naver.com']")
@@ -154,27 +219,48 @@ def is_kin_content(url: str) -> bool:
     return "m.kin.naver.com" in url or "kin.naver.com" in url
 
 
-def get_unexposed_summary(keyword, bulk_docs):
-    now_str = datetime.now(timezone(timedelta(hours=9))).strftime("%m-%d %H:%M")
+# 전체 영역 목록
+NAVER_SECTIONS = {
+    "파워링크",
+    "브랜드콘텐츠",
+    "플레이스_광고",
+    "플레이스_일반",
+    "인기글",
+}
 
-    # 전체 영역 목록
-    all_sections = {
-        "파워링크",
-        "브랜드콘텐츠",
-        "플레이스_광고",
-        "플레이스_일반",
-        "인기글",
-    }
 
-    # 노출된 영역 수집
+# ES 문서 종류 (노출 결과 / share of voice 가 같은 인덱스에 적재되므로 record_type 으로 구분)
+EXPOSURE_RECORD = "exposure"
+SHARE_OF_VOICE_RECORD = "share_of_voice"
+
+
+def split_share_of_voice(bulk_docs) -> tuple[list[dict], list[dict]]:
+    """(노출 결과 문서, share of voice 문서)"""
+    exposure_docs, sov_docs = [], []
+    for item in bulk_docs:
+        if item.get("record_type") == SHARE_OF_VOICE_RECORD:
+            sov_docs.append(item)
+        else:
+            exposure_docs.append(item)
+    return exposure_docs, sov_docs
+
+
+def get_exposed_sections(bulk_docs) -> set[str]:
     exposed_sections = set()
     for item in bulk_docs:
+        if item.get("record_type") == SHARE_OF_VOICE_RECORD:
+            continue
         section = item.get("section", "")
         if section:
             exposed_sections.add(section)
+    return exposed_sections
+
+
+def get_unexposed_summary(keyword, bulk_docs):
+    now_str = datetime.now(timezone(timedelta(hours=9))).strftime("%m-%d %H:%M")
 
     # 미노출 영역 계산
-    unexposed = all_sections - exposed_sections
+    unexposed = NAVER_SECTIONS - get_exposed_sections(bulk_docs)
 
     # 미노출 영역 문자열 생성
     if unexposed: